@@ -13,6 +13,18 @@ Environment variables:
 - CORS_ALLOW_CREDENTIALS: Allow credentials for CORS ("true"/"1"/"yes") (default: "true")
 - CORS_ALLOW_METHODS: Comma-separated list or JSON array of HTTP methods (default: ["*"])
 - CORS_ALLOW_HEADERS: Comma-separated list or JSON array of HTTP headers (default: ["*"])
+- SOLVER_WORKERS: Worker processes used by the GA per run; 1 runs serially (default: 1)
+- SOLVER_PROCESSES: Processes that run timetable solves for the API (default: 2)
+- SOLVER_QUEUE_SIZE: Solves allowed to wait for a free process; further requests
+  are rejected with 429 (default: 8)
+- SOLVER_RETRY_AFTER: Minimum Retry-After (seconds) sent with rejections (default: 5)
+- JOB_STORE: Where async generation jobs are kept: "memory" or "sqlite" (shared by
+  all uvicorn workers on a host) (default: "memory")
+- JOB_STORE_PATH: SQLite file of the "sqlite" job store (default: "jobs.sqlite3")
+- PROGRESS_INTERVAL_MS: Minimum time between two solver progress events of a job, which
+  also paces the job event stream (default: 500)
+- KERNEL_BACKEND: Fitness/mutation kernels: "auto" (Numba if installed), "numba"
+  or "numpy" (default: "auto")
 """
 
 from __future__ import annotations
@@ -31,6 +43,16 @@ def _getenv_bool(name: str, default: bool) -> bool:
     return val.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _getenv_int(name: str, default: int) -> int:
+    val = os.getenv(name)
+    if val is None or val.strip() == "":
+        return default
+    try:
+        return int(val.strip())
+    except ValueError:
+        return default
+
+
 def _getenv_list(name: str, default: Iterable[str]) -> List[str]:
     raw = os.getenv(name)
     if raw is None or raw.strip() == "":
@@ -77,6 +99,29 @@ class Settings:
         default_factory=lambda: _getenv_list("CORS_ALLOW_HEADERS", default=["*"])
     )
 
+    solver_workers: int = field(
+        default_factory=lambda: _getenv_int("SOLVER_WORKERS", 1)
+    )
+    solver_processes: int = field(
+        default_factory=lambda: _getenv_int("SOLVER_PROCESSES", 2)
+    )
+    solver_queue_size: int = field(
+        default_factory=lambda: _getenv_int("SOLVER_QUEUE_SIZE", 8)
+    )
+    solver_retry_after: int = field(
+        default_factory=lambda: _getenv_int("SOLVER_RETRY_AFTER", 5)
+    )
+    job_store: str = field(default_factory=lambda: os.getenv("JOB_STORE", "memory"))
+    job_store_path: str = field(
+        default_factory=lambda: os.getenv("JOB_STORE_PATH", "jobs.sqlite3")
+    )
+    progress_interval_ms: int = field(
+        default_factory=lambda: _getenv_int("PROGRESS_INTERVAL_MS", 500)
+    )
+    kernel_backend: str = field(
+        default_factory=lambda: os.getenv("KERNEL_BACKEND", "auto")
+    )
+
     def cors_params(self) -> dict[str, Any]:
         """
         Return keyword arguments suitable for FastAPI's CORSMiddleware.
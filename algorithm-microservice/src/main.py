@@ -1,8 +1,14 @@
 from __future__ import annotations
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from .core.config import apply_cors, get_settings
 from .routes.timetable_routes import router as timetable_router
 from .routes.example_routes import router as example_router
+from .routes.job_routes import router as job_router
+from .services import kernels
+from .services.executor import shutdown_solver_executor
 
 """
 FastAPI application entrypoint for the Timetable API.
@@ -10,10 +16,20 @@ FastAPI application entrypoint for the Timetable API.
 This module wires together:
 - App settings (title, version) from core.config.Settings
 - CORS middleware based on settings
-- API routers for timetable generation and example endpoints
+- API routers for timetable generation, generation jobs and example endpoints
+- Startup/shutdown of the solver kernels and the solver executor
 """
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Compile the optional fitness/mutation kernels before the first request
+    kernels.warmup()
+    yield
+    # Stop the solver processes with the app, off the event loop
+    await asyncio.to_thread(shutdown_solver_executor)
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application instance.
@@ -23,6 +39,7 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         version=settings.version,
+        lifespan=lifespan,
     )
 
     # Middleware
@@ -32,6 +49,7 @@ def create_app() -> FastAPI:
     # Routers (keep same paths/behavior as the original monolith)
     app.include_router(timetable_router)
     app.include_router(example_router)
+    app.include_router(job_router)
 
     return app
 
@@ -7,7 +7,7 @@ to enable a modular project structure without changing the API surface.
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -26,9 +26,68 @@ class TimetableRequest(BaseModel):
     max_hours_per_week: int = 20
     department_id: str = "UhmONhtTSYAyWlWQoUn0"
 
+    # Search engine: genetic algorithm, single-solution tabu search or simulated
+    # annealing, exact backtracking that falls back to the GA at its limits, or
+    # a portfolio racing several configurations in parallel
+    solver: Literal["ga", "tabu", "annealing", "backtracking", "portfolio"] = "ga"
+    # Portfolio members as request-field overrides, e.g. [{"solver": "tabu"},
+    # {"solver": "ga", "seed": 7}]; None uses the built-in default portfolio
+    portfolio: Optional[List[Dict[str, Any]]] = None
+    seed: int = 42
+
     population_size: int = 50
     generations: int = 100
     mutation_rate: float = 0.01
+    fitness_cache_size: int = Field(1024, ge=0)
+    # Initial population: greedy clash-avoiding construction or uniform random
+    initializer: Literal["constructive", "random"] = "constructive"
+    # Share of the population built constructively; the rest is seeded randomly
+    constructive_fraction: float = Field(0.1, ge=0.0, le=1.0)
+    # Reassign clashing teachers/rooms in every child after crossover + mutation
+    repair: bool = False
+    # Worker processes for GA scoring/breeding; None uses SOLVER_WORKERS
+    workers: Optional[int] = Field(None, ge=1, le=64)
+
+    # Early stopping: reach target fitness (0 = no penalty) or stop after
+    # `stagnation_generations` without improving by more than `min_improvement`
+    target_fitness: Optional[float] = None
+    stagnation_generations: Optional[int] = Field(None, ge=1)
+    min_improvement: float = Field(0.0, ge=0.0)
+
+    # Anytime solving: return the best solution found within this wall-clock budget
+    time_budget_ms: Optional[int] = Field(None, ge=1)
+
+    # Island model: >1 splits the population into islands with migration
+    islands: int = Field(1, ge=1, le=64)
+    migration_interval: int = Field(10, ge=1)
+    migration_size: int = Field(2, ge=1)
+    migration_topology: Literal["ring", "complete"] = "ring"
+
+    # Memetic GA: hill-climb the top `memetic_elites` every `memetic_interval`
+    # generations within an evaluation and/or millisecond budget per round
+    memetic: bool = False
+    memetic_interval: int = Field(5, ge=1)
+    memetic_elites: int = Field(2, ge=1)
+    memetic_budget_evaluations: Optional[int] = Field(400, ge=1)
+    memetic_budget_ms: Optional[float] = Field(None, gt=0)
+
+    # Tabu search: iterations, tabu tenure and candidate moves sampled per iteration
+    tabu_iterations: int = Field(2000, ge=1)
+    tabu_tenure: int = Field(10, ge=1)
+    tabu_neighborhood: int = Field(40, ge=1)
+
+    # Simulated annealing: iterations, cooling schedule (initial temperature is
+    # estimated when unset) and reheating after iterations without a new best
+    sa_iterations: int = Field(50_000, ge=1)
+    sa_cooling: Literal["geometric", "linear"] = "geometric"
+    sa_initial_temperature: Optional[float] = Field(None, gt=0)
+    sa_final_temperature: float = Field(0.5, gt=0)
+    sa_reheat_after: Optional[int] = Field(None, ge=1)
+    sa_reheat_factor: float = Field(0.5, gt=0, le=1)
+
+    # Backtracking limits (the GA takes over when either is hit)
+    backtrack_max_nodes: int = Field(200_000, ge=1)
+    backtrack_time_limit_ms: Optional[int] = Field(2000, ge=1)
 
     class Config:
         schema_extra = {
@@ -7,7 +7,7 @@ to enable a modular project structure without changing the API surface.
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -28,6 +28,10 @@ class TimetableResponse(BaseModel):
     success: bool
     fitness_score: float
     generation_count: int
+    stop_reason: str = "completed"
+    deadline_reached: bool = False
+    # Portfolio runs: request-field overrides of the configuration that won
+    winning_config: Optional[Dict[str, Any]] = None
     student_timetables: List[StudentTimetable] = Field(default_factory=list)
     teacher_timetables: List[TeacherTimetable] = Field(default_factory=list)
     combined_view: List[CombinedTimetable]
@@ -42,6 +46,10 @@ class StudentTimetableResponse(BaseModel):
     success: bool
     fitness_score: float
     generation_count: int
+    stop_reason: str = "completed"
+    deadline_reached: bool = False
+    # Portfolio runs: request-field overrides of the configuration that won
+    winning_config: Optional[Dict[str, Any]] = None
     student_timetables: List[StudentTimetable]
 
 
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+"""
+Asynchronous job routes for long-running timetable generation.
+
+`POST /jobs/generate-timetable` admits a solve on the shared solver executor
+and answers immediately with a job id; clients then poll `GET /jobs/{id}`
+for its state and solver progress and fetch `GET /jobs/{id}/result` once it has
+succeeded. `GET /jobs/{id}/events` streams the job's progress as
+Server-Sent Events for live progress displays, and `DELETE /jobs/{id}`
+cancels a job that is no longer wanted. Job state lives in the configured
+job store (see `services.jobs`).
+"""
+
+import json
+import time
+import traceback
+from collections.abc import AsyncIterator
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from ..core.config import get_settings
+from ..core.utils import get_logger
+from ..models.request_models import TimetableRequest
+from ..models.response_models import StudentTimetableResponse, TimetableResponse
+from ..services.executor import SolveOutcome, SolverBusy
+from ..services.jobs import (
+    JOB_CANCELLED,
+    JOB_SUCCEEDED,
+    cancel_job,
+    get_job_store,
+    start_job,
+    wait_for_update,
+)
+from .timetable_routes import load_department_resources
+
+log = get_logger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Seconds without events after which the stream sends an SSE comment
+KEEPALIVE_S = 15.0
+
+
+@router.post("/generate-timetable", status_code=status.HTTP_202_ACCEPTED)
+async def create_generation_job(
+    request: TimetableRequest, department_id: Optional[str] = None
+) -> dict[str, Any]:
+    """
+    Start a generation job. With `department_id`, the department's resources
+    are fetched first (as in the department route).
+    """
+    try:
+        resources = None
+        if department_id is not None:
+            request.department_id = department_id
+            resources = await load_department_resources(department_id)
+        record = start_job(request, resources)
+    except SolverBusy as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "job_id": record.id,
+        "state": record.state,
+        "status_url": f"/jobs/{record.id}",
+        "result_url": f"/jobs/{record.id}/result",
+    }
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str) -> dict[str, Any]:
+    """
+    State of a job with its latest generation and best fitness so far.
+    """
+    record = get_job_store().get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return record.status()
+
+
+@router.delete("/{job_id}", status_code=status.HTTP_202_ACCEPTED)
+async def cancel_generation_job(job_id: str) -> dict[str, Any]:
+    """
+    Cancel a queued or running job. The solver stops at its next generation
+    (or evaluation chunk) and the job becomes `cancelled`; a job cancelled
+    while running keeps its best timetable so far as its result. 409 once the
+    job has finished.
+    """
+    record = cancel_job(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if record.finished and not record.cancel_requested:
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} has already {record.state}"
+        )
+    return record.status()
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str) -> StreamingResponse:
+    """
+    Server-Sent Events stream of a job: a `progress` event (the job status
+    with its latest solver progress: generation or iteration, best fitness,
+    GA mean fitness, penalty breakdown, elapsed time) whenever it changes, at most once per
+    PROGRESS_INTERVAL_MS, then one `done` event when the job has finished.
+    Starlette stops the stream when the client disconnects.
+    """
+    store = get_job_store()
+    if store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    interval = max(0.05, get_settings().progress_interval_ms / 1000.0)
+
+    async def events() -> AsyncIterator[str]:
+        last: dict[str, Any] | None = None
+        sent_at = time.monotonic()
+        while True:
+            record = store.get(job_id)
+            if record is None:
+                return
+            current = record.status()
+            if current != last:
+                last = current
+                sent_at = time.monotonic()
+                if record.finished:
+                    yield _sse("done", current)
+                    return
+                yield _sse("progress", current)
+            elif time.monotonic() - sent_at >= KEEPALIVE_S:
+                sent_at = time.monotonic()
+                yield ": keep-alive\n\n"
+            await wait_for_update(job_id, interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    view: Literal["student", "teacher", "combined", "flat"] = "combined",
+) -> Any:
+    """
+    The finished timetable in the requested view. 409 until the job has
+    succeeded, or if it was cancelled before producing a timetable.
+    """
+    record = get_job_store().get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if record.state not in (JOB_SUCCEEDED, JOB_CANCELLED) or record.result is None:
+        detail = f"Job {job_id} is {record.state}"
+        if record.error:
+            detail += f": {record.error}"
+        raise HTTPException(status_code=409, detail=detail)
+
+    outcome = SolveOutcome.from_dict(record.result)
+    if view == "flat":
+        return outcome.flat
+    if view == "student":
+        return StudentTimetableResponse(
+            **outcome.summary(), student_timetables=outcome.student_timetables
+        )
+    if view == "teacher":
+        return TimetableResponse(
+            **outcome.summary(),
+            teacher_timetables=outcome.teacher_timetables,
+            combined_view=[],
+        )
+    return TimetableResponse(**outcome.summary(), combined_view=outcome.combined_view)
+
+
+__all__ = ["router"]
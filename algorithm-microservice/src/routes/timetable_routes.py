@@ -1,130 +1,192 @@
 from __future__ import annotations
 
+import asyncio
 import traceback
+from typing import Any, cast
 from typing_extensions import TypedDict
 
 from ..services.fetch_details import get_department_resources
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 from ..models.request_models import TimetableRequest
 from ..models.response_models import StudentTimetableResponse, TimetableResponse
-from ..services.generator import TimetableGenerator
+from ..services.executor import (
+    SolveCancelled,
+    SolveOutcome,
+    SolverBusy,
+    SolverExecutor,
+    get_solver_executor,
+)
 from ..core.utils import get_logger
 
 log = get_logger(__name__)
 
 router = APIRouter()
 
+# Seconds between checks whether the client of a running solve is still there
+DISCONNECT_POLL_S = 0.5
+# Non-standard "client closed request" status for solves cut short by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _solve(
+    request: TimetableRequest,
+    views: tuple[str, ...],
+    resources: dict[str, Any] | None = None,
+    http_request: Request | None = None,
+) -> SolveOutcome:
+    """
+    Run the solve in the shared solver executor, off the event loop.
+    A full queue or unavailable pool becomes 429/503 with Retry-After.
+    With `http_request`, the solve is cancelled once the client disconnects
+    (closed tab, repeated "generate") instead of running to completion.
+    """
+    executor = get_solver_executor()
+    try:
+        task = executor.submit(request, resources, views)
+        return await _await_solve(executor, task, http_request)
+    except SolverBusy as e:
+        # Raised on admission, or by the task when the pool breaks mid-solve
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def _await_solve(
+    executor: SolverExecutor,
+    task: "asyncio.Task[SolveOutcome]",
+    http_request: Request | None,
+) -> SolveOutcome:
+    if http_request is None:
+        return await task
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_S)
+        if done:
+            return task.result()
+        if await http_request.is_disconnected():
+            break
+    log.info("Client disconnected; cancelling its solve")
+    executor.cancel(task)
+    try:
+        await task
+    except SolveCancelled:
+        pass
+    raise HTTPException(
+        status_code=CLIENT_CLOSED_REQUEST, detail="Client closed the request"
+    )
+
 
 @router.post("/generate-timetable/legecy", response_model=TimetableResponse)
-async def generate_timetable_legacy(request: TimetableRequest):
+async def generate_timetable_legacy(
+    request: TimetableRequest, http_request: Request
+):
     """
     Generate complete timetable views (student, teacher, combined) using GA.
     Mirrors the original monolith behavior for the legacy endpoint.
     """
     try:
-        gen = TimetableGenerator(config=request)
-        best, score = gen.run_ga()
+        outcome = await _solve(
+            request, ("student", "teacher", "combined"), http_request=http_request
+        )
         return TimetableResponse(
-            success=True,
-            fitness_score=float(score),
-            generation_count=request.generations,
-            student_timetables=gen.generate_student_view(best),
-            teacher_timetables=gen.generate_teacher_view(best),
-            combined_view=gen.generate_combined_view(best),
+            **outcome.summary(),
+            student_timetables=outcome.student_timetables,
+            teacher_timetables=outcome.teacher_timetables,
+            combined_view=outcome.combined_view,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/generate-timetable/combined", response_model=TimetableResponse)
-async def generate_timetable_combined(request: TimetableRequest):
+async def generate_timetable_combined(
+    request: TimetableRequest, http_request: Request
+):
     """
     Generate only the combined view using GA.
     Preserves original behavior where student/teacher views were omitted.
     """
     try:
-        gen = TimetableGenerator(config=request)
-        best, score = gen.run_ga()
+        outcome = await _solve(request, ("combined",), http_request=http_request)
         return TimetableResponse(
-            success=True,
-            fitness_score=float(score),
-            generation_count=request.generations,
+            **outcome.summary(),
             # student_timetables intentionally omitted to preserve original behavior
             # teacher_timetables intentionally omitted to preserve original behavior
-            combined_view=gen.generate_combined_view(best),
+            combined_view=outcome.combined_view,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/generate-timetable/teacherwise", response_model=TimetableResponse)
-async def generate_timetable_teacherwise(request: TimetableRequest):
+async def generate_timetable_teacherwise(
+    request: TimetableRequest, http_request: Request
+):
     """
     Generate teacher-wise related output.
     In the original monolith this returned only combined_view (same as combined route).
     The behavior is preserved here for compatibility.
     """
     try:
-        gen = TimetableGenerator(config=request)
-        best, score = gen.run_ga()
+        outcome = await _solve(request, ("combined",), http_request=http_request)
         return TimetableResponse(
-            success=True,
-            fitness_score=float(score),
-            generation_count=request.generations,
+            **outcome.summary(),
             # student_timetables intentionally omitted to preserve original behavior
             # teacher_timetables intentionally omitted to preserve original behavior
-            combined_view=gen.generate_combined_view(best),
+            combined_view=outcome.combined_view,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def load_department_resources(department_id: str) -> dict[str, Any]:
+    """
+    Fetch a department's resources; 404 when it lacks classes, rooms,
+    teachers or subjects.
+    """
+    resources = await get_department_resources(department_id)
+    for key, label in (
+        ("total_classes", "classes"),
+        ("total_rooms", "rooms"),
+        ("total_teachers", "teachers"),
+        ("total_subjects", "subjects"),
+    ):
+        if resources[key] == 0:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No {label} found for department {department_id}",
+            )
+    return resources
+
+
 @router.post(
     "/generate-timetable/studentwise/department/{department_id}",
     response_model=StudentTimetableResponse,
 )
 async def generate_timetable_across_department(
-    department_id: str, request: TimetableRequest
+    department_id: str, request: TimetableRequest, http_request: Request
 ):
     try:
         request.department_id = department_id
-        resources = await get_department_resources(department_id)
-        
-        if resources["total_classes"] == 0:
-             raise HTTPException(status_code=404, detail=f"No classes found for department {department_id}")
-        if resources["total_rooms"] == 0:
-             raise HTTPException(status_code=404, detail=f"No rooms found for department {department_id}")
-        if resources["total_teachers"] == 0:
-             raise HTTPException(status_code=404, detail=f"No teachers found for department {department_id}")
-        if resources["total_subjects"] == 0:
-             raise HTTPException(status_code=404, detail=f"No subjects found for department {department_id}")
-             
-        gen = TimetableGenerator(
-            request,
-            TOTAL_ROOMS=resources["total_rooms"],
-            TOTAL_TEACHERS=resources["total_teachers"],
-            ROOM_NAMES=resources["room_names"],
-            NUM_CLASSES=resources["total_classes"],
-            CLASS_NAMES=resources["class_names"],
-            TOTAL_SUBJECTS=resources["total_subjects"],
-            SUBJECT_NAMES=resources["subject_names"],
-            SUBJECT_TYPES=resources["subject_types"],
-            TEACHER_NAMES=resources["teacher_names"],
-            SUBJECT_TEACHERS=resources["subject_teachers"],
-            SUBJECT_HOURS=resources["subject_hours"],
-        )
-
-        best, score = gen.run_ga()
+        resources = await load_department_resources(department_id)
+        outcome = await _solve(request, ("student",), resources, http_request)
         return StudentTimetableResponse(
-            success=True,
-            fitness_score=float(score),
-            generation_count=request.generations,
-            student_timetables=gen.generate_student_view(best),
+            **outcome.summary(),
+            student_timetables=outcome.student_timetables,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -133,20 +195,21 @@ async def generate_timetable_across_department(
 @router.post(
     "/generate-timetable/studentwise/", response_model=StudentTimetableResponse
 )
-async def generate_timetable_studentwise(request: TimetableRequest):
+async def generate_timetable_studentwise(
+    request: TimetableRequest, http_request: Request
+):
     """
     Generate student-wise timetable view using GA.
     Preserves original behavior where student view is primary, with teacher and combined also included.
     """
     try:
-        gen = TimetableGenerator(config=request)
-        best, score = gen.run_ga()
+        outcome = await _solve(request, ("student",), http_request=http_request)
         return StudentTimetableResponse(
-            success=True,
-            fitness_score=float(score),
-            generation_count=request.generations,
-            student_timetables=gen.generate_student_view(best),
+            **outcome.summary(),
+            student_timetables=outcome.student_timetables,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -180,6 +243,15 @@ async def example_request() -> dict[str, object]:
     }
 
 
+@router.get("/solver/metrics")
+async def solver_metrics() -> dict[str, Any]:
+    """
+    Solve counters of this API process (completed, cancelled, failed and
+    rejected solves; seconds held by cancelled solves) and its current load.
+    """
+    return get_solver_executor().metrics()
+
+
 class FlatSlot(TypedDict):
     class_id: int
     day: str
@@ -191,51 +263,21 @@ class FlatSlot(TypedDict):
 
 
 @router.post("/generate-timetable/flat")
-async def generate_timetable_flat(request: TimetableRequest) -> list[FlatSlot]:
+async def generate_timetable_flat(
+    request: TimetableRequest, http_request: Request
+) -> list[FlatSlot]:
     """
     Generate timetable and return a flat list of slots with fields ready for the React table.
     Mirrors original monolith endpoint behavior.
     """
     try:
-        gen = TimetableGenerator(config=request)
-        best, _ = gen.run_ga()
-
-        flat: list[FlatSlot] = []
-        day_names: list[str] = [
-            "Monday",
-            "Tuesday",
-            "Wednesday",
-            "Thursday",
-            "Friday",
-            "Saturday",
-        ]
-        for c in range(gen.NUM_CLASSES):
-            for d in range(gen.DAYS):
-                for s in range(gen.SLOTS_PER_DAY):
-                    subj_i, teacher_i, room_i = map(int, best[c, d, s])
-                    if subj_i == -1:
-                        continue
-                    flat.append(
-                        {
-                            "class_id": c,
-                            "day": day_names[d]
-                            if d < len(day_names)
-                            else f"Day-{d + 1}",
-                            "start_time": f"{9 + s}:00",  # preserve original mapping
-                            "subject_id": subj_i,
-                            "teacher_id": teacher_i,
-                            "room_id": room_i,
-                            "type": (
-                                "lab"
-                                if subj_i in getattr(gen, "LAB_SUBJECTS", set())
-                                else gen.SUBJECT_TYPES.get(subj_i, "lecture")
-                            ),
-                        }
-                    )
-        return flat
+        outcome = await _solve(request, ("flat",), http_request=http_request)
+        return cast(list[FlatSlot], outcome.flat)
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-__all__ = ["router"]
+__all__ = ["router", "load_department_resources"]
@@ -0,0 +1,167 @@
+"""
+Simulated annealing engine for the timetable problem.
+
+`SimulatedAnnealing` evolves a single timetable using the GA's own mutation
+moves (`TimetableGenerator.random_move`: single replace, single swap and
+lab-pair block swap) as its neighborhood. Each move is applied to a
+`DeltaFitnessState`, so the score is maintained incrementally; rejected moves
+are rolled back from the state's journal.
+
+Cooling schedules run from `sa_initial_temperature` (estimated from sampled
+moves when unset) down to `sa_final_temperature`:
+- "geometric": T_k = T_0 * (T_end / T_0) ** (k / N)
+- "linear":    T_k = T_0 + (T_end - T_0) * k / N
+
+With `sa_reheat_after`, a run of that many iterations without a new best
+restarts from the best timetable at `sa_reheat_factor * T_0` and cools down
+again over the remaining iterations.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+from .delta import DeltaFitnessState
+from .report import GARunReport
+from .termination import STOP_COMPLETED, ConvergenceMonitor
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+# Moves sampled to estimate the initial temperature
+CALIBRATION_MOVES = 200
+# Acceptance probability of an average worsening move at the estimated
+# initial temperature. Mutation moves that worsen a timetable usually add a
+# clash (50+ penalty), so a low value keeps the start from being a random walk.
+INITIAL_ACCEPTANCE = 0.05
+
+
+class SimulatedAnnealing:
+    """
+    Single-solution simulated annealing over `gen`'s problem definition.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        self.iterations = gen.SA_ITERATIONS
+        self.schedule = gen.SA_COOLING
+        self.initial_temperature = gen.SA_INITIAL_TEMPERATURE
+        self.final_temperature = gen.SA_FINAL_TEMPERATURE
+        self.reheat_after = gen.SA_REHEAT_AFTER
+        self.reheat_factor = gen.SA_REHEAT_FACTOR
+        # Moves and acceptance draws, seeded so runs repeat for a request seed
+        self.random = random.Random(gen.seed)
+
+    def temperature(self, start: float, progress: float) -> float:
+        """
+        Temperature after `progress` (0..1) of a cooling cycle from `start`.
+        """
+        end = min(self.final_temperature, start)
+        if self.schedule == "linear":
+            return start + (end - start) * progress
+        return start * (end / start) ** progress
+
+    def calibrate(self, delta: DeltaFitnessState) -> float:
+        """
+        Initial temperature at which the average worsening move from the
+        starting timetable is accepted with probability INITIAL_ACCEPTANCE.
+        """
+        base = delta.score
+        worse: list[float] = []
+        for _ in range(CALIBRATION_MOVES):
+            mark = delta.mark()
+            self.gen.random_move(delta.chrom, delta, self.random)
+            if delta.score < base:
+                worse.append(base - delta.score)
+            delta.rollback(mark)
+        delta.commit()
+        if not worse:
+            return max(1.0, self.final_temperature)
+        return max(
+            self.final_temperature,
+            -float(np.mean(worse)) / math.log(INITIAL_ACCEPTANCE),
+        )
+
+    def run(self) -> tuple[NDArray[np.int_], float]:
+        gen = self.gen
+        started = time.perf_counter()
+        report = GARunReport(solver="annealing")
+        monitor = ConvergenceMonitor.from_generator(gen)
+        start = gen.initial_population(1, monitor)[0]
+        delta = DeltaFitnessState.from_generator(gen, start.copy())
+
+        t0 = self.initial_temperature or self.calibrate(delta)
+        log.info(
+            "Starting simulated annealing: iterations=%d, schedule=%s, T0=%.2f, "
+            "T_end=%.2f, reheat_after=%s",
+            self.iterations,
+            self.schedule,
+            t0,
+            self.final_temperature,
+            self.reheat_after,
+        )
+        best = delta.chrom.copy()
+        best_score = current = delta.score
+        cycle_start, cycle_temp = 0, t0
+        since_best = 0
+        accepted = 0
+
+        for it in range(self.iterations):
+            if monitor.update(best_score):
+                break
+            span = max(1, self.iterations - cycle_start)
+            temp = self.temperature(cycle_temp, (it - cycle_start) / span)
+
+            mark = delta.mark()
+            gen.random_move(delta.chrom, delta, self.random)
+            score = delta.score
+            if score >= current or self.random.random() < math.exp(
+                (score - current) / temp
+            ):
+                delta.commit()
+                current = score
+                accepted += 1
+            else:
+                delta.rollback(mark)
+            report.generations += 1
+
+            if current > best_score:
+                best, best_score = delta.chrom.copy(), current
+                since_best = 0
+            else:
+                since_best += 1
+                if self.reheat_after and since_best >= self.reheat_after:
+                    delta = DeltaFitnessState.from_generator(gen, best.copy())
+                    current = best_score
+                    cycle_start, cycle_temp = it + 1, self.reheat_factor * t0
+                    since_best = 0
+                    report.reheats += 1
+            gen.report_progress(report.generations, best, best_score, started)
+        else:
+            monitor.update(best_score)
+        gen.report_progress(report.generations, best, best_score, started, force=True)
+
+        report.best_fitness = best_score
+        report.stop_reason = monitor.stop_reason or STOP_COMPLETED
+        report.evaluations = report.generations
+        report.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        gen.last_report = report
+        log.info(
+            "Simulated annealing finished (acceptance %.1f%%): %s",
+            100.0 * accepted / max(1, report.generations),
+            report.as_dict(),
+        )
+        return best, best_score
+
+
+__all__ = ["SimulatedAnnealing"]
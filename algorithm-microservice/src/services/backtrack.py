@@ -0,0 +1,414 @@
+"""
+Deterministic backtracking solver with forward checking.
+
+`BacktrackingSolver` looks for a timetable without any hard-constraint
+violation: every required hour is booked, no teacher, room or class is double
+booked, every teacher is qualified and within the daily/weekly limits, and
+lab hours are placed as adjacent pairs.
+
+Availability is kept as integer bitmasks:
+- per (day, slot): teachers busy and rooms busy (bit i = teacher/room i)
+- per class:       slots busy (bit p = day * SLOTS_PER_DAY + slot)
+- per day:         teachers that cannot take 1 (or 2) more hours
+
+Lessons are grouped per (class, subject, length); identical lessons are placed
+in increasing slot order so symmetric orderings are explored only once.
+
+At every node all open groups are forward checked: a group whose domain
+(start slots with a free class, a free qualified teacher and a free room)
+is empty causes an immediate backtrack. The next group is chosen by MRV
+(smallest domain), ties broken by degree: lab pairs first, then subjects
+with the fewest qualified teachers. Values are ordered to spread a class
+over the week and to prefer lightly loaded teachers. Rooms are
+interchangeable, so only the lowest free room is tried.
+
+The search stops at `backtrack_max_nodes` nodes, `backtrack_time_limit_ms`,
+the solve deadline or cancellation; `run()` then returns None and the caller
+falls back to the GA.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+from .report import GARunReport
+from .termination import STOP_CANCELLED, STOP_COMPLETED, STOP_DEADLINE
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+# Nodes expanded between two clock (and cancellation) checks
+CLOCK_CHECK_INTERVAL = 256
+# Node budget of the first search attempt; doubled on every restart
+RESTART_NODES = 1000
+
+STOP_NODE_LIMIT = "node_limit"
+STOP_TIME_LIMIT = "time_limit"
+STOP_INFEASIBLE = "infeasible"
+STOP_RESTART = "restart"
+
+
+def _bits(mask: int) -> list[int]:
+    out: list[int] = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+class BacktrackingSolver:
+    """
+    Exact search for a violation-free timetable, bounded by nodes and time.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        self.num_classes = gen.NUM_CLASSES
+        self.days = gen.DAYS
+        self.slots = gen.SLOTS_PER_DAY
+        self.num_slots = self.days * self.slots
+        self.num_teachers = gen.TOTAL_TEACHERS
+        self.num_rooms = gen.TOTAL_ROOMS
+        self.max_per_day = gen.MAX_HOURS_PER_DAY
+        self.max_per_week = gen.MAX_HOURS_PER_WEEK
+        self.max_nodes = gen.BACKTRACK_MAX_NODES
+        self.time_limit_ms = gen.BACKTRACK_TIME_LIMIT_MS
+
+        self.all_teachers = (1 << self.num_teachers) - 1
+        self.all_rooms = (1 << self.num_rooms) - 1
+        self.all_slots = (1 << self.num_slots) - 1
+        # Start slots that leave room for a second slot on the same day
+        self.pair_starts = sum(
+            1 << (d * self.slots + s)
+            for d in range(self.days)
+            for s in range(self.slots - 1)
+        )
+
+        self.qualified: dict[int, int] = {}
+        lessons: dict[tuple[int, int], int] = {}  # (subject, length) -> count
+        for subj, hrs in gen.SUBJECT_HOURS.items():
+            subj, hrs = int(subj), int(hrs)
+            if subj < 0 or subj >= gen.NUM_SUBJECTS or hrs <= 0:
+                continue
+            self.qualified[subj] = sum(1 << t for t in gen.problem.teachers_for(subj))
+            if gen.problem.is_lab(subj) and self.slots >= 2:
+                if hrs // 2:
+                    lessons[(subj, 2)] = hrs // 2
+                if hrs % 2:
+                    lessons[(subj, 1)] = 1
+            else:
+                lessons[(subj, 1)] = hrs
+
+        # Groups: [class, subject, length, remaining]
+        self.groups: list[list[int]] = [
+            [c, subj, length, count]
+            for c in range(self.num_classes)
+            for (subj, length), count in lessons.items()
+        ]
+        self.group_sizes = [grp[3] for grp in self.groups]
+        # Expected weekly hours each teacher is needed for (demand shared
+        # evenly among the qualified teachers); busy teachers are tried last
+        self.pressure = [0.0] * self.num_teachers
+        for subj, length, count in (
+            (subj, length, count) for (subj, length), count in lessons.items()
+        ):
+            qual = _bits(self.qualified[subj])
+            for t in qual:
+                self.pressure[t] += self.num_classes * length * count / len(qual)
+        self.rng = random.Random(gen.seed)
+        self.nodes = 0
+        self.stop_reason = STOP_COMPLETED
+
+    # ---------------------------
+    # Driver
+    # ---------------------------
+    def run(self) -> tuple[NDArray[np.int_], float] | None:
+        """
+        Search for a violation-free timetable. Returns (timetable, fitness),
+        or None when the limits were hit or no such timetable exists.
+        """
+        gen = self.gen
+        started = time.perf_counter()
+        limit = None
+        if self.time_limit_ms:
+            limit = time.time() + self.time_limit_ms / 1000.0
+        if gen.deadline_at is not None:
+            limit = gen.deadline_at if limit is None else min(limit, gen.deadline_at)
+        log.info(
+            "Starting backtracking: lessons=%d, max_nodes=%d, time_limit_ms=%s",
+            sum(g[3] for g in self.groups),
+            self.max_nodes,
+            self.time_limit_ms,
+        )
+
+        # Restarts with a doubling node budget and fresh random tie-breaking
+        # escape early mistakes that chronological backtracking never revisits
+        self.nodes = 0
+        budget = RESTART_NODES
+        restarts = 0
+        while True:
+            self._reset()
+            self.rng = random.Random(gen.seed + restarts)
+            found = self._search(limit, self.nodes + budget)
+            if found or self.stop_reason != STOP_RESTART:
+                break
+            restarts += 1
+            budget *= 2
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if not found:
+            log.info(
+                "Backtracking stopped (%s) after %d nodes, %d restarts, %.1f ms",
+                self.stop_reason,
+                self.nodes,
+                restarts,
+                elapsed_ms,
+            )
+            return None
+
+        tt = np.full(
+            (self.num_classes, self.days, self.slots, 3), -1, dtype=gen.GENE_DTYPE
+        )
+        for c, subj, length, p, teacher, room in self.placed:
+            d, s = divmod(p, self.slots)
+            tt[c, d, s : s + length] = [subj, teacher, room]
+        score = float(gen.fitness_batch(tt)[0])
+
+        report = GARunReport(solver="backtracking")
+        report.best_fitness = score
+        report.evaluations = self.nodes
+        report.elapsed_ms = elapsed_ms
+        gen.last_report = report
+        log.info("Backtracking finished: %s", report.as_dict())
+        return tt, score
+
+    def _reset(self) -> None:
+        for grp, count in zip(self.groups, self.group_sizes):
+            grp[3] = count
+        self.teacher_busy = [0] * self.num_slots
+        self.room_busy = [0] * self.num_slots
+        self.class_busy = [0] * self.num_classes
+        self.class_day = [[0] * self.days for _ in range(self.num_classes)]
+        self.day_load = [[0] * self.days for _ in range(self.num_teachers)]
+        self.week_load = [0] * self.num_teachers
+        # blocked[k][d]: teachers that cannot take k more hours on day d
+        self.blocked = {k: [0] * self.days for k in (1, 2)}
+        for t in range(self.num_teachers):
+            self._refresh_blocked(t)
+        # Start slots of the placed instances of each group, in order
+        self.starts: list[list[int]] = [[] for _ in self.groups]
+        self.placed: list[tuple[int, int, int, int, int, int]] = []
+        self.stop_reason = STOP_COMPLETED
+
+    def _search(self, limit: float | None, restart_at: int) -> bool:
+        """
+        Iterative DFS. Each frame holds (group, candidates, next index,
+        whether the frame's current candidate is applied).
+        """
+        sel = self._select()
+        if sel is None:
+            return True
+        stack: list[list[object]] = [[sel[0], sel[1], 0, False]]
+        while stack:
+            frame = stack[-1]
+            g, cands, i, applied = frame
+            if applied:
+                self._undo(g)  # type: ignore[arg-type]
+                frame[3] = False
+            if i >= len(cands):  # type: ignore[arg-type]
+                stack.pop()
+                continue
+            frame[2] = i + 1  # type: ignore[operator]
+
+            self.nodes += 1
+            if self.nodes > self.max_nodes:
+                self.stop_reason = STOP_NODE_LIMIT
+                return False
+            if self.nodes > restart_at:
+                self.stop_reason = STOP_RESTART
+                return False
+            if self.nodes % CLOCK_CHECK_INTERVAL == 0:
+                token = self.gen.cancel_token
+                if token is not None and token.cancelled:
+                    self.stop_reason = STOP_CANCELLED
+                    return False
+                if limit is not None and time.time() >= limit:
+                    deadline = self.gen.deadline_at
+                    self.stop_reason = (
+                        STOP_DEADLINE
+                        if deadline is not None and limit >= deadline
+                        else STOP_TIME_LIMIT
+                    )
+                    return False
+
+            self._apply(g, cands[i])  # type: ignore[arg-type,index]
+            frame[3] = True
+            sel = self._select()
+            if sel is None:
+                return True
+            if sel[1]:
+                stack.append([sel[0], sel[1], 0, False])
+            # Otherwise forward checking found a wipe-out; try the next value
+        self.stop_reason = STOP_INFEASIBLE
+        return False
+
+    # ---------------------------
+    # Propagation and ordering
+    # ---------------------------
+    def _domain(
+        self,
+        g: int,
+        subj_ok: dict[tuple[int, int], int],
+        room_ok: dict[int, int],
+    ) -> int:
+        c, subj, length, _ = self.groups[g]
+        free = ~self.class_busy[c] & self.all_slots
+        if length == 2:
+            free &= (free >> 1) & self.pair_starts
+        # Identical lessons are placed in increasing slot order
+        if self.starts[g]:
+            free &= ~((1 << (self.starts[g][-1] + 1)) - 1)
+        return free & subj_ok[(subj, length)] & room_ok[length]
+
+    def _select(self) -> tuple[int, list[tuple[int, int, int]]] | None:
+        """
+        Forward check every open group and pick the next one by MRV/degree.
+        Returns None when all lessons are placed, or (group, []) on a wipe-out.
+        """
+        open_groups = [g for g, grp in enumerate(self.groups) if grp[3] > 0]
+        if not open_groups:
+            return None
+
+        room_ok = {1: 0, 2: 0}
+        for p in range(self.num_slots):
+            if self.room_busy[p] != self.all_rooms:
+                room_ok[1] |= 1 << p
+            if p + 1 < self.num_slots and (
+                (self.room_busy[p] | self.room_busy[p + 1]) != self.all_rooms
+            ):
+                room_ok[2] |= 1 << p
+        subj_ok: dict[tuple[int, int], int] = {}
+        for g in open_groups:
+            _, subj, length, _ = self.groups[g]
+            if (subj, length) not in subj_ok:
+                subj_ok[(subj, length)] = self._teacher_slots(subj, length)
+
+        best_key: tuple[int, int, int, float] | None = None
+        best_g = -1
+        best_domain = 0
+        for g in open_groups:
+            domain = self._domain(g, subj_ok, room_ok)
+            size = domain.bit_count()
+            if size < self.groups[g][3]:
+                return g, []  # wipe-out: not enough starts left for this group
+            _, subj, length, _ = self.groups[g]
+            key = (size, -length, self.qualified[subj].bit_count(), self.rng.random())
+            if best_key is None or key < best_key:
+                best_key, best_g, best_domain = key, g, domain
+        return best_g, self._candidates(best_g, best_domain)
+
+    def _teacher_slots(self, subj: int, length: int) -> int:
+        """
+        Start slots where some qualified teacher is free for `length` slots.
+        """
+        qual = self.qualified[subj]
+        blocked = self.blocked[length]
+        ok = 0
+        for p in range(self.num_slots):
+            d = p // self.slots
+            busy = self.teacher_busy[p]
+            if length == 2:
+                if p % self.slots == self.slots - 1:
+                    continue
+                busy |= self.teacher_busy[p + 1]
+            if qual & ~busy & ~blocked[d]:
+                ok |= 1 << p
+        return ok
+
+    def _candidates(self, g: int, domain: int) -> list[tuple[int, int, int]]:
+        """
+        (start, teacher, room) values of group `g`, most promising first.
+        """
+        c, subj, length, _ = self.groups[g]
+        out: list[tuple[tuple[int, float, float], tuple[int, int, int]]] = []
+        for p in _bits(domain):
+            d = p // self.slots
+            busy_t = self.teacher_busy[p]
+            busy_r = self.room_busy[p]
+            if length == 2:
+                busy_t |= self.teacher_busy[p + 1]
+                busy_r |= self.room_busy[p + 1]
+            rooms = ~busy_r & self.all_rooms
+            room = (rooms & -rooms).bit_length() - 1
+            for t in _bits(self.qualified[subj] & ~busy_t & ~self.blocked[length][d]):
+                load = self.week_load[t] + self.pressure[t]
+                key = (self.class_day[c][d], load, self.rng.random())
+                out.append((key, (p, t, room)))
+        out.sort()
+        return [v for _, v in out]
+
+    # ---------------------------
+    # State updates
+    # ---------------------------
+    def _refresh_blocked(self, t: int) -> None:
+        bit = 1 << t
+        week = self.week_load[t]
+        for k, blocked in self.blocked.items():
+            for d in range(self.days):
+                if (
+                    self.day_load[t][d] + k > self.max_per_day
+                    or week + k > self.max_per_week
+                ):
+                    blocked[d] |= bit
+                else:
+                    blocked[d] &= ~bit
+
+    def _apply(self, g: int, value: tuple[int, int, int]) -> None:
+        self._book(g, value, +1)
+        self.placed.append((*self.groups[g][:3], *value))  # type: ignore[arg-type]
+
+    def _undo(self, g: int) -> None:
+        _, _, _, p, t, r = self.placed.pop()
+        self._book(g, (p, t, r), -1)
+
+    def _book(self, g: int, value: tuple[int, int, int], sign: int) -> None:
+        grp = self.groups[g]
+        c, _, length, _ = grp
+        p, t, r = value
+        d = p // self.slots
+        t_bit, r_bit = 1 << t, 1 << r
+        for q in range(p, p + length):
+            if sign > 0:
+                self.teacher_busy[q] |= t_bit
+                self.room_busy[q] |= r_bit
+                self.class_busy[c] |= 1 << q
+            else:
+                self.teacher_busy[q] &= ~t_bit
+                self.room_busy[q] &= ~r_bit
+                self.class_busy[c] &= ~(1 << q)
+        self.class_day[c][d] += sign * length
+        self.day_load[t][d] += sign * length
+        self.week_load[t] += sign * length
+        self._refresh_blocked(t)
+        grp[3] -= sign
+        if sign > 0:
+            self.starts[g].append(p)
+        else:
+            self.starts[g].pop()
+
+
+__all__ = [
+    "BacktrackingSolver",
+    "STOP_INFEASIBLE",
+    "STOP_NODE_LIMIT",
+    "STOP_TIME_LIMIT",
+]
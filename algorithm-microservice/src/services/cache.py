@@ -0,0 +1,113 @@
+"""
+Bounded LRU memoization of chromosome fitness.
+
+Chromosomes are keyed by a 128-bit BLAKE2b digest of their raw bytes (plus
+shape and dtype), so elites carried forward unchanged, duplicate children and
+the final selection never pay for evaluation twice within a GA run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class FitnessCache:
+    """
+    Least-recently-used cache mapping chromosome content -> fitness.
+
+    A `maxsize` of 0 disables caching; every lookup is then a miss.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = max(0, int(maxsize))
+        self._data: OrderedDict[bytes, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def key(chrom: NDArray[np.int_]) -> bytes:
+        """
+        Fast content hash of a chromosome.
+        """
+        arr = np.ascontiguousarray(chrom)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str((arr.shape, arr.dtype.str)).encode())
+        h.update(arr.data)
+        return h.digest()
+
+    def get(self, key: bytes) -> float | None:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: bytes, value: float) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def score(
+        self,
+        pop: Sequence[NDArray[np.int_]],
+        scorer: Callable[[NDArray[np.int_]], NDArray[np.float64]],
+    ) -> NDArray[np.float64]:
+        """
+        Score a population, evaluating only chromosomes not already cached.
+
+        Args:
+            pop: Sequence of chromosomes of identical shape, or a stacked
+                 (P, C, D, S, 3) array.
+            scorer: Batch scorer taking a stacked (N, C, D, S, 3) array.
+
+        Returns:
+            Float array of shape (len(pop),) in population order.
+        """
+        keys = [self.key(x) for x in pop]
+        scores = np.empty(len(pop), dtype=np.float64)
+        pending: dict[bytes, list[int]] = {}
+        for i, k in enumerate(keys):
+            if k in pending:
+                # Duplicate of a chromosome already queued in this batch
+                pending[k].append(i)
+                self.hits += 1
+                continue
+            cached = self.get(k)
+            if cached is None:
+                pending[k] = [i]
+            else:
+                scores[i] = cached
+        if pending:
+            first = [idx[0] for idx in pending.values()]
+            if isinstance(pop, np.ndarray):
+                # Stacked populations are scored in place when nothing is cached
+                fresh = scorer(pop if len(first) == len(pop) else pop[first])
+            else:
+                fresh = scorer(np.stack([pop[i] for i in first]))
+            for (k, idx), value in zip(pending.items(), fresh.tolist()):
+                self.put(k, value)
+                scores[idx] = value
+        return scores
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_size": len(self._data),
+        }
+
+
+__all__ = ["FitnessCache"]
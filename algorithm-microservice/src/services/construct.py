@@ -0,0 +1,195 @@
+"""
+Constraint-aware greedy construction of initial timetables.
+
+Unlike `TimetableGenerator.generate_random_timetable`, which fills each class
+independently, `ConstructiveInitializer` keeps teacher and room occupancy
+shared across all classes while it builds one timetable:
+
+1. Lessons are expanded from SUBJECT_HOURS for every class: lab subjects as
+   2-slot pairs (plus an odd single), everything else as singles.
+2. Lessons are placed most-constrained first: lab pairs before singles, and
+   within each group subjects with the fewest qualified teachers first. Ties
+   are broken randomly so repeated builds give a diverse population.
+3. Each lesson goes to a random (day, slot) where the class, a qualified
+   teacher and a room are all free. Teacher daily/weekly limits are honoured
+   when possible; otherwise they are relaxed. A lesson that cannot be placed
+   without a clash is left out, since a missing hour costs less than a clash.
+
+`build_batch` builds many timetables at once: every timetable gets its own
+lesson order, but position k of every order holds a lesson of the same
+length (lengths sort first), so step k places one lesson in all timetables
+with array operations over the batch instead of a Python loop per timetable.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+
+class ConstructiveInitializer:
+    """
+    Greedy, clash-avoiding timetable builder for one problem definition.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.num_classes = gen.NUM_CLASSES
+        self.days = gen.DAYS
+        self.slots = gen.SLOTS_PER_DAY
+        self.num_teachers = gen.TOTAL_TEACHERS
+        self.num_rooms = gen.TOTAL_ROOMS
+        self.max_per_day = gen.MAX_HOURS_PER_DAY
+        self.max_per_week = gen.MAX_HOURS_PER_WEEK
+        self.dtype = gen.GENE_DTYPE
+
+        problem = gen.problem
+        self.subject_teachers: dict[int, NDArray[np.int_]] = {}
+        lessons: list[tuple[int, int]] = []  # (subject, length)
+        for subj, hrs in gen.SUBJECT_HOURS.items():
+            subj = int(subj)
+            if subj < 0 or subj >= gen.NUM_SUBJECTS:
+                continue
+            self.subject_teachers[subj] = np.array(problem.teacher_pool(subj))
+            if problem.is_lab(subj) and self.slots >= 2:
+                lessons += [(subj, 2)] * (int(hrs) // 2)
+                lessons += [(subj, 1)] * (int(hrs) % 2)
+            else:
+                lessons += [(subj, 1)] * int(hrs)
+        self.lessons = lessons
+
+        # Teacher pools padded into a table: pool_table[s, :pool_width[s]]
+        width = max((len(t) for t in self.subject_teachers.values()), default=1)
+        n_subj = max(self.subject_teachers, default=0) + 1
+        self.pool_table = np.zeros((n_subj, width), dtype=np.int64)
+        self.pool_valid = np.zeros((n_subj, width), dtype=bool)
+        for subj, teachers in self.subject_teachers.items():
+            self.pool_table[subj, : len(teachers)] = teachers
+            self.pool_valid[subj, : len(teachers)] = True
+
+        # Every (class, subject, length) lesson as parallel arrays
+        self.item_class = np.repeat(np.arange(self.num_classes), len(lessons))
+        self.item_subject = np.tile(
+            np.array([subj for subj, _ in lessons], dtype=np.int64), self.num_classes
+        )
+        self.item_length = np.tile(
+            np.array([length for _, length in lessons], dtype=np.int64),
+            self.num_classes,
+        )
+
+    def _order(self, rng: np.random.Generator, count: int) -> NDArray[np.intp]:
+        """
+        `count` independent lesson orders, most constrained first: longer
+        lessons, then subjects with fewer teachers, then random.
+        """
+        scarcity = np.array(
+            [len(self.subject_teachers[s]) for s in self.item_subject.tolist()]
+        )
+        # scarcity + noise stays below the length step, so length sorts first
+        key = -self.item_length * (self.num_teachers + 2) + scarcity
+        return np.argsort(key + rng.random((count, len(key))), axis=1)
+
+    def build(self, rng: np.random.Generator) -> NDArray[np.int_]:
+        """
+        Construct one timetable of shape (NUM_CLASSES, DAYS, SLOTS_PER_DAY, 3).
+        """
+        return self.build_batch(rng, 1)[0]
+
+    def build_batch(self, rng: np.random.Generator, count: int) -> NDArray[np.int_]:
+        """
+        Construct `count` independent timetables as a (count, NUM_CLASSES,
+        DAYS, SLOTS_PER_DAY, 3) array.
+
+        Each step only looks at the lesson subject's teacher pool (gathered
+        per timetable), and single-slot lessons check rooms by count, so the
+        work per step is independent of the total teacher and room numbers.
+        """
+        B, C, D, S = count, self.num_classes, self.days, self.slots
+        T, R = self.num_teachers, self.num_rooms
+        tt = np.full((B, C, D, S, 3), -1, dtype=self.dtype)
+        if B == 0 or len(self.item_class) == 0:
+            return tt
+        class_busy = np.zeros((B, C, D, S), dtype=bool)
+        teacher_busy = np.zeros((B, T, D, S), dtype=bool)
+        room_busy = np.zeros((B, D, S, R), dtype=bool)
+        rooms_used = np.zeros((B, D, S), dtype=np.int64)
+        day_load = np.zeros((B, T, D), dtype=np.int64)
+        week_load = np.zeros((B, T), dtype=np.int64)
+        at = np.arange(B)
+        rows = at[:, None]
+
+        for idx in self._order(rng, B).T:
+            c = self.item_class[idx]
+            subj = self.item_subject[idx]
+            length = int(self.item_length[idx[0]])
+            starts = S - length + 1
+            if starts <= 0:
+                continue
+            pool = self.pool_table[subj]  # (B, P)
+
+            # Slots where the class, a pool teacher and a room are free for the
+            # whole lesson
+            free = ~class_busy[at, c, :, :starts]
+            t_busy = teacher_busy[rows, pool]  # (B, P, D, S)
+            t_free = ~t_busy[..., :starts]
+            for k in range(1, length):
+                free &= ~class_busy[at, c, :, k : starts + k]
+                t_free &= ~t_busy[..., k : starts + k]
+            t_free &= self.pool_valid[subj][:, :, None, None]
+            if length == 1:
+                r_free = rooms_used < R
+            else:
+                r_window = room_busy[:, :, :starts].copy()
+                for k in range(1, length):
+                    r_window |= room_busy[:, :, k : starts + k]
+                r_free = ~r_window.all(axis=3)
+
+            within = (day_load[rows, pool] + length <= self.max_per_day) & (
+                week_load[rows, pool] + length <= self.max_per_week
+            )[:, :, None]  # (B, P, D)
+            base = free & r_free
+            # Teacher limits are relaxed only where they leave no candidate
+            t_ok = t_free & within[..., None]
+            cand = base & t_ok.any(axis=1)
+            strict = cand.reshape(B, -1).any(axis=1)
+            t_ok = np.where(strict[:, None, None, None], t_ok, t_free)
+            cand = np.where(strict[:, None, None], cand, base & t_free.any(axis=1))
+
+            keys = np.where(cand.reshape(B, -1), rng.random((B, D * starts)), -1.0)
+            pick = keys.argmax(axis=1)
+            placed = keys[at, pick] >= 0.0
+            # No clash-free placement: the hour is left out (cheaper than a clash)
+            if not placed.any():
+                continue
+            r = at[placed]
+            d, s = np.divmod(pick[placed], starts)
+            cr, sr = c[placed], subj[placed]
+
+            # Least-loaded available teacher (noise < 1 breaks ties randomly)
+            loads = week_load[r[:, None], pool[placed]] + 0.5 * rng.random(
+                pool[placed].shape
+            )
+            slot = np.where(t_ok[r, :, d, s], loads, np.inf).argmin(axis=1)
+            teacher = pool[placed, slot]
+            room_free = ~room_busy[r, d, s]
+            for k in range(1, length):
+                room_free &= ~room_busy[r, d, s + k]
+            room = np.where(room_free, rng.random((len(r), R)), -1.0).argmax(axis=1)
+
+            cell = np.stack([sr, teacher, room], axis=1)
+            for k in range(length):
+                tt[r, cr, d, s + k] = cell
+                class_busy[r, cr, d, s + k] = True
+                teacher_busy[r, teacher, d, s + k] = True
+                room_busy[r, d, s + k, room] = True
+                rooms_used[r, d, s + k] += 1
+            day_load[r, teacher, d] += length
+            week_load[r, teacher] += length
+        return tt
+
+
+__all__ = ["ConstructiveInitializer"]
@@ -0,0 +1,269 @@
+"""
+Incremental (delta) fitness evaluation for single-chromosome moves.
+
+A `DeltaFitnessState` wraps one chromosome together with the bookkeeping needed
+to update its penalty in O(changed cells) instead of re-scoring the whole
+(NUM_CLASSES, DAYS, SLOTS_PER_DAY, 3) array:
+
+- teacher and room occupancy counters per (day, slot)
+- teacher daily and weekly loads
+- per-class subject hour counts
+- odd lab-run counts per (class, day) row
+- the raw penalty components (see `fitness.PENALTY_WEIGHTS`)
+
+Every cell write goes through `set_cell`, which removes the old cell's
+contribution, writes the new value and adds its contribution back. Writes are
+journaled so callers (e.g. local search) can `rollback` rejected moves.
+
+Full re-scoring remains available through `verify()`, and constructing the
+state with `verify=True` checks every write against the batch evaluator.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+from . import kernels
+from .fitness import PENALTY_COMPONENTS, PENALTY_WEIGHTS, BatchFitnessEvaluator
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+
+class DeltaFitnessState:
+    """
+    Penalty bookkeeping for one chromosome, updated cell by cell.
+
+    The wrapped chromosome is modified in place; use `chrom.copy()` before
+    constructing the state if the original must be preserved.
+    """
+
+    def __init__(
+        self,
+        evaluator: BatchFitnessEvaluator,
+        chrom: NDArray[np.int_],
+        verify: bool = False,
+    ):
+        self.evaluator = evaluator
+        self.chrom = chrom
+        self.verify_each_write = verify
+        self.journal: list[tuple[int, int, int, tuple[int, int, int]]] = []
+
+        ev = evaluator
+        C, D, S, _ = chrom.shape
+        subj = chrom[..., 0].astype(np.int64)
+        if subj.size and int(subj.max()) >= ev.num_subjects:
+            ev._ensure_subject_capacity(int(subj.max()))
+        NS = ev.num_subjects
+
+        self._max_day = ev.max_per_day
+        self._max_week = ev.max_per_week
+        problem = ev.problem
+        self._lab_set = problem.lab_subjects
+        self._is_lab = ev.padded_lab_mask()
+        # Subjects beyond the problem's tables have no required hours
+        pad = NS - problem.num_subjects
+        self._required = np.pad(problem.required_hours, (0, pad))
+        self._has_required = np.pad(problem.has_required, (0, pad))
+
+        occ = subj != -1
+        c_idx, d_idx, s_idx = np.nonzero(occ)
+        o_subj = subj[occ]
+        o_teacher = chrom[..., 1][occ].astype(np.int64)
+        o_room = chrom[..., 2][occ].astype(np.int64)
+
+        T, R = ev.num_teachers, ev.num_rooms
+        self.teacher_occ = np.zeros((D, S, T), dtype=np.int64)
+        np.add.at(self.teacher_occ, (d_idx, s_idx, o_teacher), 1)
+        self.room_occ = np.zeros((D, S, R), dtype=np.int64)
+        np.add.at(self.room_occ, (d_idx, s_idx, o_room), 1)
+        self.day_load = np.zeros((T, D), dtype=np.int64)
+        np.add.at(self.day_load, (o_teacher, d_idx), 1)
+        self.week_load = self.day_load.sum(axis=1)
+        self.class_counts = np.zeros((C, NS), dtype=np.int64)
+        np.add.at(self.class_counts, (c_idx, o_subj), 1)
+        self.lab_rows = ev.odd_lab_runs(subj)
+
+        hour_gap = np.abs(self.class_counts - self._required)[:, self._has_required]
+        self.components: dict[str, int] = {
+            "teacher_clash": int(np.maximum(0, self.teacher_occ - 1).sum()),
+            "room_clash": int(np.maximum(0, self.room_occ - 1).sum()),
+            "unqualified": int(np.count_nonzero(~ev.qualified[o_subj, o_teacher])),
+            "daily_overload": int(np.maximum(0, self.day_load - self._max_day).sum()),
+            "weekly_overload": int(
+                np.maximum(0, self.week_load - self._max_week).sum()
+            ),
+            "lab_parity": int(self.lab_rows.sum()),
+            "hours_mismatch": int(hour_gap.sum()),
+        }
+
+    @classmethod
+    def from_generator(
+        cls,
+        gen: "TimetableGenerator",
+        chrom: NDArray[np.int_],
+        verify: bool = False,
+    ) -> "DeltaFitnessState":
+        return cls(gen.batch_evaluator, chrom, verify=verify)
+
+    # ---------------------------
+    # Score access
+    # ---------------------------
+    @property
+    def penalty(self) -> int:
+        return sum(self.components[k] * PENALTY_WEIGHTS[k] for k in PENALTY_COMPONENTS)
+
+    @property
+    def score(self) -> float:
+        """
+        Fitness of the wrapped chromosome (higher is better).
+        """
+        return -float(self.penalty)
+
+    # ---------------------------
+    # Cell updates
+    # ---------------------------
+    def set_cell(self, c: int, d: int, s: int, value: object) -> None:
+        """
+        Write [subject, teacher, room] into cell (c, d, s) and update the score.
+        """
+        subj, teacher, room = (int(v) for v in value)  # type: ignore[union-attr]
+        old = tuple(int(v) for v in self.chrom[c, d, s])
+        if old == (subj, teacher, room):
+            return
+        self.journal.append((c, d, s, old))  # type: ignore[arg-type]
+        self._write(c, d, s, old, (subj, teacher, room))
+        if self.verify_each_write:
+            self.verify(raise_on_mismatch=True)
+
+    def _write(
+        self,
+        c: int,
+        d: int,
+        s: int,
+        old: tuple[int, ...],
+        new: tuple[int, ...],
+    ) -> None:
+        if old[0] != -1:
+            self._account(c, d, s, old, -1)
+        self.chrom[c, d, s] = new
+        if new[0] != -1:
+            self._account(c, d, s, new, +1)
+        if old[0] in self._lab_set or new[0] in self._lab_set:
+            self._refresh_lab_row(c, d)
+
+    def _account(self, c: int, d: int, s: int, cell: tuple[int, ...], sign: int) -> None:
+        subj, teacher, room = cell
+        comps = self.components
+
+        # Slot occupancy: a booking clashes when the counter is already >= 1
+        t_before = int(self.teacher_occ[d, s, teacher])
+        self.teacher_occ[d, s, teacher] = t_before + sign
+        if (t_before if sign > 0 else t_before - 1) >= 1:
+            comps["teacher_clash"] += sign
+
+        r_before = int(self.room_occ[d, s, room])
+        self.room_occ[d, s, room] = r_before + sign
+        if (r_before if sign > 0 else r_before - 1) >= 1:
+            comps["room_clash"] += sign
+
+        # Loads: an hour counts as overload when it lies above the limit
+        day_before = int(self.day_load[teacher, d])
+        self.day_load[teacher, d] = day_before + sign
+        if (day_before if sign > 0 else day_before - 1) >= self._max_day:
+            comps["daily_overload"] += sign
+
+        week_before = int(self.week_load[teacher])
+        self.week_load[teacher] = week_before + sign
+        if (week_before if sign > 0 else week_before - 1) >= self._max_week:
+            comps["weekly_overload"] += sign
+
+        if not self.evaluator.qualified[subj, teacher]:
+            comps["unqualified"] += sign
+
+        have = int(self.class_counts[c, subj])
+        self.class_counts[c, subj] = have + sign
+        if self._has_required[subj]:
+            req = int(self._required[subj])
+            comps["hours_mismatch"] += abs(have + sign - req) - abs(have - req)
+
+    def _refresh_lab_row(self, c: int, d: int) -> None:
+        if kernels.COMPILED:
+            odd = int(kernels.odd_lab_runs_row(self.chrom[c, d, :, 0], self._is_lab))
+        else:
+            odd = self._odd_lab_runs(c, d)
+        prev = int(self.lab_rows[c, d])
+        self.lab_rows[c, d] = odd
+        self.components["lab_parity"] += odd - prev
+
+    def _odd_lab_runs(self, c: int, d: int) -> int:
+        row = self.chrom[c, d, :, 0].tolist()
+        odd = 0
+        i = 0
+        n = len(row)
+        while i < n:
+            subj = row[i]
+            if subj in self._lab_set:
+                j = i
+                while j < n and row[j] == subj:
+                    j += 1
+                odd += (j - i) % 2
+                i = j
+            else:
+                i += 1
+        return odd
+
+    # ---------------------------
+    # Journal
+    # ---------------------------
+    def mark(self) -> int:
+        """
+        Return a journal position that `rollback` can restore to.
+        """
+        return len(self.journal)
+
+    def rollback(self, mark: int = 0) -> None:
+        """
+        Undo every write made after `mark`, newest first.
+        """
+        while len(self.journal) > mark:
+            c, d, s, old = self.journal.pop()
+            current = tuple(int(v) for v in self.chrom[c, d, s])
+            self._write(c, d, s, current, old)
+
+    def commit(self) -> None:
+        """
+        Accept all journaled writes and clear the journal.
+        """
+        self.journal.clear()
+
+    # ---------------------------
+    # Verification
+    # ---------------------------
+    def verify(self, raise_on_mismatch: bool = False) -> bool:
+        """
+        Re-score the chromosome from scratch and compare with the incremental
+        components. Returns True when they match.
+        """
+        full = self.evaluator.components(self.chrom)
+        expected = {k: int(v[0]) for k, v in full.items()}
+        if expected == self.components:
+            return True
+        log.warning(
+            "Delta fitness mismatch: incremental=%s full=%s",
+            self.components,
+            expected,
+        )
+        if raise_on_mismatch:
+            raise RuntimeError("Incremental fitness diverged from full re-scoring")
+        return False
+
+
+__all__ = ["DeltaFitnessState"]
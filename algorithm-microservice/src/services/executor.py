@@ -0,0 +1,564 @@
+"""
+Bounded process-pool executor for API timetable solves.
+
+Solving is CPU-bound and can take seconds to minutes, so the API never runs
+`TimetableGenerator.solve` on the event loop. Every generate route hands the
+request to the shared `SolverExecutor` instead:
+
+- Solves run in a `ProcessPoolExecutor` of SOLVER_PROCESSES workers. The
+  worker builds the generator, solves and renders the requested views; only
+  the request, the department resources and the rendered `SolveOutcome`
+  cross the process boundary.
+- Admission control: at most SOLVER_PROCESSES running plus SOLVER_QUEUE_SIZE
+  waiting solves are accepted. Further requests fail fast with `SolverBusy`
+  (HTTP 429), and a broken or stopped pool gives `SolverBusy` with HTTP 503.
+  Both carry a Retry-After estimate from the recent average solve time.
+- Progress: a solve submitted with `on_progress` forwards the solver's progress
+  events (throttled by the generator to one per PROGRESS_INTERVAL_MS) through
+  a multiprocessing queue. A drain thread in the API process hands them to the
+  callback, e.g. to update a job record (see `jobs`).
+- Cancellation: every admitted solve owns a slot in a shared-memory flag
+  array. `cancel(task)` sets the flag; the solver process polls it through
+  the generator's cancel token between generations and evaluation chunks
+  and stops with stop_reason "cancelled" (a solve cancelled before it
+  started raises `SolveCancelled`). A solve keeps its slot, and counts as
+  pending, until its worker has actually finished, even when the awaiting
+  task was cancelled (which also raises the flag). `metrics()` counts
+  completed, cancelled, failed and rejected solves.
+- Shutdown raises every cancel flag first, so running solves stop at their
+  next check instead of finishing their budget.
+
+A GA run inside a solver process may still start its own SOLVER_WORKERS pool
+(see `parallel`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
+from functools import lru_cache, partial
+from typing import Any, Callable, Iterable
+
+from src.core.config import get_settings
+from src.core.utils import get_logger
+
+from ..models.request_models import TimetableRequest
+from ..schemas.combined_timetable import CombinedTimetable
+from ..schemas.student_timetable import StudentTimetable
+from ..schemas.teacher_timetable import TeacherTimetable
+from . import kernels
+from .generator import TimetableGenerator
+from .termination import STOP_CANCELLED, CancellationToken
+
+log = get_logger(__name__)
+
+VIEWS: tuple[str, ...] = ("student", "teacher", "combined", "flat")
+
+# Weight of the newest solve in the running average duration
+_DURATION_SMOOTHING = 0.3
+
+ProgressCallback = Callable[[dict[str, Any]], None]
+
+# Set in each solver process by `_init_worker`
+_PROGRESS_QUEUE: Any = None
+_CANCEL_FLAGS: Any = None
+
+
+def _init_worker(progress_queue: Any, cancel_flags: Any) -> None:
+    global _PROGRESS_QUEUE, _CANCEL_FLAGS
+    _PROGRESS_QUEUE = progress_queue
+    _CANCEL_FLAGS = cancel_flags
+    kernels.warmup()
+
+
+class _SharedCancelToken(CancellationToken):
+    """
+    Cancel token reading its solve's flag in the shared cancel array.
+    """
+
+    def __init__(self, slot: int):
+        super().__init__()
+        self.slot = slot
+
+    @property
+    def cancelled(self) -> bool:
+        # Processes without the array (e.g. spawned GA workers) never cancel
+        if not self._cancelled and _CANCEL_FLAGS is not None:
+            self._cancelled = bool(_CANCEL_FLAGS[self.slot])
+        return self._cancelled
+
+
+class _ProgressForwarder:
+    """
+    `TimetableGenerator.on_progress` hook posting events to the API process.
+    """
+
+    def __init__(self, key: int):
+        self.key = key
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        if _PROGRESS_QUEUE is not None:
+            _PROGRESS_QUEUE.put((self.key, {"type": "generation", **event}))
+
+
+class SolverBusy(Exception):
+    """
+    A solve was rejected; retry after `retry_after` seconds.
+    """
+
+    def __init__(self, message: str, retry_after: int, status_code: int = 429):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class SolveCancelled(Exception):
+    """
+    A solve was cancelled before it produced a timetable.
+    """
+
+
+@dataclass
+class SolveOutcome:
+    """
+    Result of one solve with the requested views rendered.
+    """
+
+    fitness_score: float
+    generation_count: int
+    stop_reason: str
+    deadline_reached: bool
+    winning_config: dict[str, Any] | None
+    student_timetables: list[StudentTimetable] = field(default_factory=list)
+    teacher_timetables: list[TeacherTimetable] = field(default_factory=list)
+    combined_view: list[CombinedTimetable] = field(default_factory=list)
+    flat: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        JSON-serializable form (views as plain dicts).
+        """
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        for name in ("student_timetables", "teacher_timetables", "combined_view"):
+            data[name] = [view.model_dump() for view in getattr(self, name)]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SolveOutcome":
+        return cls(
+            **{
+                **data,
+                "student_timetables": [
+                    StudentTimetable.model_validate(v)
+                    for v in data.get("student_timetables", [])
+                ],
+                "teacher_timetables": [
+                    TeacherTimetable.model_validate(v)
+                    for v in data.get("teacher_timetables", [])
+                ],
+                "combined_view": [
+                    CombinedTimetable.model_validate(v)
+                    for v in data.get("combined_view", [])
+                ],
+            }
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """
+        The fields shared by every generate response model.
+        """
+        return {
+            "success": True,
+            "fitness_score": self.fitness_score,
+            "generation_count": self.generation_count,
+            "stop_reason": self.stop_reason,
+            "deadline_reached": self.deadline_reached,
+            "winning_config": self.winning_config,
+        }
+
+
+def build_generator(
+    request: TimetableRequest, resources: dict[str, Any] | None = None
+) -> TimetableGenerator:
+    """
+    Generator for `request`, with department resources (as returned by
+    `get_department_resources`) when given.
+    """
+    if resources is None:
+        return TimetableGenerator(config=request)
+    return TimetableGenerator(
+        request,
+        TOTAL_ROOMS=resources["total_rooms"],
+        TOTAL_TEACHERS=resources["total_teachers"],
+        ROOM_NAMES=resources["room_names"],
+        NUM_CLASSES=resources["total_classes"],
+        CLASS_NAMES=resources["class_names"],
+        TOTAL_SUBJECTS=resources["total_subjects"],
+        SUBJECT_NAMES=resources["subject_names"],
+        SUBJECT_TYPES=resources["subject_types"],
+        TEACHER_NAMES=resources["teacher_names"],
+        SUBJECT_TEACHERS=resources["subject_teachers"],
+        SUBJECT_HOURS=resources["subject_hours"],
+    )
+
+
+def solve_request(
+    request: TimetableRequest,
+    resources: dict[str, Any] | None = None,
+    views: Iterable[str] = ("combined",),
+    progress_key: int | None = None,
+    cancel_slot: int | None = None,
+    deadline_at: float | None = None,
+) -> SolveOutcome:
+    """
+    Build a generator, solve and render `views`. Runs in a solver process;
+    with a `progress_key`, solver progress is posted to the API process, and with
+    a `cancel_slot` the solve stops early once that flag is set. `deadline_at`
+    is the request's absolute time-budget deadline, stamped on admission.
+
+    Raises:
+        SolveCancelled: The flag was set before the solve started, or the
+            cancelled solver produced no timetable.
+    """
+    token = _SharedCancelToken(cancel_slot) if cancel_slot is not None else None
+    if token is not None and token.cancelled:
+        raise SolveCancelled("Solve was cancelled before it started")
+    gen = build_generator(request, resources)
+    gen.cancel_token = token
+    if progress_key is not None and _PROGRESS_QUEUE is not None:
+        _PROGRESS_QUEUE.put((progress_key, {"type": "started"}))
+        gen.on_progress = _ProgressForwarder(progress_key)
+    try:
+        best, score = gen.solve(deadline_at)
+    except Exception as exc:
+        # e.g. a portfolio whose members were stopped before any reported
+        if token is not None and token.cancelled:
+            raise SolveCancelled("Solve was cancelled") from exc
+        raise
+    views = set(views)
+    return SolveOutcome(
+        fitness_score=float(score),
+        generation_count=gen.generations_run,
+        stop_reason=gen.stop_reason,
+        deadline_reached=gen.deadline_reached,
+        winning_config=gen.winning_config,
+        student_timetables=(
+            gen.generate_student_view(best) if "student" in views else []
+        ),
+        teacher_timetables=(
+            gen.generate_teacher_view(best) if "teacher" in views else []
+        ),
+        combined_view=gen.generate_combined_view(best) if "combined" in views else [],
+        flat=gen.generate_flat_view(best) if "flat" in views else [],
+    )
+
+
+class SolverExecutor:
+    """
+    Process pool with a bounded number of accepted solves.
+    """
+
+    def __init__(self, processes: int, queue_size: int, retry_after: int = 5):
+        self.processes = max(1, int(processes))
+        self.queue_size = max(0, int(queue_size))
+        self.min_retry_after = max(1, int(retry_after))
+        self.pending = 0
+        self.avg_duration: float | None = None
+        self._pool: ProcessPoolExecutor | None = None
+        self._closed = False
+        self._progress_queue: Any = None
+        self._drain: threading.Thread | None = None
+        self._listeners: dict[int, ProgressCallback] = {}
+        self._keys = itertools.count()
+        # One cancel flag per accepted solve; slots are recycled
+        self._cancel_flags: Any = multiprocessing.RawArray("b", self.capacity)
+        self._free_slots = list(range(self.capacity))
+        self._slots: dict[asyncio.Task[SolveOutcome], int] = {}
+        self.counters: dict[str, int] = dict.fromkeys(
+            ("completed", "cancelled", "failed", "rejected"), 0
+        )
+        self.cancelled_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "SolverExecutor":
+        settings = get_settings()
+        return cls(
+            settings.solver_processes,
+            settings.solver_queue_size,
+            settings.solver_retry_after,
+        )
+
+    @property
+    def capacity(self) -> int:
+        """
+        Solves accepted at once: running plus waiting.
+        """
+        return self.processes + self.queue_size
+
+    def retry_after(self) -> int:
+        """
+        Seconds until a slot is likely free, from the average solve time.
+        """
+        if self.avg_duration is None:
+            return self.min_retry_after
+        waves = max(1, self.pending - self.processes + 1) / self.processes
+        return max(self.min_retry_after, math.ceil(self.avg_duration * waves))
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._progress_queue is None:
+            self._progress_queue = multiprocessing.Queue()
+            self._drain = threading.Thread(
+                target=self._drain_progress,
+                args=(self._progress_queue,),
+                name="solver-progress",
+                daemon=True,
+            )
+            self._drain.start()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(self._progress_queue, self._cancel_flags),
+            )
+        return self._pool
+
+    def _drain_progress(self, queue: Any) -> None:
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            key, event = item
+            listener = self._listeners.get(key)
+            if listener is None:
+                continue
+            try:
+                listener(event)
+            except Exception:
+                log.exception("Progress listener failed")
+
+    def submit(
+        self,
+        request: TimetableRequest,
+        resources: dict[str, Any] | None = None,
+        views: Iterable[str] = ("combined",),
+        on_progress: ProgressCallback | None = None,
+    ) -> "asyncio.Task[SolveOutcome]":
+        """
+        Admit a solve and start it in a worker process; must be called from
+        the event loop. `on_progress` is called from a background thread.
+        Stop the solve with `cancel(task)`, not `task.cancel()`, which would
+        leave the solver process running.
+
+        Raises:
+            SolverBusy: The queue is full (429) or the pool is unavailable (503).
+        """
+        if self._closed:
+            self.counters["rejected"] += 1
+            raise SolverBusy("Solver is shutting down", self.min_retry_after, 503)
+        if self.pending >= self.capacity:
+            self.counters["rejected"] += 1
+            raise SolverBusy(
+                f"Solver queue is full ({self.pending} solves pending)",
+                self.retry_after(),
+            )
+        self.pending += 1
+        key = None
+        if on_progress is not None:
+            key = next(self._keys)
+            self._listeners[key] = on_progress
+        slot = self._free_slots.pop()
+        self._cancel_flags[slot] = 0
+        # The time budget runs from admission, queueing included
+        budget = request.time_budget_ms
+        deadline_at = time.time() + budget / 1000.0 if budget else None
+        task = asyncio.ensure_future(
+            self._run(request, resources, tuple(views), key, slot, deadline_at)
+        )
+        self._slots[task] = slot
+        return task
+
+    def cancel(self, task: "asyncio.Task[SolveOutcome]") -> bool:
+        """
+        Ask the solve behind `task` to stop. A running solve finishes with
+        stop_reason "cancelled" and its best timetable so far; a queued one
+        fails with `SolveCancelled`. False if the solve already finished.
+        """
+        slot = self._slots.get(task)
+        if slot is None:
+            return False
+        self._cancel_flags[slot] = 1
+        return True
+
+    async def run(
+        self,
+        request: TimetableRequest,
+        resources: dict[str, Any] | None = None,
+        views: Iterable[str] = ("combined",),
+    ) -> SolveOutcome:
+        """
+        Solve `request` in a worker process without blocking the event loop.
+
+        Raises:
+            SolverBusy: The queue is full (429) or the pool is unavailable (503).
+        """
+        return await self.submit(request, resources, views)
+
+    async def _run(
+        self,
+        request: TimetableRequest,
+        resources: dict[str, Any] | None,
+        views: tuple[str, ...],
+        key: int | None,
+        slot: int,
+        deadline_at: float | None,
+    ) -> SolveOutcome:
+        started = time.perf_counter()
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                future = self._executor().submit(
+                    solve_request,
+                    request,
+                    resources,
+                    views,
+                    key,
+                    slot,
+                    deadline_at,
+                )
+            except BaseException:
+                self._release(task, key, slot)
+                raise
+            # The slot belongs to the worker's solve, which outlives this task
+            # when the task is cancelled; free it once the worker is done
+            future.add_done_callback(
+                partial(self._release_threadsafe, loop, task, key, slot)
+            )
+            outcome = await asyncio.wrap_future(future)
+        except BrokenProcessPool as exc:
+            log.error("Solver process pool broke (%s); restarting it", exc)
+            self._reset()
+            self.counters["failed"] += 1
+            raise SolverBusy("Solver pool is restarting", self.min_retry_after, 503)
+        except asyncio.CancelledError:
+            # Cancelling the wrapper does not stop a solve already running in
+            # a worker process; its cancel flag does
+            self._cancel_flags[slot] = 1
+            self._record_cancelled(time.perf_counter() - started)
+            raise
+        except SolveCancelled:
+            self._record_cancelled(time.perf_counter() - started)
+            raise
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        if outcome.stop_reason == STOP_CANCELLED:
+            self._record_cancelled(time.perf_counter() - started)
+        else:
+            self.counters["completed"] += 1
+            # Cancelled runs would drag the Retry-After estimate down
+            self._record(time.perf_counter() - started)
+        return outcome
+
+    def _release(
+        self, task: "asyncio.Task[Any] | None", key: int | None, slot: int
+    ) -> None:
+        self.pending -= 1
+        if key is not None:
+            self._listeners.pop(key, None)
+        if task is not None:
+            self._slots.pop(task, None)
+        self._free_slots.append(slot)
+
+    def _release_threadsafe(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        task: "asyncio.Task[Any] | None",
+        key: int | None,
+        slot: int,
+        future: "Future[SolveOutcome]",
+    ) -> None:
+        # Runs on the pool's management thread
+        try:
+            loop.call_soon_threadsafe(self._release, task, key, slot)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    def _record(self, seconds: float) -> None:
+        if self.avg_duration is None:
+            self.avg_duration = seconds
+        else:
+            self.avg_duration += _DURATION_SMOOTHING * (seconds - self.avg_duration)
+
+    def _record_cancelled(self, seconds: float) -> None:
+        self.counters["cancelled"] += 1
+        self.cancelled_seconds += seconds
+        log.info("Solve cancelled after %.2f s", seconds)
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Solve counters since startup and the current load.
+        """
+        return {
+            **self.counters,
+            "cancelled_seconds": round(self.cancelled_seconds, 3),
+            "pending": self.pending,
+            "capacity": self.capacity,
+            "avg_duration_s": self.avg_duration,
+        }
+
+    def _reset(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """
+        Stop accepting solves, cancel the running ones and stop the worker
+        processes. Blocks until the workers have exited; call it off the
+        event loop.
+        """
+        self._closed = True
+        self._cancel_flags[:] = [1] * self.capacity
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+            if self._drain is not None:
+                self._drain.join(timeout=5.0)
+            self._progress_queue = self._drain = None
+
+
+@lru_cache(maxsize=1)
+def get_solver_executor() -> SolverExecutor:
+    """
+    The process-wide solver executor, configured from settings.
+    """
+    return SolverExecutor.from_settings()
+
+
+def shutdown_solver_executor() -> None:
+    if get_solver_executor.cache_info().currsize:
+        get_solver_executor().shutdown()
+
+
+__all__ = [
+    "ProgressCallback",
+    "SolveCancelled",
+    "SolveOutcome",
+    "SolverBusy",
+    "SolverExecutor",
+    "VIEWS",
+    "build_generator",
+    "get_solver_executor",
+    "shutdown_solver_executor",
+    "solve_request",
+]
@@ -0,0 +1,260 @@
+"""
+Vectorized, population-wide fitness evaluation for the GA.
+
+This module scores a whole population stacked as a single ndarray of shape
+(P, NUM_CLASSES, DAYS, SLOTS_PER_DAY, 3) in one pass of NumPy operations.
+`TimetableGenerator.fitness_trusted` scores single chromosomes through it, and
+`TimetableGenerator.fitness` does the same after normalizing external input.
+
+Penalty components (raw counts, before weighting):
+- teacher_clash:   extra bookings of a teacher within one (day, slot)
+- room_clash:      extra bookings of a room within one (day, slot)
+- unqualified:     cells whose teacher is not qualified for the subject
+- daily_overload:  teacher hours above MAX_HOURS_PER_DAY, summed over days
+- weekly_overload: teacher hours above MAX_HOURS_PER_WEEK
+- lab_parity:      runs of a lab subject with odd length within a day
+- hours_mismatch:  |assigned - required| hours per class and subject
+
+Chromosomes are expected to be trusted (see `population.Chromosome`): in-range
+indices, as produced by the generator and by `normalize_chromosome`. They are
+read in place; only the occupied cells are gathered into int64 arrays.
+
+With a compiled kernel backend (see `kernels`) the components are counted by
+`kernels.population_components` instead; the NumPy path stays available as
+`components_numpy`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import kernels
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+
+PENALTY_WEIGHTS: dict[str, int] = {
+    "teacher_clash": 50,
+    "room_clash": 50,
+    "unqualified": 20,
+    "daily_overload": 8,
+    "weekly_overload": 10,
+    "lab_parity": 100,
+    "hours_mismatch": 5,
+}
+
+PENALTY_COMPONENTS: tuple[str, ...] = tuple(PENALTY_WEIGHTS)
+
+
+class BatchFitnessEvaluator:
+    """
+    Score populations of timetables with vectorized NumPy operations.
+
+    Lookup tables (qualification matrix, lab mask, required hours) come from
+    the generator's compiled `ProblemInstance` and are reused for every batch.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        problem = gen.problem
+        self.problem = problem
+        self.num_classes = problem.num_classes
+        self.days = problem.days
+        self.slots = problem.slots
+        self.num_teachers = problem.num_teachers
+        self.num_rooms = problem.num_rooms
+        self.max_per_day = problem.max_per_day
+        self.max_per_week = problem.max_per_week
+
+        # Shared read-only tables; `_ensure_subject_capacity` swaps in grown
+        # copies, so the `ProblemInstance` itself is never modified.
+        self.qualified = problem.qualified
+        self.lab_mask = problem.lab_mask
+        self.hour_subjects = problem.hour_subjects
+        self.hour_targets = problem.hour_targets
+
+    @property
+    def num_subjects(self) -> int:
+        return int(self.lab_mask.shape[0])
+
+    def _ensure_subject_capacity(self, max_subject: int) -> None:
+        """
+        Grow the subject-indexed tables if a chromosome references a subject id
+        outside of the known range (treated as unqualified, non-lab, no hours).
+        """
+        if max_subject < self.num_subjects:
+            return
+        extra = max_subject + 1 - self.num_subjects
+        self.qualified = np.vstack(
+            [self.qualified, np.zeros((extra, self.num_teachers), dtype=bool)]
+        )
+        self.lab_mask = np.concatenate([self.lab_mask, np.zeros(extra, dtype=bool)])
+
+    def padded_lab_mask(self) -> NDArray[np.bool_]:
+        """
+        Lab mask indexed by subject id + 1 (index 0 = free cell).
+        """
+        return np.concatenate([[False], self.lab_mask])
+
+    def components(self, pop: NDArray[np.int_]) -> dict[str, NDArray[np.int64]]:
+        """
+        Compute raw (unweighted) penalty components for every individual.
+
+        Args:
+            pop: Population array of shape (P, C, D, S, 3), or a single
+                 chromosome of shape (C, D, S, 3).
+
+        Returns:
+            Mapping of component name -> int64 array of shape (P,).
+        """
+        if not kernels.COMPILED:
+            return self.components_numpy(pop)
+        pop = np.asarray(pop)
+        if pop.ndim == 4:
+            pop = pop[np.newaxis]
+        if pop.size:
+            self._ensure_subject_capacity(int(pop[..., 0].max()))
+        counts = kernels.population_components(
+            pop,
+            self.qualified,
+            self.padded_lab_mask(),
+            self.hour_subjects,
+            self.hour_targets,
+            self.max_per_day,
+            self.max_per_week,
+            self.num_teachers,
+            self.num_rooms,
+        )
+        return {name: counts[:, i] for i, name in enumerate(PENALTY_COMPONENTS)}
+
+    def components_numpy(self, pop: NDArray[np.int_]) -> dict[str, NDArray[np.int64]]:
+        """
+        `components` computed with vectorized NumPy operations.
+        """
+        pop = np.asarray(pop)
+        if pop.ndim == 4:
+            pop = pop[np.newaxis]
+        P, C, D, S, _ = pop.shape
+        T, R = self.num_teachers, self.num_rooms
+
+        subj = pop[..., 0]
+        occ = subj != -1
+
+        if occ.any():
+            self._ensure_subject_capacity(int(subj.max()))
+        NS = self.num_subjects
+
+        # Flat indices of occupied cells, split into their (p, c, d, s) coordinates
+        flat = np.flatnonzero(occ)
+        p_idx, c_idx, d_idx, s_idx = np.unravel_index(flat, (P, C, D, S))
+        occupied = pop.reshape(-1, 3)[flat].astype(np.int64)
+        o_subj, o_teacher, o_room = occupied.T
+        n_occ = np.bincount(p_idx, minlength=P)
+
+        # Clashes: every booking beyond the first of a teacher/room in a slot
+        slot_key = (p_idx * D + d_idx) * S + s_idx
+        t_distinct = self._distinct_per_individual(slot_key * T + o_teacher, P, D * S * T)
+        r_distinct = self._distinct_per_individual(slot_key * R + o_room, P, D * S * R)
+        teacher_clash = n_occ - t_distinct
+        room_clash = n_occ - r_distinct
+
+        # Qualification misses
+        unqualified = np.bincount(
+            p_idx, weights=~self.qualified[o_subj, o_teacher], minlength=P
+        ).astype(np.int64)
+
+        # Teacher daily/weekly loads
+        day_load = np.bincount(
+            (p_idx * T + o_teacher) * D + d_idx, minlength=P * T * D
+        ).reshape(P, T, D)
+        week_load = day_load.sum(axis=2)
+        daily_overload = np.maximum(0, day_load - self.max_per_day).sum(axis=(1, 2))
+        weekly_overload = np.maximum(0, week_load - self.max_per_week).sum(axis=1)
+
+        # Lab parity: odd-length runs of the same lab subject within a day
+        lab_parity = self._lab_parity(subj, P)
+
+        # Subject hour mismatch per class
+        counts = np.bincount(
+            (p_idx * C + c_idx) * NS + o_subj, minlength=P * C * NS
+        ).reshape(P, C, NS)
+        if self.hour_subjects.size:
+            have = counts[:, :, self.hour_subjects]
+            hours_mismatch = np.abs(have - self.hour_targets).sum(axis=(1, 2))
+        else:
+            hours_mismatch = np.zeros(P, dtype=np.int64)
+
+        return {
+            "teacher_clash": teacher_clash.astype(np.int64),
+            "room_clash": room_clash.astype(np.int64),
+            "unqualified": unqualified,
+            "daily_overload": daily_overload.astype(np.int64),
+            "weekly_overload": weekly_overload.astype(np.int64),
+            "lab_parity": lab_parity,
+            "hours_mismatch": hours_mismatch.astype(np.int64),
+        }
+
+    @staticmethod
+    def _distinct_per_individual(
+        keys: NDArray[np.int64], P: int, per_individual: int
+    ) -> NDArray[np.int64]:
+        """
+        Count distinct keys per individual, where keys are laid out in
+        contiguous blocks of `per_individual` values per individual.
+        """
+        counts = np.bincount(keys, minlength=P * per_individual)
+        return np.count_nonzero(counts.reshape(P, per_individual), axis=1)
+
+    def _lab_parity(self, subj: NDArray[np.int64], P: int) -> NDArray[np.int64]:
+        if not self.lab_mask.any():
+            return np.zeros(P, dtype=np.int64)
+        return self.odd_lab_runs(subj).reshape(P, -1).sum(axis=1)
+
+    def odd_lab_runs(self, subj: NDArray[np.int64]) -> NDArray[np.int64]:
+        """
+        Count odd-length lab runs per day row.
+
+        Args:
+            subj: Subject ids with the slot axis last, e.g. (P, C, D, S) or (S,).
+
+        Returns:
+            int64 array shaped like `subj` without its last axis.
+        """
+        subj = np.asarray(subj, dtype=np.int64)
+        if subj.size and int(subj.max()) >= self.num_subjects:
+            self._ensure_subject_capacity(int(subj.max()))
+        # Index -1 (free) maps to the padding entry at position 0
+        is_lab = self.padded_lab_mask()[subj + 1]
+        same_prev = np.zeros_like(is_lab)
+        same_prev[..., 1:] = subj[..., 1:] == subj[..., :-1]
+        same_next = np.zeros_like(is_lab)
+        same_next[..., :-1] = same_prev[..., 1:]
+        starts = np.flatnonzero(is_lab & ~same_prev)
+        ends = np.flatnonzero(is_lab & ~same_next)
+        odd = ((ends - starts + 1) % 2).astype(np.int64)
+        row_len = subj.shape[-1]
+        rows = subj.size // row_len if row_len else 0
+        counts = np.bincount(starts // max(row_len, 1), weights=odd, minlength=rows)
+        return counts.astype(np.int64).reshape(subj.shape[:-1])
+
+    def penalties(self, pop: NDArray[np.int_]) -> NDArray[np.int64]:
+        """
+        Weighted total penalty per individual.
+        """
+        comps = self.components(pop)
+        total = np.zeros_like(comps["teacher_clash"])
+        for name, weight in PENALTY_WEIGHTS.items():
+            total += comps[name] * weight
+        return total
+
+    def scores(self, pop: NDArray[np.int_]) -> NDArray[np.float64]:
+        """
+        Fitness per individual (higher is better), identical to `fitness`.
+        """
+        return -self.penalties(pop).astype(np.float64)
+
+
+__all__ = ["BatchFitnessEvaluator", "PENALTY_WEIGHTS", "PENALTY_COMPONENTS"]
@@ -6,7 +6,12 @@ TimetableGenerator into a reusable service class without changing behavior.
 
 Public API:
 - class TimetableGenerator
+    - solve() -> tuple[np.ndarray, float]  (GA, islands, tabu, SA, backtracking, portfolio)
     - run_ga() -> tuple[np.ndarray, float]
+    - fitness(chrom) -> float  (external timetables; normalized first)
+    - fitness_trusted(chrom) -> float  (internal chromosomes, zero-copy)
+    - fitness_batch(pop) -> np.ndarray
+    - mutate(chrom, delta=None) -> np.ndarray
     - generate_student_view(tt) -> List[StudentTimetable]
     - generate_teacher_view(tt) -> List[TeacherTimetable]
     - generate_combined_view(tt) -> List[CombinedTimetable]
@@ -15,14 +20,40 @@ Public API:
 
 from __future__ import annotations
 
+import math
 import random
-from typing import cast
+import time
+from typing import AbstractSet, Any, Callable, cast
 
 import numpy as np
+from src.core.config import get_settings
 from src.core.utils import get_logger
 from numpy.typing import NDArray
 
 from ..models.request_models import TimetableRequest
+from .annealing import SimulatedAnnealing
+from .backtrack import BacktrackingSolver
+from .cache import FitnessCache
+from .construct import ConstructiveInitializer
+from .delta import DeltaFitnessState
+from .fitness import BatchFitnessEvaluator
+from .memetic import ElitePolisher
+from .mutation import BatchMutator
+from .parallel import POOL_ERRORS, ParallelGAPool, start_pool
+from .population import Chromosome, PopulationBuffer, gene_dtype
+from .portfolio import PortfolioSolver
+from .problem import ProblemInstance
+from .random_init import RandomInitializer
+from .repair import ClashRepair, RepairStats
+from .report import GARunReport
+from .tabu import TabuSearch
+from .termination import (
+    STOP_COMPLETED,
+    STOP_DEADLINE,
+    CancellationToken,
+    ConvergenceMonitor,
+    SolverInterrupted,
+)
 from ..schemas.combined_timetable import CombinedTimetable
 from ..schemas.slot_info import SlotInfo
 from ..schemas.student_timetable import StudentTimetable
@@ -30,6 +61,13 @@ from ..schemas.teacher_timetable import TeacherTimetable
 
 log = get_logger(__name__)
 
+# Timetables built per constructive seeding batch (the monitor is checked
+# between batches)
+CONSTRUCT_BATCH = 128
+
+# Individuals scored between two deadline checks (per worker)
+EVAL_CHUNK_SIZE = 64
+
 
 class TimetableGenerator:
     """
@@ -142,17 +180,77 @@ class TimetableGenerator:
                 [f"Subject-{i}" for i in range(len(self.SUBJ_NAMES), self.NUM_SUBJECTS)]
             )
 
+        # Solver selection
+        self.SOLVER: str = str(getattr(config, "solver", "ga"))
+        self.PORTFOLIO: list[dict[str, object]] | None = getattr(
+            config, "portfolio", None
+        )
+        self.TABU_ITERATIONS: int = int(getattr(config, "tabu_iterations", 2000))
+        self.TABU_TENURE: int = int(getattr(config, "tabu_tenure", 10))
+        self.TABU_NEIGHBORHOOD: int = int(getattr(config, "tabu_neighborhood", 40))
+        self.SA_ITERATIONS: int = int(getattr(config, "sa_iterations", 50_000))
+        self.SA_COOLING: str = str(getattr(config, "sa_cooling", "geometric"))
+        self.SA_INITIAL_TEMPERATURE: float | None = getattr(
+            config, "sa_initial_temperature", None
+        )
+        self.SA_FINAL_TEMPERATURE: float = float(
+            getattr(config, "sa_final_temperature", 0.5)
+        )
+        self.SA_REHEAT_AFTER: int | None = getattr(config, "sa_reheat_after", None)
+        self.SA_REHEAT_FACTOR: float = float(getattr(config, "sa_reheat_factor", 0.5))
+        self.BACKTRACK_MAX_NODES: int = int(
+            getattr(config, "backtrack_max_nodes", 200_000)
+        )
+        self.BACKTRACK_TIME_LIMIT_MS: int | None = getattr(
+            config, "backtrack_time_limit_ms", 2000
+        )
+
         # GA settings
         self.POP_SIZE: int = config.population_size
         self.GENERATIONS: int = config.generations
         self.MUTATION_RATE: float = config.mutation_rate
+        self.FITNESS_CACHE_SIZE: int = int(getattr(config, "fitness_cache_size", 1024))
+        workers = getattr(config, "workers", None)
+        self.WORKERS: int = max(
+            1, int(workers if workers is not None else get_settings().solver_workers)
+        )
+        self.TARGET_FITNESS: float | None = getattr(config, "target_fitness", None)
+        self.STAGNATION_GENERATIONS: int | None = getattr(
+            config, "stagnation_generations", None
+        )
+        self.MIN_IMPROVEMENT: float = float(getattr(config, "min_improvement", 0.0))
+        budget = getattr(config, "time_budget_ms", None)
+        self.TIME_BUDGET_MS: int | None = int(budget) if budget else None
+        # Absolute time.time() deadline of the current solve, if any
+        self.deadline_at: float | None = None
+        # Set by the caller to stop a solve early (client disconnect, job
+        # deletion); polled wherever the deadline is
+        self.cancel_token: CancellationToken | None = None
+        self.INITIALIZER: str = str(getattr(config, "initializer", "constructive"))
+        self.CONSTRUCTIVE_FRACTION: float = float(
+            getattr(config, "constructive_fraction", 0.1)
+        )
+        self.MEMETIC: bool = bool(getattr(config, "memetic", False))
+        self.MEMETIC_INTERVAL: int = int(getattr(config, "memetic_interval", 5))
+        self.MEMETIC_ELITES: int = int(getattr(config, "memetic_elites", 2))
+        self.MEMETIC_BUDGET_MS: float | None = getattr(config, "memetic_budget_ms", None)
+        budget_evals = getattr(config, "memetic_budget_evaluations", 400)
+        if budget_evals is None and self.MEMETIC_BUDGET_MS is None:
+            budget_evals = 400
+        self.MEMETIC_BUDGET_EVALUATIONS: int | None = budget_evals
+        self.ISLANDS: int = int(getattr(config, "islands", 1) or 1)
+        self.MIGRATION_INTERVAL: int = int(getattr(config, "migration_interval", 10))
+        self.MIGRATION_SIZE: int = int(getattr(config, "migration_size", 2))
+        self.MIGRATION_TOPOLOGY: str = str(
+            getattr(config, "migration_topology", "ring")
+        )
 
         # Department fetching
         self.department_id: int | None = config.department_id
 
         self.TEACHER_NAMES: list[str] = TEACHER_NAMES or []
         self.ROOM_NAMES: list[str] = ROOM_NAMES or []
-        self.seed = 42
+        self.seed = int(getattr(config, "seed", 42))
         self.rng = np.random.default_rng(self.seed)
 
         # Ensure our name lists match fetched totals
@@ -168,424 +266,788 @@ class TimetableGenerator:
                 [f"Room-{i}" for i in range(len(self.ROOM_NAMES), self.TOTAL_ROOMS)]
             )
 
+        # Compiled problem tables shared by scoring, operators and all engines
+        self.problem = ProblemInstance.from_generator(self)
+        # Chromosome field dtype (int16 unless the problem needs wider indices)
+        self.GENE_DTYPE: np.dtype = gene_dtype(self.problem)
+        # Vectorized population scorer (lookup tables built once per problem)
+        self.batch_evaluator = BatchFitnessEvaluator(self)
+        # Batched mutation of GA children and batched random seeding
+        self.mutator = BatchMutator(self)
+        self.random_initializer = RandomInitializer(self)
+        self.last_report: GARunReport | None = None
+        # Called with solver progress events, at most one per PROGRESS_INTERVAL_S
+        # (job API, see `_emit_progress` and `report_progress`)
+        self.on_progress: Callable[[dict[str, Any]], None] | None = None
+        self.PROGRESS_INTERVAL_S: float = get_settings().progress_interval_ms / 1000.0
+        self._progress_at = float("-inf")
+        self._pool: ParallelGAPool | None = None
+        self._constructor: ConstructiveInitializer | None = None
+        # Optional clash repair applied to every child (instrumented)
+        self.repairer: ClashRepair | None = (
+            ClashRepair(self) if getattr(config, "repair", False) else None
+        )
+
     # ---------------------------
     # Generation helpers
     # ---------------------------
-    def normalize_chromosome(self, chrom: object) -> NDArray[np.int_]:
+    def normalize_chromosome(self, chrom: object) -> Chromosome:
         """
-        Normalize/validate a chromosome (timetable) to a consistent ndarray
-        of shape (NUM_CLASSES, DAYS, SLOTS_PER_DAY, 3) with dtype=int,
-        using -1 as the sentinel for empty slots. Entries are [subject, teacher, room].
+        Normalize/validate an externally supplied timetable into a trusted
+        `Chromosome`: shape (NUM_CLASSES, DAYS, SLOTS_PER_DAY, 3), dtype
+        GENE_DTYPE, -1 as the sentinel for empty slots. Entries are
+        [subject, teacher, room]; [subject, teacher] and bare subject ids are
+        accepted too.
+
+        Repairs are vectorized: cells with an unknown subject become free and
+        missing or out-of-range teachers/rooms are redrawn at random. Only
+        ragged input (e.g. nested lists with gaps) is read cell by cell.
+        Internal timetables are already trusted and never need this.
         """
-        target = np.full(
-            (self.NUM_CLASSES, self.DAYS, self.SLOTS_PER_DAY, 3), -1, dtype=int
-        )
-        chrom = np.array(chrom, copy=False)
-
-        # Fast path if it's already correct shape and dtype
-        if chrom.shape == target.shape:
+        shape = (self.NUM_CLASSES, self.DAYS, self.SLOTS_PER_DAY)
+        cells = self._dense_cells(chrom, shape)
+        if cells is None:
+            cells = self._ragged_cells(chrom, shape)
+        subj, teacher, room = cells[..., 0], cells[..., 1], cells[..., 2]
+
+        invalid = (subj != -1) & ((subj < 0) | (subj >= self.NUM_SUBJECTS))
+        if invalid.any():
+            log.info("Dropping %d cells with an invalid subject", int(invalid.sum()))
+        free = (subj == -1) | invalid
+        for values, size in ((teacher, self.TOTAL_TEACHERS), (room, self.TOTAL_ROOMS)):
+            bad = ~free & ((values < 0) | (values >= size))
+            values[bad] = self.rng.integers(size, size=int(bad.sum()))
+        cells[free] = -1
+        return cast(Chromosome, cells.astype(self.GENE_DTYPE))
+
+    @staticmethod
+    def _dense_cells(
+        chrom: object, shape: tuple[int, int, int]
+    ) -> NDArray[np.int64] | None:
+        """
+        (C, D, S, 3) int64 copy of a rectangular numeric timetable, with -2
+        for a missing teacher/room; None when `chrom` is not rectangular.
+        """
+        try:
+            arr = np.asarray(chrom)
+        except ValueError:  # ragged nesting
+            return None
+        if arr.dtype.kind not in "iuf" or arr.shape[:3] != shape:
+            return None
+        if arr.ndim == 3:
+            arr = arr[..., np.newaxis]
+        elif arr.ndim != 4 or arr.shape[3] not in (2, 3):
+            return None
+        cells = np.full((*shape, 3), -2, dtype=np.int64)
+        cells[..., : arr.shape[3]] = arr
+        return cells
+
+    def _ragged_cells(
+        self, chrom: object, shape: tuple[int, int, int]
+    ) -> NDArray[np.int64]:
+        """
+        Cell-by-cell reading of irregular input into the `_dense_cells`
+        layout. Unreadable cells are left free.
+        """
+        cells = np.full((*shape, 3), -2, dtype=np.int64)
+        cells[..., 0] = -1
+        unreadable = 0
+        for c, d, s in np.ndindex(*shape):
             try:
-                return chrom.astype(int)
-            except (ValueError, TypeError):
-                log.info("Chromosome has correct shape but invalid types; normalizing.")
-
-        for c in range(self.NUM_CLASSES):
-            for d in range(self.DAYS):
-                for s in range(self.SLOTS_PER_DAY):
-                    try:
-                        entry = chrom[c][d][s]
-                    except Exception as e:
-                        entry = None
-                        log.info(f"Invalid access at ({c},{d},{s}): {e}")
-
-                    if entry is None or entry == -1:
-                        continue
-
-                    if isinstance(entry, (list, tuple, np.ndarray)):
-                        try:
-                            if len(entry) == 3:
-                                subj, teacher, room = map(int, entry)
-                            elif len(entry) == 2:
-                                subj, teacher = map(int, entry)
-                                room = self.rng.integers(self.TOTAL_ROOMS)
-                            else:
-                                continue
-                        except (ValueError, TypeError):
-                            log.info(f"Invalid entry format at ({c},{d},{s}): {entry}")
-                            continue
-                    else:
-                        # Only subject provided; randomize permissible teacher/room
-                        try:
-                            subj = int(entry)
-                        except Exception:
-                            subj = -1
-                        teacher = self.rng.integers(self.TOTAL_TEACHERS)
-                        room = self.rng.integers(self.TOTAL_ROOMS)
-
-                    # Clamp/repair invalid indices
-                    if subj < 0 or subj >= self.NUM_SUBJECTS:
-                        subj = -1
-                    if teacher < 0 or teacher >= self.TOTAL_TEACHERS:
-                        teacher = self.rng.integers(self.TOTAL_TEACHERS)
-                    if room < 0 or room >= self.TOTAL_ROOMS:
-                        room = self.rng.integers(self.TOTAL_ROOMS)
-
-                    if subj == -1:
-                        log.info(f"Invalid subject at ({c},{d},{s}); skipping")
-                        continue
-
-                    target[c, d, s] = [subj, teacher, room]
-
-        return target
+                entry = chrom[c][d][s]  # type: ignore[index]
+                if entry is None:
+                    continue
+                if isinstance(entry, (list, tuple, np.ndarray)):
+                    if len(entry) not in (2, 3):
+                        raise ValueError(entry)
+                    cells[c, d, s, : len(entry)] = [int(v) for v in entry]
+                else:
+                    cells[c, d, s, 0] = int(entry)
+            except (IndexError, KeyError, TypeError, ValueError):
+                unreadable += 1
+        if unreadable:
+            log.info("Skipped %d unreadable timetable cells", unreadable)
+        return cells
 
     def generate_random_timetable(self) -> NDArray[np.int_]:
         """
         Create a randomized timetable seeded by subject hour requirements per class.
         Ensures reproducible randomness via self.seed (if provided).
 
-        Updated to place lab subjects as paired double-slots first (same subject, teacher, room, adjacent slots),
-        followed by single-slot placements for lectures and any leftover singles.
+        Lab subjects are placed as paired double-slots first (same subject, teacher,
+        room, adjacent slots), followed by single-slot placements for lectures and
+        any leftover singles (see `random_init.RandomInitializer`).
         """
-        tt = np.full(
-            (self.NUM_CLASSES, self.DAYS, self.SLOTS_PER_DAY, 3), -1, dtype=int
-        )
-
-        # Use LAB_SUBJECTS if available; default to empty set for backward compatibility
-        lab_subjects: set[int] = set(getattr(self, "LAB_SUBJECTS", set()))
-
-        for cls in range(self.NUM_CLASSES):
-            # Split required workload into lab pairs and lecture singles
-            lab_pairs: list[int] = []
-            lecture_singles: list[int] = []
-            for subj, hrs in self.SUBJECT_HOURS.items():
-                if subj in lab_subjects:
-                    # Each lab pair consumes 2 consecutive slots
-                    pairs = hrs // 2
-                    if pairs > 0:
-                        lab_pairs += [subj] * pairs
-                    # Any odd remainder becomes a single (best-effort placement)
-                    rem = hrs % 2
-                    if rem:
-                        lecture_singles += [subj] * rem
-                else:
-                    lecture_singles += [subj] * hrs
-
-            total_required_slots = len(lecture_singles) + 2 * len(lab_pairs)
-            total_slots = self.DAYS * self.SLOTS_PER_DAY
-            if total_required_slots < total_slots:
-                log.info(
-                    f"Class {cls} has fewer subjects ({total_required_slots}) than available slots ({total_slots}); remaining left empty."
-                )
-            elif total_required_slots > total_slots:
-                log.info(
-                    f"Class {cls} has more subjects ({total_required_slots}) than available slots ({total_slots}); truncating/placing best-effort."
-                )
-
-            # Shuffle deterministically with the class generator
-            self.rng.shuffle(lab_pairs)
-            self.rng.shuffle(lecture_singles)
-
-            def choose_teacher_room(subj_id: int) -> tuple[int, int]:
-                teachers = self.SUBJECT_TEACHERS.get(subj_id)
-                if teachers:
-                    teacher = int(self.rng.choice(teachers))
-                else:
-                    teacher = int(self.rng.integers(self.TOTAL_TEACHERS))
-                room = int(self.rng.integers(self.TOTAL_ROOMS))
-                return teacher, room
-
-            # 1) Place lab pairs first as adjacent slots within a day
-            for subj in lab_pairs:
-                placed = False
-                attempts = 0
-                max_attempts = 200
-                while attempts < max_attempts and not placed:
-                    if self.SLOTS_PER_DAY < 2:
-                        # Cannot place pairs if day has less than 2 slots
-                        break
-                    d = int(self.rng.integers(self.DAYS))
-                    s = int(self.rng.integers(self.SLOTS_PER_DAY - 1))
-                    # Both adjacent slots must be free
-                    if tt[cls, d, s, 0] == -1 and tt[cls, d, s + 1, 0] == -1:
-                        if 0 <= subj < self.NUM_SUBJECTS:
-                            teacher, room = choose_teacher_room(subj)
-                            tt[cls, d, s] = [subj, teacher, room]
-                            tt[cls, d, s + 1] = [subj, teacher, room]
-                            placed = True
-                        else:
-                            break
-                    attempts += 1
-                # If not placed after attempts, leave unplaced; fitness will penalize shortfall
+        return self.random_initializer.generate(1)[0]
 
-            # 2) Place lecture singles (and any leftover singles) into remaining free slots
-            idx = 0
-            for d in range(self.DAYS):
-                for s in range(self.SLOTS_PER_DAY):
-                    if idx >= len(lecture_singles):
-                        break
-                    if tt[cls, d, s, 0] != -1:
-                        continue
-
-                    subj = lecture_singles[idx]
-
-                    if subj < 0 or subj >= self.NUM_SUBJECTS:
-                        log.debug(
-                            f"Invalid subject ID {subj} for class {cls}; skipping"
-                        )
-                        idx += 1
-                        continue
-
-                    teacher, room = choose_teacher_room(subj)
-                    tt[cls, d, s] = [subj, teacher, room]
-                    idx += 1
+    def generate_constructive_timetable(self) -> NDArray[np.int_]:
+        """
+        Build a near-feasible timetable greedily, sharing teacher/room occupancy
+        across classes and placing the most constrained lessons first.
+        Randomized tie-breaking (self.rng) keeps the population diverse.
+        """
+        return self.constructor.build(self.rng)
 
-        return tt
+    @property
+    def constructor(self) -> ConstructiveInitializer:
+        if self._constructor is None:
+            self._constructor = ConstructiveInitializer(self)
+        return self._constructor
 
     # ---------------------------
     # Genetic Algorithm core
     # ---------------------------
     def fitness(self, chrom: object) -> float:
         """
-        Fitness function (higher is better). Penalizes:
+        Fitness of an externally supplied timetable (higher is better); it is
+        normalized first. See `fitness_trusted` for the penalties.
+        """
+        return self.fitness_trusted(self.normalize_chromosome(chrom))
+
+    def fitness_trusted(self, chrom: Chromosome) -> float:
+        """
+        Fitness function (higher is better) for a trusted `Chromosome`, read
+        in place without normalization. Penalizes:
         - Teacher double-booking within the same slot
         - Room double-booking within the same slot
         - Teacher teaching a subject they are not qualified for
         - Teacher exceeding daily or weekly hour limits
         - Non-adjacent lab slots (labs must be scheduled as adjacent double slots)
         - Mismatch between required and assigned subject hours per class
-        """
-        chrom = self.normalize_chromosome(chrom)
-        penalty = 0
-
-        # Teacher hour accumulators
-        teacher_week = np.zeros(self.TOTAL_TEACHERS, dtype=int)
-        teacher_day = np.zeros((self.TOTAL_TEACHERS, self.DAYS), dtype=int)
-
-        for d in range(self.DAYS):
-            for s in range(self.SLOTS_PER_DAY):
-                t_seen: set[int] = set()
-                r_seen: set[int] = set()
-                for c in range(self.NUM_CLASSES):
-                    subj, teacher, room = map(int, chrom[c, d, s])
-                    if subj == -1:
-                        continue
-
-                    # Teacher double-booked at the same slot
-                    if teacher in t_seen:
-                        penalty += 50
-                    else:
-                        t_seen.add(teacher)
 
-                    # Room double-booked at the same slot
-                    if room in r_seen:
-                        penalty += 50
-                    else:
-                        r_seen.add(room)
+        Weights are listed in `fitness.PENALTY_WEIGHTS`.
+        """
+        return float(self.batch_evaluator.scores(chrom[np.newaxis])[0])
 
-                    # Increment loads
-                    teacher_week[teacher] += 1
-                    teacher_day[teacher, d] += 1
+    def fitness_batch(self, pop: object) -> NDArray[np.float64]:
+        """
+        Score a whole population in one vectorized pass.
 
-                    # Teacher qualification for subject
-                    if teacher not in self.SUBJECT_TEACHERS.get(subj, []):
-                        penalty += 20
+        Accepts a list of trusted chromosomes or an array of shape
+        (P, NUM_CLASSES, DAYS, SLOTS_PER_DAY, 3), which is read without
+        copying, and returns a float array of shape (P,) with the fitness of
+        each individual.
+        """
+        arr = np.asarray(pop)
+        if arr.ndim == 4:
+            arr = arr[np.newaxis]
+        return self.batch_evaluator.scores(arr)
 
-        # Lab adjacency penalty: penalize any unpaired lab slot within a day for each class
-        if getattr(self, "LAB_SUBJECTS", None):
-            for c in range(self.NUM_CLASSES):
-                for d in range(self.DAYS):
-                    s_idx = 0
-                    while s_idx < self.SLOTS_PER_DAY:
-                        subj_id = int(chrom[c, d, s_idx, 0])
-                        if subj_id in self.LAB_SUBJECTS:
-                            run_len = 0
-                            while (
-                                s_idx + run_len < self.SLOTS_PER_DAY
-                                and int(chrom[c, d, s_idx + run_len, 0]) == subj_id
-                            ):
-                                run_len += 1
-                            if run_len % 2 == 1:
-                                penalty += 100
-                            s_idx += run_len
-                        else:
-                            s_idx += 1
-        # Exceeding teacher weekly/daily limits
-        penalty += (
-            int(np.sum(np.maximum(0, teacher_week - self.MAX_HOURS_PER_WEEK))) * 10
-        )
-        penalty += int(np.sum(np.maximum(0, teacher_day - self.MAX_HOURS_PER_DAY))) * 8
+    def score_population(
+        self,
+        pop: list[NDArray[np.int_]] | NDArray[np.int_],
+        cache: FitnessCache | None = None,
+        monitor: ConvergenceMonitor | None = None,
+    ) -> NDArray[np.float64]:
+        """
+        Score a list of chromosomes (or a stacked (P, C, D, S, 3) population),
+        consulting `cache` so that unchanged elites and duplicate children are
+        evaluated only once.
 
-        # Subject hour mismatch per class
-        for c in range(self.NUM_CLASSES):
-            flat_subjects = cast(NDArray[np.int_], chrom[c, :, :, 0]).ravel()
-            flat_subjects = flat_subjects[flat_subjects >= 0]  # filter free slots
-            subj_counts = np.bincount(flat_subjects, minlength=self.NUM_SUBJECTS)
-            for subj, hrs in self.SUBJECT_HOURS.items():
-                have = subj_counts[subj] if subj < len(subj_counts) else 0
-                penalty += abs(have - hrs) * 5
+        With a `monitor`, the batch is evaluated in chunks and
+        `SolverInterrupted` is raised between chunks once the run must stop.
+        """
 
-        return -float(penalty)
+        def scorer(stacked: NDArray[np.int_]) -> NDArray[np.float64]:
+            if monitor is None:
+                return self._score_stacked(stacked)
+            step = EVAL_CHUNK_SIZE * (self._pool.workers if self._pool else 1)
+            parts: list[NDArray[np.float64]] = []
+            for start in range(0, len(stacked), step):
+                monitor.check()
+                parts.append(self._score_stacked(stacked[start : start + step]))
+            return np.concatenate(parts)
+
+        if cache is None:
+            return scorer(pop if isinstance(pop, np.ndarray) else np.stack(pop))
+        return cache.score(pop, scorer)
+
+    def _score_stacked(self, pop: NDArray[np.int_]) -> NDArray[np.float64]:
+        if self._pool is not None:
+            try:
+                return self._pool.score(pop)
+            except POOL_ERRORS as exc:
+                self._drop_pool(exc)
+        return self.fitness_batch(pop)
 
-    def crossover(self, p1: NDArray[np.int_], p2: NDArray[np.int_]) -> NDArray[np.int_]:
+    def crossover(
+        self,
+        p1: NDArray[np.int_],
+        p2: NDArray[np.int_],
+        out: NDArray[np.int_] | None = None,
+    ) -> NDArray[np.int_]:
         """
-        Single-point crossover along the class axis.
+        Single-point crossover along the class axis, written into `out`
+        (a fresh array when None).
         """
         cut = random.randint(1, self.NUM_CLASSES - 1)
-        child = cast(NDArray[np.int_], p1.copy())
+        if out is None:
+            child = cast(NDArray[np.int_], p1.copy())
+        else:
+            child = out
+            child[:cut] = p1[:cut]
         child[cut:] = p2[cut:]
         return child
 
-    def mutate(self, chrom: NDArray[np.int_]) -> NDArray[np.int_]:
+    def mutate(
+        self,
+        chrom: NDArray[np.int_],
+        delta: DeltaFitnessState | None = None,
+    ) -> NDArray[np.int_]:
         """
         Randomly mutate the timetable:
         - With 60% probability: replace a random slot with a new valid assignment.
         - Otherwise: swap two random slots.
         Pair-aware for lab subjects: labs are inserted/swapped as 2-slot blocks and we avoid breaking existing lab pairs.
+
+        Without `delta` a mutated copy is returned (see `mutation.BatchMutator`).
+        With a `DeltaFitnessState` the moves are applied in place to
+        `delta.chrom` and its score is kept up to date in O(changed cells);
+        `chrom` must be `delta.chrom`.
+        """
+        if delta is None:
+            out = cast(NDArray[np.int_], chrom.copy())
+            self.mutator.mutate(out[np.newaxis])
+            return out
+        self.mutate_in_place(delta.chrom, delta)
+        return delta.chrom
+
+    def mutate_in_place(
+        self,
+        out: NDArray[np.int_],
+        delta: DeltaFitnessState | None = None,
+    ) -> None:
+        """
+        Apply the mutation moves of `mutate` directly to `out`, one
+        `random_move` at a time.
         """
-        out = cast(NDArray[np.int_], chrom.copy())
         n = max(
             1,
             int(self.MUTATION_RATE * self.NUM_CLASSES * self.DAYS * self.SLOTS_PER_DAY),
         )
+        for _ in range(n):
+            self.random_move(out, delta)
 
-        lab_subjects: set[int] = set(getattr(self, "LAB_SUBJECTS", set()))
+    def random_move(
+        self,
+        out: NDArray[np.int_],
+        delta: DeltaFitnessState | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Apply one random mutation move (replace, swap or lab-pair block swap)
+        to `out` in place, routing cell writes through `delta` when given.
+        Moves are drawn from `rng` (the global `random` module by default).
+        """
+        rnd: Any = rng if rng is not None else random
+        lab_subjects = self.problem.lab_subjects
 
-        def choose_teacher_room(subj_id: int) -> tuple[int, int]:
-            teachers = self.SUBJECT_TEACHERS.get(subj_id)
-            if teachers:
-                teacher = random.choice(teachers)
+        def put(c: int, d: int, s: int, value: object) -> None:
+            if delta is None:
+                out[c, d, s] = value
             else:
-                teacher = random.randrange(self.TOTAL_TEACHERS)
-            room = random.randrange(self.TOTAL_ROOMS)
-            return int(teacher), int(room)
-
-        def is_lab_pair_slot(c: int, d: int, s: int) -> bool:
-            subj = int(out[c, d, s, 0])
-            if subj not in lab_subjects:
-                return False
-            # Check adjacency with same subject within the day
-            if s > 0 and int(out[c, d, s - 1, 0]) == subj:
-                return True
-            if s + 1 < self.SLOTS_PER_DAY and int(out[c, d, s + 1, 0]) == subj:
-                return True
-            return False
+                delta.set_cell(c, d, s, value)
+
+        c = rnd.randrange(self.NUM_CLASSES)
+        d = rnd.randrange(self.DAYS)
+        s = rnd.randrange(self.SLOTS_PER_DAY)
+
+        if rnd.random() < 0.6:
+            subj = rnd.choice(self.problem.subject_ids)
+            if subj in lab_subjects:
+                # Place as adjacent pair without breaking existing lab pairs
+                if self.SLOTS_PER_DAY >= 2:
+                    # preparing candidate pairs
+                    candidates: list[tuple[int, int]] = []
+                    # Prefer around s
+                    if s < self.SLOTS_PER_DAY - 1:
+                        candidates.append((d, s))
+                    if s > 0:
+                        candidates.append((d, s - 1))
+                    # Scan rest of the day
+                    for ss in range(self.SLOTS_PER_DAY - 1):
+                        candidates.append((d, ss))
+                    for dd, ss in dict.fromkeys(candidates):
+                        if (
+                            int(out[c, dd, ss, 0]) == -1
+                            and int(out[c, dd, ss + 1, 0]) == -1
+                        ):
+                            teacher, room = self._random_teacher_room(subj, rnd)
+                            put(c, dd, ss, [subj, teacher, room])
+                            put(c, dd, ss + 1, [subj, teacher, room])
+                            # pair placed
+                            break
+                    # If not placed, skip to avoid breaking pairs
+            else:
+                # single-slot subject; avoid overwriting a lab pair slot
+                if not self._is_lab_pair_slot(out, c, d, s, lab_subjects):
+                    teacher, room = self._random_teacher_room(subj, rnd)
+                    put(c, d, s, [subj, teacher, room])
+        else:
+            # Swap mutation; avoid breaking lab pairs
+            c2 = rnd.randrange(self.NUM_CLASSES)
+            d2 = rnd.randrange(self.DAYS)
+            s2 = rnd.randrange(self.SLOTS_PER_DAY)
 
-        def get_pair_start(c: int, d: int, s: int) -> int:
-            subj = int(out[c, d, s, 0])
-            if s > 0 and int(out[c, d, s - 1, 0]) == subj:
-                return s - 1
-            return s
+            subj1 = int(out[c, d, s, 0])
+            subj2 = int(out[c2, d2, s2, 0])
 
-        for _ in range(n):
-            c = random.randrange(self.NUM_CLASSES)
-            d = random.randrange(self.DAYS)
-            s = random.randrange(self.SLOTS_PER_DAY)
-
-            if random.random() < 0.6:
-                subj = random.choice(list(self.SUBJECT_HOURS.keys()))
-                if subj in lab_subjects:
-                    # Place as adjacent pair without breaking existing lab pairs
-                    if self.SLOTS_PER_DAY >= 2:
-                        # preparing candidate pairs
-                        candidates: list[tuple[int, int]] = []
-                        # Prefer around s
-                        if s < self.SLOTS_PER_DAY - 1:
-                            candidates.append((d, s))
-                        if s > 0:
-                            candidates.append((d, s - 1))
-                        # Scan rest of the day
-                        for ss in range(self.SLOTS_PER_DAY - 1):
-                            candidates.append((d, ss))
-                        for dd, ss in dict.fromkeys(candidates):
-                            if (
-                                int(out[c, dd, ss, 0]) == -1
-                                and int(out[c, dd, ss + 1, 0]) == -1
-                            ):
-                                teacher, room = choose_teacher_room(subj)
-                                out[c, dd, ss] = [subj, teacher, room]
-                                out[c, dd, ss + 1] = [subj, teacher, room]
-                                # pair placed
-                                break
-                        # If not placed, skip to avoid breaking pairs
-                else:
-                    # single-slot subject; avoid overwriting a lab pair slot
-                    if not is_lab_pair_slot(c, d, s):
-                        teacher, room = choose_teacher_room(subj)
-                        out[c, d, s] = [subj, teacher, room]
+            is_lab1 = subj1 in lab_subjects and self._is_lab_pair_slot(
+                out, c, d, s, lab_subjects
+            )
+            is_lab2 = subj2 in lab_subjects and self._is_lab_pair_slot(
+                out, c2, d2, s2, lab_subjects
+            )
+
+            if is_lab1 and is_lab2:
+                # Swap 2-slot lab blocks atomically
+                s_start1 = self._lab_pair_start(out, c, d, s)
+                s_start2 = self._lab_pair_start(out, c2, d2, s2)
+                if (
+                    s_start1 < self.SLOTS_PER_DAY - 1
+                    and s_start2 < self.SLOTS_PER_DAY - 1
+                ):
+                    tmp0 = out[c, d, s_start1].copy()
+                    tmp1 = out[c, d, s_start1 + 1].copy()
+                    put(c, d, s_start1, out[c2, d2, s_start2].copy())
+                    put(c, d, s_start1 + 1, out[c2, d2, s_start2 + 1].copy())
+                    put(c2, d2, s_start2, tmp0)
+                    put(c2, d2, s_start2 + 1, tmp1)
+            elif not is_lab1 and not is_lab2:
+                # Swap single slots
+                first, second = out[c2, d2, s2].copy(), out[c, d, s].copy()
+                put(c, d, s, first)
+                put(c2, d2, s2, second)
             else:
-                # Swap mutation; avoid breaking lab pairs
-                c2 = random.randrange(self.NUM_CLASSES)
-                d2 = random.randrange(self.DAYS)
-                s2 = random.randrange(self.SLOTS_PER_DAY)
-
-                subj1 = int(out[c, d, s, 0])
-                subj2 = int(out[c2, d2, s2, 0])
-
-                is_lab1 = subj1 in lab_subjects and is_lab_pair_slot(c, d, s)
-                is_lab2 = subj2 in lab_subjects and is_lab_pair_slot(c2, d2, s2)
-
-                if is_lab1 and is_lab2:
-                    # Swap 2-slot lab blocks atomically
-                    s_start1 = get_pair_start(c, d, s)
-                    s_start2 = get_pair_start(c2, d2, s2)
-                    if (
-                        s_start1 < self.SLOTS_PER_DAY - 1
-                        and s_start2 < self.SLOTS_PER_DAY - 1
-                    ):
-                        tmp0 = out[c, d, s_start1].copy()
-                        tmp1 = out[c, d, s_start1 + 1].copy()
-                        out[c, d, s_start1] = out[c2, d2, s_start2].copy()
-                        out[c, d, s_start1 + 1] = out[c2, d2, s_start2 + 1].copy()
-                        out[c2, d2, s_start2] = tmp0
-                        out[c2, d2, s_start2 + 1] = tmp1
-                elif not is_lab1 and not is_lab2:
-                    # Swap single slots
-                    out[c, d, s], out[c2, d2, s2] = (
-                        out[c2, d2, s2].copy(),
-                        out[c, d, s].copy(),
-                    )
-                else:
-                    # One lab pair and one non-lab; skip to avoid breaking pairs
-                    pass
+                # One lab pair and one non-lab; skip to avoid breaking pairs
+                pass
 
-        return out
+    def _random_teacher_room(self, subj_id: int, rnd: Any = random) -> tuple[int, int]:
+        teachers = self.problem.teachers_for(subj_id)
+        if teachers:
+            teacher = rnd.choice(teachers)
+        else:
+            teacher = rnd.randrange(self.TOTAL_TEACHERS)
+        room = rnd.randrange(self.TOTAL_ROOMS)
+        return int(teacher), int(room)
+
+    def _is_lab_pair_slot(
+        self,
+        out: NDArray[np.int_],
+        c: int,
+        d: int,
+        s: int,
+        lab_subjects: AbstractSet[int],
+    ) -> bool:
+        subj = int(out[c, d, s, 0])
+        if subj not in lab_subjects:
+            return False
+        # Check adjacency with same subject within the day
+        if s > 0 and int(out[c, d, s - 1, 0]) == subj:
+            return True
+        if s + 1 < self.SLOTS_PER_DAY and int(out[c, d, s + 1, 0]) == subj:
+            return True
+        return False
+
+    def _lab_pair_start(self, out: NDArray[np.int_], c: int, d: int, s: int) -> int:
+        subj = int(out[c, d, s, 0])
+        if s > 0 and int(out[c, d, s - 1, 0]) == subj:
+            return s - 1
+        return s
+
+    @property
+    def generations_run(self) -> int:
+        """
+        Generations actually evolved by the last solve (0 before any run).
+        """
+        return self.last_report.generations if self.last_report else 0
+
+    @property
+    def stop_reason(self) -> str:
+        return self.last_report.stop_reason if self.last_report else STOP_COMPLETED
+
+    @property
+    def deadline_reached(self) -> bool:
+        return self.stop_reason == STOP_DEADLINE
 
-    def run_ga(self) -> tuple[NDArray[np.int_], float]:
+    @property
+    def winning_config(self) -> dict[str, object] | None:
+        """
+        Overrides of the portfolio member that produced the last result.
+        """
+        return self.last_report.winner_config if self.last_report else None
+
+    def with_config(self, **overrides: object) -> "TimetableGenerator":
+        """
+        A generator for the same problem with some request fields overridden
+        (validated against TimetableRequest), sharing this one's cancel token.
+        """
+        config = TimetableRequest.model_validate(
+            {**self.config.model_dump(), **overrides}
+        )
+        clone = TimetableGenerator(
+            config,
+            TOTAL_ROOMS=self.TOTAL_ROOMS,
+            TOTAL_TEACHERS=self.TOTAL_TEACHERS,
+            TOTAL_SUBJECTS=self.NUM_SUBJECTS,
+            NUM_CLASSES=self.NUM_CLASSES,
+            ROOM_NAMES=list(self.ROOM_NAMES),
+            CLASS_NAMES=list(self.CLASS_NAMES),
+            SUBJECT_NAMES=list(self.SUBJ_NAMES),
+            SUBJECT_TYPES=dict(self.SUBJECT_TYPES),
+            SUBJECT_TEACHERS=dict(self.SUBJECT_TEACHERS),
+            SUBJECT_HOURS=dict(self.SUBJECT_HOURS),
+            TEACHER_NAMES=list(self.TEACHER_NAMES),
+        )
+        clone.cancel_token = self.cancel_token
+        return clone
+
+    def _start_clock(self, deadline_at: float | None = None) -> None:
+        if deadline_at is not None:
+            self.deadline_at = deadline_at
+            return
+        self.deadline_at = (
+            time.time() + self.TIME_BUDGET_MS / 1000.0 if self.TIME_BUDGET_MS else None
+        )
+
+    def solve(self, deadline_at: float | None = None) -> tuple[NDArray[np.int_], float]:
+        """
+        Run the solver selected by the request configuration and return the
+        best timetable and its fitness.
+
+        With `time_budget_ms` set, the solver behaves as an anytime algorithm
+        and returns the best solution found once the deadline passes. The
+        budget counts from now unless the caller passes the absolute
+        `time.time()` deadline it stamped when the request arrived (so time
+        spent queueing is charged to the budget).
+        """
+        self._start_clock(deadline_at)
+        if self.SOLVER == "portfolio":
+            return PortfolioSolver(self).run()
+        if self.SOLVER == "tabu":
+            return TabuSearch(self).run()
+        if self.SOLVER == "annealing":
+            return SimulatedAnnealing(self).run()
+        if self.SOLVER == "backtracking":
+            exact = BacktrackingSolver(self)
+            result = exact.run()
+            if result is not None:
+                return result
+            log.info("Backtracking gave up (%s); falling back to GA", exact.stop_reason)
+            result = self.run_ga(restart_clock=False)
+            if self.last_report is not None:
+                self.last_report.fallback_from = f"backtracking ({exact.stop_reason})"
+            return result
+        if self.ISLANDS > 1:
+            from .islands import IslandModelSolver
+
+            if self.repairer is not None:
+                self.repairer.stats = RepairStats()
+            return IslandModelSolver(self).run()
+        return self.run_ga(restart_clock=False)
+
+    def run_ga(self, restart_clock: bool = True) -> tuple[NDArray[np.int_], float]:
         """
         Execute the genetic algorithm and return the best timetable and its fitness.
+
+        Parents and children live in the two halves of a preallocated
+        `PopulationBuffer`; each generation is bred straight into the spare
+        half, so the steady state allocates no chromosomes.
+
+        With WORKERS > 1, population scoring and offspring production run on a
+        persistent process pool; any pool failure falls back to serial execution.
+        With MEMETIC enabled the top elites are hill-climbed every
+        MEMETIC_INTERVAL generations (see `memetic.ElitePolisher`).
+        `restart_clock=False` keeps the current solve deadline (used when the GA
+        takes over from another solver).
         """
         log.info(
-            "Starting GA with pop_size=%d, generations=%d",
+            "Starting GA with pop_size=%d, generations=%d, workers=%d",
             self.POP_SIZE,
             self.GENERATIONS,
+            self.WORKERS,
         )
         log.info("department_id=%s", self.department_id)
-        pop: list[NDArray[np.int_]] = [
-            self.generate_random_timetable() for _ in range(self.POP_SIZE)
-        ]
+        if restart_clock:
+            self._start_clock()
+        if self.repairer is not None:
+            self.repairer.stats = RepairStats()
+        cache = FitnessCache(self.FITNESS_CACHE_SIZE)
+        report = GARunReport()
+        monitor = ConvergenceMonitor.from_generator(self)
+        polisher = ElitePolisher(self) if self.MEMETIC else None
+        seeds = self.initial_population(self.POP_SIZE, monitor)
+        population = PopulationBuffer.for_problem(self.problem, len(seeds))
+        population.load(seeds)
+        del seeds
+        pop = population.current
+        started = time.perf_counter()
+        self._pool = start_pool(self, self.WORKERS)
+        try:
+            scores = self.score_population(pop, cache)
+            for _ in range(self.GENERATIONS):
+                if monitor.update(float(scores.max())):
+                    break
+                try:
+                    new_pop = self.next_generation(pop, scores, population.spare)
+                    scores = self.score_population(new_pop, cache, monitor)
+                except SolverInterrupted:
+                    # Keep the last fully scored population as the anytime answer
+                    break
+                population.swap()
+                pop = population.current
+                report.generations += 1
+                if polisher is not None and polisher.due(report.generations):
+                    polisher.polish(pop, scores, report.generations)
+                self._emit_progress(report.generations, pop, scores, started)
+            else:
+                monitor.update(float(scores.max()))
+            self._emit_progress(report.generations, pop, scores, started, force=True)
+        finally:
+            if self._pool is not None:
+                report.workers = self._pool.workers
+                self._pool.shutdown()
+                self._pool = None
+        best_idx = int(np.argmax(scores))
+
+        report.best_fitness = float(scores[best_idx])
+        if self.repairer is not None:
+            report.add_repair_stats(self.repairer.stats)
+        if polisher is not None:
+            report.local_search = polisher.history
+            report.local_search_gain = sum(h["gain"] for h in polisher.history)
+        report.stop_reason = monitor.stop_reason or STOP_COMPLETED
+        report.evaluations = cache.misses
+        report.cache_hits = cache.hits
+        report.cache_misses = cache.misses
+        report.cache_size = len(cache)
+        report.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.last_report = report
+        log.info("GA finished: %s", report.as_dict())
+        return cast(NDArray[np.int_], pop[best_idx].copy()), float(scores[best_idx])
+
+    def _progress_due(self, force: bool = False) -> bool:
+        """
+        Whether a progress event should be sent now: there is a listener and
+        PROGRESS_INTERVAL_S has passed since the last one (or `force`).
+        """
+        if self.on_progress is None:
+            return False
+        now = time.perf_counter()
+        if not force and now - self._progress_at < self.PROGRESS_INTERVAL_S:
+            return False
+        self._progress_at = now
+        return True
 
-        for _ in range(self.GENERATIONS):
-            scored = sorted(
-                [(self.fitness(x), x) for x in pop],
-                key=lambda t: t[0],
-                reverse=True,
-            )
-            # Selection: top third (at least 2 parents)
-            sel = [x for _, x in scored[: max(2, self.POP_SIZE // 3)]]
+    def _emit_progress(
+        self,
+        generation: int,
+        pop: NDArray[np.int_],
+        scores: NDArray[np.float64],
+        started: float,
+        force: bool = False,
+    ) -> None:
+        """
+        Send a GA progress event to `on_progress`: generation, best and mean
+        fitness, the best individual's raw penalty components and the elapsed
+        time. Throttled before anything is computed, so a run without a
+        listener (or between events) pays only a clock read.
+        """
+        if not self._progress_due(force):
+            return
+        best = int(np.argmax(scores))
+        self._send_progress(
+            generation,
+            pop[best],
+            float(scores[best]),
+            started,
+            mean_fitness=float(scores.mean()),
+        )
+
+    def report_progress(
+        self,
+        step: int,
+        best: NDArray[np.int_],
+        best_fitness: float,
+        started: float,
+        force: bool = False,
+        **extra: Any,
+    ) -> None:
+        """
+        Progress hook for the single-solution and composite solvers (tabu,
+        annealing, islands, portfolio): same event as `_emit_progress` with
+        `step` (iteration or generation) as "generation" and no mean
+        fitness. Throttled like `_emit_progress`; `extra` is added as is.
+        """
+        if self._progress_due(force):
+            self._send_progress(step, best, best_fitness, started, **extra)
 
-            # Elitism: carry forward best two
-            new: list[NDArray[np.int_]] = [scored[0][1].copy(), scored[1][1].copy()]
+    def forward_progress(self, event: dict[str, Any], force: bool = False) -> None:
+        """
+        Pass on an event produced by another generator (a portfolio member),
+        throttled like this generator's own events.
+        """
+        if self._progress_due(force):
+            assert self.on_progress is not None
+            self.on_progress(event)
+
+    def _send_progress(
+        self,
+        step: int,
+        best: NDArray[np.int_],
+        best_fitness: float,
+        started: float,
+        **extra: Any,
+    ) -> None:
+        assert self.on_progress is not None
+        components = self.batch_evaluator.components(best)
+        self.on_progress(
+            {
+                "generation": step,
+                "best_fitness": best_fitness,
+                **extra,
+                "penalties": {name: int(v[0]) for name, v in components.items()},
+                "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+            }
+        )
 
-            # Fill rest via crossover + mutation
-            while len(new) < self.POP_SIZE:
-                parents = random.sample(sel, 2)
-                child = self.crossover(*parents)
-                new.append(self.mutate(child))
+    def initial_population(
+        self, size: int, monitor: ConvergenceMonitor | None = None
+    ) -> list[NDArray[np.int_]]:
+        """
+        Seed `size` timetables with the configured initializer ("constructive"
+        or "random"). Random timetables are built in one vectorized batch.
+        The constructive initializer builds CONSTRUCTIVE_FRACTION of the
+        population (at least one timetable unless the fraction is 0), in
+        batches of CONSTRUCT_BATCH, and fills the rest randomly: elitism
+        spreads the good seeds quickly, while constructing every individual
+        would dominate the start-up time. Constructive seeding stops early if
+        `monitor` reports an interrupt (e.g. the deadline passed).
+        """
+        if self.INITIALIZER != "constructive" or size <= 0:
+            return list(self.random_initializer.generate(size))
+        wanted = min(size, math.ceil(self.CONSTRUCTIVE_FRACTION * size))
+        pop: list[NDArray[np.int_]] = []
+        while len(pop) < wanted:
+            if pop and monitor is not None and monitor.interrupt_reason():
+                log.info("Seeding interrupted after %d individuals", len(pop))
+                break
+            count = min(CONSTRUCT_BATCH, wanted - len(pop))
+            pop.extend(self.constructor.build_batch(self.rng, count))
+        pop.extend(self.random_initializer.generate(size - len(pop)))
+        return pop
+
+    def next_generation(
+        self,
+        pop: NDArray[np.int_],
+        scores: NDArray[np.float64],
+        out: NDArray[np.int_] | None = None,
+    ) -> NDArray[np.int_]:
+        """
+        One GA step: keep the top third as parents, carry the best two forward
+        and refill to the same size via crossover + mutation.
 
-            pop = new
+        `pop` is a stacked (P, C, D, S, 3) population; the next generation is
+        written into `out` (same shape, must not alias `pop`), which is
+        allocated when None.
+        """
+        size = len(pop)
+        if out is None:
+            out = np.empty_like(pop)
+        # Selection: top third (at least 2 parents), best first
+        sel = self.select(scores, max(2, size // 3))
+
+        # Elitism: carry forward best two
+        out[0] = pop[sel[0]]
+        out[1] = pop[sel[1]]
+
+        # Fill rest via crossover + mutation
+        self.breed(pop, sel, out[2:])
+        return out
 
-        best = cast(NDArray[np.int_], max(pop, key=self.fitness))
-        return best, float(self.fitness(best))
+    @staticmethod
+    def select(scores: NDArray[np.float64], count: int) -> NDArray[np.intp]:
+        """
+        Indices of the `count` best scores, best first. `argpartition` keeps
+        this O(P) with only the selected indices sorted.
+        """
+        count = min(count, len(scores))
+        if count < len(scores):
+            top = np.argpartition(-scores, count - 1)[:count]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def breed(
+        self,
+        pop: NDArray[np.int_],
+        sel: NDArray[np.intp],
+        out: NDArray[np.int_],
+    ) -> None:
+        """
+        Fill `out` with children of the selected parents `pop[sel]` via
+        crossover + mutation, on the worker pool when one is active.
+        """
+        if not len(out):
+            return
+        if self._pool is not None:
+            try:
+                self._pool.breed(pop[sel], out)
+                return
+            except POOL_ERRORS as exc:
+                self._drop_pool(exc)
+        self.breed_local(pop, sel, out)
+
+    def breed_local(
+        self,
+        pop: NDArray[np.int_],
+        sel: NDArray[np.intp],
+        out: NDArray[np.int_],
+    ) -> None:
+        """
+        In-process body of `breed` (also run by pool workers): crossover into
+        every row of `out`, one batched mutation of all children, then clash
+        repair when enabled.
+        """
+        parents = sel.tolist()
+        for child in out:
+            p1, p2 = random.sample(parents, 2)
+            self.crossover(pop[p1], pop[p2], child)
+        self.mutator.mutate(out)
+        if self.repairer is not None:
+            for child in out:
+                self.repairer.repair(child)
+
+    def make_child(
+        self,
+        p1: NDArray[np.int_],
+        p2: NDArray[np.int_],
+        out: NDArray[np.int_] | None = None,
+    ) -> NDArray[np.int_]:
+        """
+        Crossover + mutation, followed by clash repair when enabled. The child
+        is written into `out` (a fresh array when None).
+        """
+        child = self.crossover(p1, p2, out)
+        self.mutator.mutate(child[np.newaxis])
+        if self.repairer is not None:
+            self.repairer.repair(child)
+        return child
+
+    def _drop_pool(self, exc: BaseException) -> None:
+        log.warning("GA worker pool failed (%s); continuing serially", exc)
+        if self._pool is not None:
+            self._pool.shutdown()
+        self._pool = None
+
+    def __getstate__(self) -> dict[str, object]:
+        # Worker pools, run reports and progress hooks are per-process; never
+        # ship them to workers
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["last_report"] = None
+        state["on_progress"] = None
+        return state
 
     # ---------------------------
     # Views
@@ -721,6 +1183,42 @@ class TimetableGenerator:
                 res.append(CombinedTimetable(day=d, slot=s, assignments=assigns))
         return res
 
+    def generate_flat_view(self, tt: NDArray[np.int_]) -> list[dict[str, Any]]:
+        """
+        Build a flat list of occupied slots, ready for the React table.
+        """
+        day_names: list[str] = [
+            "Monday",
+            "Tuesday",
+            "Wednesday",
+            "Thursday",
+            "Friday",
+            "Saturday",
+        ]
+        flat: list[dict[str, Any]] = []
+        for c in range(self.NUM_CLASSES):
+            for d in range(self.DAYS):
+                for s in range(self.SLOTS_PER_DAY):
+                    subj_i, teacher_i, room_i = map(int, tt[c, d, s])
+                    if subj_i == -1:
+                        continue
+                    flat.append(
+                        {
+                            "class_id": c,
+                            "day": day_names[d] if d < len(day_names) else f"Day-{d + 1}",
+                            "start_time": f"{9 + s}:00",  # preserve original mapping
+                            "subject_id": subj_i,
+                            "teacher_id": teacher_i,
+                            "room_id": room_i,
+                            "type": (
+                                "lab"
+                                if subj_i in getattr(self, "LAB_SUBJECTS", set())
+                                else self.SUBJECT_TYPES.get(subj_i, "lecture")
+                            ),
+                        }
+                    )
+        return flat
+
     def calculate_statistics(self, tt: NDArray[np.int_]) -> dict[str, int]:
         """
         Calculate basic utilization statistics for a timetable.
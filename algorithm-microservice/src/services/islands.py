@@ -0,0 +1,460 @@
+"""
+Island-model GA built on `TimetableGenerator`.
+
+The population is split into K islands that evolve independently, each with
+its own RNG streams, and exchange their best individuals every
+`migration_interval` generations. Migrants replace the worst individuals of
+the receiving island.
+
+Topologies:
+- "ring":     island i sends to island (i + 1) % K
+- "complete": every island sends to every other island
+
+Islands run in separate processes that only synchronize at migration points.
+When processes cannot be started, the same islands are stepped round-robin in
+the current process, swapping RNG state so each island keeps its own stream.
+Either way the coordinating generator reports progress (the best individual
+over all islands) after every migration interval.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+from .cache import FitnessCache
+from .population import PopulationBuffer
+from .repair import RepairStats
+from .report import GARunReport
+from .termination import (
+    STOP_CANCELLED,
+    STOP_COMPLETED,
+    STOP_DEADLINE,
+    STOP_STAGNATION,
+    STOP_TARGET,
+    ConvergenceMonitor,
+    SolverInterrupted,
+)
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+# Seconds an island waits for migrants before continuing without them
+MIGRATION_TIMEOUT_S = 30.0
+
+
+def island_targets(island_id: int, islands: int, topology: str) -> list[int]:
+    """
+    Islands that `island_id` sends migrants to.
+    """
+    if islands <= 1:
+        return []
+    if topology == "complete":
+        return [i for i in range(islands) if i != island_id]
+    return [(island_id + 1) % islands]
+
+
+class Island:
+    """
+    One sub-population with its own `random` and NumPy RNG streams.
+    """
+
+    def __init__(self, gen: "TimetableGenerator", island_id: int, seed: int, size: int):
+        self.gen = gen
+        self.island_id = island_id
+        self.size = size
+        self.py_state = random.Random(seed).getstate()
+        self.np_rng = np.random.default_rng(seed)
+        self.cache = FitnessCache(gen.FITNESS_CACHE_SIZE)
+        self.monitor = ConvergenceMonitor.from_generator(gen)
+        self.generations = 0
+        self.population: PopulationBuffer | None = None
+        self.scores: NDArray[np.float64] = np.empty(0)
+
+    def _activate(self) -> object:
+        saved = random.getstate()
+        random.setstate(self.py_state)
+        self.gen.rng = self.np_rng
+        return saved
+
+    def _deactivate(self, saved: object) -> None:
+        self.py_state = random.getstate()
+        random.setstate(saved)  # type: ignore[arg-type]
+
+    def initialize(self) -> None:
+        saved = self._activate()
+        try:
+            seeds = self.gen.initial_population(self.size, self.monitor)
+            self.population = PopulationBuffer.for_problem(self.gen.problem, len(seeds))
+            self.population.load(seeds)
+            self.scores = self.gen.score_population(self.pop, self.cache)
+        finally:
+            self._deactivate(saved)
+
+    @property
+    def pop(self) -> NDArray[np.int_]:
+        if self.population is None:
+            raise RuntimeError(f"Island {self.island_id} was not initialized")
+        return self.population.current
+
+    @property
+    def stopped(self) -> bool:
+        return self.monitor.stop_reason is not None
+
+    def evolve(
+        self,
+        generations: int,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> None:
+        """
+        Evolve up to `generations` generations, stopping early when the
+        island's convergence monitor fires or `should_stop()` returns True.
+        """
+        saved = self._activate()
+        try:
+            for _ in range(generations):
+                if self.monitor.update(float(self.scores.max())):
+                    break
+                if should_stop is not None and should_stop():
+                    break
+                assert self.population is not None
+                try:
+                    pop = self.gen.next_generation(
+                        self.pop, self.scores, self.population.spare
+                    )
+                    scores = self.gen.score_population(pop, self.cache, self.monitor)
+                except SolverInterrupted:
+                    break
+                self.population.swap()
+                self.scores = scores
+                self.generations += 1
+        finally:
+            self._deactivate(saved)
+
+    def emigrants(self, count: int) -> list[NDArray[np.int_]]:
+        order = np.argsort(-self.scores, kind="stable")[:count]
+        return [self.pop[i].copy() for i in order]
+
+    def immigrate(self, migrants: list[NDArray[np.int_]]) -> None:
+        """
+        Replace the worst individuals with `migrants` and re-score.
+        """
+        if not migrants:
+            return
+        migrants = migrants[: max(0, self.size - 2)]
+        worst = np.argsort(self.scores, kind="stable")[: len(migrants)]
+        for idx, chrom in zip(worst.tolist(), migrants):
+            self.pop[idx] = chrom
+        self.scores = self.gen.score_population(self.pop, self.cache)
+
+    def best(self) -> tuple[NDArray[np.int_], float]:
+        idx = int(np.argmax(self.scores))
+        return self.pop[idx].copy(), float(self.scores[idx])
+
+    def finish(self, migrations: int, include_repair: bool) -> "IslandResult":
+        """
+        Final result of this island. Repair counters are only included when
+        the island owns its generator copy (process mode).
+        """
+        if not self.stopped:
+            self.monitor.update(float(self.scores.max()))
+        best, score = self.best()
+        repairer = self.gen.repairer
+        return IslandResult(
+            island_id=self.island_id,
+            best=best,
+            score=score,
+            generations=self.generations,
+            stop_reason=self.monitor.stop_reason or STOP_COMPLETED,
+            cache_stats=self.cache.stats(),
+            migrations=migrations,
+            repair=repairer.stats if include_repair and repairer else None,
+        )
+
+
+@dataclass
+class IslandProgress:
+    """
+    Best individual of one island after an evolution step, sent to the
+    coordinating process when it has a progress listener.
+    """
+
+    island_id: int
+    best: NDArray[np.int_]
+    score: float
+    generations: int
+
+
+@dataclass
+class IslandResult:
+    """
+    Outcome of one island, sent back to the coordinating process.
+    """
+
+    island_id: int
+    best: NDArray[np.int_]
+    score: float
+    generations: int
+    stop_reason: str
+    cache_stats: dict[str, int]
+    migrations: int = 0
+    repair: RepairStats | None = None
+
+
+def _island_process(
+    gen: "TimetableGenerator",
+    island_id: int,
+    seed: int,
+    size: int,
+    inboxes: list[Any],
+    results: Any,
+    stop_event: Any,
+    send_progress: bool = False,
+) -> None:
+    island = Island(gen, island_id, seed, size)
+    island.initialize()
+    targets = island_targets(island_id, len(inboxes), gen.MIGRATION_TOPOLOGY)
+    senders = sum(
+        island_id in island_targets(i, len(inboxes), gen.MIGRATION_TOPOLOGY)
+        for i in range(len(inboxes))
+    )
+    migrations = 0
+    remaining = gen.GENERATIONS
+    while remaining > 0:
+        step = min(gen.MIGRATION_INTERVAL, remaining)
+        island.evolve(step, stop_event.is_set)
+        remaining -= step
+        if send_progress:
+            results.put(IslandProgress(island_id, *island.best(), island.generations))
+        if island.monitor.stop_reason == STOP_TARGET:
+            stop_event.set()
+        if remaining <= 0 or island.stopped or stop_event.is_set() or not targets:
+            break
+        outgoing = island.emigrants(gen.MIGRATION_SIZE)
+        for t in targets:
+            inboxes[t].put(outgoing)
+        incoming: list[NDArray[np.int_]] = []
+        expected = senders
+        for _ in range(expected):
+            try:
+                msg = inboxes[island_id].get(timeout=MIGRATION_TIMEOUT_S)
+            except queue.Empty:
+                log.warning("Island %d timed out waiting for migrants", island_id)
+                break
+            if msg is None:
+                # Sender finished early; stop expecting its migrants
+                senders -= 1
+            else:
+                incoming.extend(msg)
+        island.immigrate(incoming)
+        migrations += 1
+
+    # Tell receivers we will not send any more migrants
+    for t in targets:
+        inboxes[t].put(None)
+    for q in inboxes:
+        q.cancel_join_thread()
+    results.put(island.finish(migrations, include_repair=True))
+
+
+class IslandModelSolver:
+    """
+    Run `gen`'s GA as K islands with periodic migration.
+
+    The total population (POP_SIZE) is split evenly across islands.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        self.islands = max(1, gen.ISLANDS)
+        self.island_size = max(4, gen.POP_SIZE // self.islands)
+        base_seed = gen.seed
+        self.seeds = [base_seed * 1_000_003 + i for i in range(self.islands)]
+        self.started = time.perf_counter()
+        self.best: NDArray[np.int_] | None = None
+        self.best_score = float("-inf")
+
+    def _progress(self, best: NDArray[np.int_], score: float, generations: int) -> None:
+        """
+        Report the best individual seen on any island so far.
+        """
+        if self.best is None or score > self.best_score:
+            self.best, self.best_score = best, score
+        self.gen.report_progress(generations, self.best, self.best_score, self.started)
+
+    def run(self) -> tuple[NDArray[np.int_], float]:
+        log.info(
+            "Starting island GA: islands=%d, island_size=%d, interval=%d, "
+            "migrants=%d, topology=%s",
+            self.islands,
+            self.island_size,
+            self.gen.MIGRATION_INTERVAL,
+            self.gen.MIGRATION_SIZE,
+            self.gen.MIGRATION_TOPOLOGY,
+        )
+        started = self.started = time.perf_counter()
+        results: list[IslandResult] | None = None
+        if self.islands > 1:
+            try:
+                results = self._run_processes()
+            except (OSError, PermissionError, NotImplementedError) as exc:
+                log.warning("Island processes unavailable (%s); running serially", exc)
+        if not results:
+            results = self._run_serial()
+
+        report = GARunReport(islands=self.islands)
+        best: NDArray[np.int_] | None = None
+        best_score = float("-inf")
+        reasons: list[str] = []
+        repair = RepairStats()
+        for res in results:
+            reasons.append(res.stop_reason)
+            report.generations = max(report.generations, res.generations)
+            report.migrations = max(report.migrations, res.migrations)
+            report.cache_hits += res.cache_stats["cache_hits"]
+            report.cache_misses += res.cache_stats["cache_misses"]
+            report.cache_size += res.cache_stats["cache_size"]
+            if res.repair is not None:
+                repair.merge(res.repair)
+            if best is None or res.score > best_score:
+                best, best_score = res.best, res.score
+        if self.gen.repairer is not None:
+            # Serial islands share the parent's repairer; process islands report their own
+            repair.merge(self.gen.repairer.stats)
+            report.add_repair_stats(repair)
+        assert best is not None
+        if STOP_TARGET in reasons:
+            report.stop_reason = STOP_TARGET
+        elif STOP_CANCELLED in reasons or (
+            self.gen.cancel_token is not None and self.gen.cancel_token.cancelled
+        ):
+            report.stop_reason = STOP_CANCELLED
+        elif STOP_DEADLINE in reasons:
+            report.stop_reason = STOP_DEADLINE
+        elif reasons and all(r == STOP_STAGNATION for r in reasons):
+            report.stop_reason = STOP_STAGNATION
+        report.evaluations = report.cache_misses
+        report.best_fitness = best_score
+        report.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.gen.report_progress(
+            report.generations, best, best_score, started, force=True
+        )
+        self.gen.last_report = report
+        log.info("Island GA finished: %s", report.as_dict())
+        return best, best_score
+
+    def _run_processes(self) -> list[IslandResult]:
+        ctx = mp.get_context()
+        inboxes = [ctx.Queue() for _ in range(self.islands)]
+        results_q = ctx.Queue()
+        stop_event = ctx.Event()
+        procs = [
+            ctx.Process(
+                target=_island_process,
+                args=(
+                    self.gen,
+                    i,
+                    self.seeds[i],
+                    self.island_size,
+                    inboxes,
+                    results_q,
+                    stop_event,
+                    self.gen.on_progress is not None,
+                ),
+                daemon=False,
+            )
+            for i in range(self.islands)
+        ]
+        for p in procs:
+            p.start()
+        results: list[IslandResult] = []
+        generations = [0] * self.islands
+        token = self.gen.cancel_token
+        try:
+            while len(results) < self.islands:
+                if token is not None and token.cancelled:
+                    # Island processes may not see the token; stop them
+                    stop_event.set()
+                try:
+                    msg = results_q.get(timeout=1.0)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in procs):
+                        log.warning(
+                            "Island processes exited early (%d/%d results)",
+                            len(results),
+                            self.islands,
+                        )
+                        break
+                    continue
+                if isinstance(msg, IslandProgress):
+                    generations[msg.island_id] = msg.generations
+                    self._progress(msg.best, msg.score, max(generations))
+                else:
+                    results.append(msg)
+        finally:
+            for p in procs:
+                p.join(timeout=5.0)
+                if p.is_alive():
+                    p.terminate()
+        return results
+
+    def _run_serial(self) -> list[IslandResult]:
+        gen = self.gen
+        saved_rng = gen.rng
+        islands = [
+            Island(gen, i, self.seeds[i], self.island_size) for i in range(self.islands)
+        ]
+        try:
+            for island in islands:
+                island.initialize()
+            migrations = 0
+            target_hit = False
+            remaining = gen.GENERATIONS
+            while remaining > 0:
+                step = min(gen.MIGRATION_INTERVAL, remaining)
+                for island in islands:
+                    if island.stopped or target_hit:
+                        continue
+                    island.evolve(step, lambda: target_hit)
+                    target_hit = island.monitor.stop_reason == STOP_TARGET
+                remaining -= step
+                if gen.on_progress is not None:
+                    leader = max(islands, key=lambda isl: float(isl.scores.max()))
+                    generations = max(isl.generations for isl in islands)
+                    self._progress(*leader.best(), generations)
+                active = [isl for isl in islands if not isl.stopped]
+                if remaining <= 0 or target_hit or not active:
+                    break
+                if len(active) < 2:
+                    continue
+                outgoing = {
+                    isl.island_id: isl.emigrants(gen.MIGRATION_SIZE) for isl in active
+                }
+                for src, migrants in outgoing.items():
+                    for dst in island_targets(src, self.islands, gen.MIGRATION_TOPOLOGY):
+                        if not islands[dst].stopped:
+                            islands[dst].immigrate(migrants)
+                migrations += 1
+        finally:
+            gen.rng = saved_rng
+        return [isl.finish(migrations, include_repair=False) for isl in islands]
+
+
+__all__ = [
+    "IslandModelSolver",
+    "Island",
+    "IslandProgress",
+    "IslandResult",
+    "island_targets",
+]
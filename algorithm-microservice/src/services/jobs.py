@@ -0,0 +1,438 @@
+"""
+Job records and job stores for the asynchronous generation API.
+
+A job is one timetable solve started by `POST /jobs/generate-timetable` and
+polled afterwards. Its `JobRecord` moves through the states
+
+    queued -> running -> succeeded | failed | cancelled
+
+and carries the latest solver progress (generation or iteration, best fitness
+so far, and the full progress event with penalty breakdown and elapsed time,
+plus mean fitness for GA runs and the leading member for portfolios;
+backtracking sends none) and, once it has succeeded, the rendered
+`SolveOutcome` as a plain dict. A job cancelled while running keeps the best
+timetable found until then as its result.
+
+Stores implement `JobStore`:
+- `InMemoryJobStore`: a dict in the API process; fine for a single uvicorn
+  worker. Keeps at most `max_jobs` records, dropping the oldest finished ones.
+- `SQLiteJobStore`: one table in a SQLite file, so every uvicorn worker
+  started by `run.py --workers` (on one host) sees every job.
+
+`get_job_store` picks the store from the JOB_STORE / JOB_STORE_PATH settings.
+`start_job` admits a solve on the `SolverExecutor` and keeps its record up
+to date from the solver's progress events and final outcome.
+`cancel_job` flags a job as cancel-requested and stops its solve; the process
+running the job also polls the store for the flag every CANCEL_POLL_S, so any
+uvicorn worker can cancel any job, whatever its solver.
+`wait_for_update` lets event streams sleep until the record changes: it
+wakes early in the process running the job and falls back to a timeout
+(polling the store) in any other uvicorn worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache, partial
+from typing import Any
+
+from src.core.config import get_settings
+from src.core.utils import get_logger, now_utc_iso
+
+from ..models.request_models import TimetableRequest
+from .executor import (
+    VIEWS,
+    SolveCancelled,
+    SolveOutcome,
+    SolverExecutor,
+    get_solver_executor,
+)
+from .termination import STOP_CANCELLED
+
+log = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES: frozenset[str] = frozenset({JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED})
+
+# Seconds between checks of a running job's record for a cancel request made
+# through another uvicorn worker
+CANCEL_POLL_S = 1.0
+
+
+@dataclass
+class JobRecord:
+    id: str
+    state: str = JOB_QUEUED
+    created_at: str = field(default_factory=now_utc_iso)
+    updated_at: str = field(default_factory=now_utc_iso)
+    generation: int = 0
+    best_fitness: float | None = None
+    error: str | None = None
+    # Set by `cancel_job`; the process running the job stops its solve
+    cancel_requested: bool = False
+    # Latest progress event (see `TimetableGenerator.report_progress`)
+    progress: dict[str, Any] | None = None
+    # `SolveOutcome.to_dict()` of a succeeded (or cancelled running) job
+    result: dict[str, Any] | None = None
+
+    @classmethod
+    def new(cls) -> "JobRecord":
+        return cls(id=uuid.uuid4().hex)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def status(self) -> dict[str, Any]:
+        """
+        Everything but the result, for status polling.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "result"}
+
+
+class JobStore(ABC):
+    """
+    Persistence for job records.
+    """
+
+    @abstractmethod
+    def create(self, record: JobRecord) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> JobRecord | None:
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, active_only: bool = False, **changes: Any) -> None:
+        """
+        Set fields of a record (and its `updated_at`); unknown ids are ignored.
+        With `active_only`, finished records are left alone (late progress
+        events must not overwrite a final state).
+        """
+
+
+class InMemoryJobStore(JobStore):
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max(1, int(max_jobs))
+        self._jobs: dict[str, JobRecord] = {}
+        self._lock = threading.Lock()
+
+    def create(self, record: JobRecord) -> None:
+        with self._lock:
+            self._jobs[record.id] = replace(record)
+            if len(self._jobs) > self.max_jobs:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Dicts keep insertion order: the first finished records are the oldest
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [j.id for j in self._jobs.values() if j.finished][:excess]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return replace(record) if record is not None else None
+
+    def update(self, job_id: str, active_only: bool = False, **changes: Any) -> None:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is not None and not (active_only and record.finished):
+                self._jobs[job_id] = replace(record, updated_at=now_utc_iso(), **changes)
+
+
+class SQLiteJobStore(JobStore):
+    _COLUMNS: tuple[str, ...] = tuple(f.name for f in fields(JobRecord))
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    generation INTEGER NOT NULL,
+                    best_fitness REAL,
+                    error TEXT,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    progress TEXT,
+                    result TEXT
+                )
+                """
+            )
+            # Stores created before a column existed get it appended
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name, kind in (
+                ("progress", "TEXT"),
+                ("cancel_requested", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: safe from any thread or process
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    _JSON_COLUMNS = frozenset({"progress", "result"})
+
+    @classmethod
+    def _encode(cls, name: str, value: Any) -> Any:
+        if name in cls._JSON_COLUMNS and value is not None:
+            return json.dumps(value)
+        return value
+
+    def create(self, record: JobRecord) -> None:
+        values = [self._encode(c, getattr(record, c)) for c in self._COLUMNS]
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in self._COLUMNS)})",
+                values,
+            )
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data = dict(zip(self._COLUMNS, row))
+        for name in self._JSON_COLUMNS:
+            if data[name] is not None:
+                data[name] = json.loads(data[name])
+        data["cancel_requested"] = bool(data["cancel_requested"])
+        return JobRecord(**data)
+
+    def update(self, job_id: str, active_only: bool = False, **changes: Any) -> None:
+        unknown = set(changes) - set(self._COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        changes["updated_at"] = now_utc_iso()
+        names = list(changes)
+        where = "id = ?"
+        params = [self._encode(n, changes[n]) for n in names] + [job_id]
+        if active_only:
+            where += f" AND state NOT IN ({', '.join('?' for _ in FINISHED_STATES)})"
+            params += sorted(FINISHED_STATES)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{n} = ?' for n in names)} WHERE {where}",
+                params,
+            )
+
+
+@lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    """
+    The process-wide job store, configured from settings.
+    """
+    settings = get_settings()
+    kind = settings.job_store.strip().lower()
+    if kind == "sqlite":
+        return SQLiteJobStore(settings.job_store_path)
+    if kind != "memory":
+        log.warning("Unknown JOB_STORE %r; using memory", settings.job_store)
+    return InMemoryJobStore()
+
+
+# ---------------------------
+# Running jobs
+# ---------------------------
+# Running job tasks with their executors, per job id (also the strong
+# references the event loop does not keep)
+_tasks: dict[str, tuple[SolverExecutor, "asyncio.Task[SolveOutcome]"]] = {}
+# Cancel-request pollers of running jobs, per job id (see `_poll_cancel`)
+_pollers: dict[str, "asyncio.Task[None]"] = {}
+# Events of streams waiting for a job record to change, per job id
+_watchers: dict[str, set[asyncio.Event]] = {}
+
+
+async def wait_for_update(job_id: str, timeout: float) -> None:
+    """
+    Sleep until the job's record changes in this process, or `timeout`.
+    """
+    event = asyncio.Event()
+    _watchers.setdefault(job_id, set()).add(event)
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        waiting = _watchers.get(job_id)
+        if waiting is not None:
+            waiting.discard(event)
+            if not waiting:
+                del _watchers[job_id]
+
+
+def _wake(job_id: str) -> None:
+    for event in _watchers.get(job_id, ()):
+        event.set()
+
+
+def start_job(
+    request: TimetableRequest,
+    resources: dict[str, Any] | None = None,
+    store: JobStore | None = None,
+    executor: SolverExecutor | None = None,
+) -> JobRecord:
+    """
+    Submit a solve rendering every view and record it as a new job.
+
+    Raises:
+        SolverBusy: The executor did not admit the solve; no job is created.
+    """
+    store = store or get_job_store()
+    executor = executor or get_solver_executor()
+    record = JobRecord.new()
+    loop = asyncio.get_running_loop()
+    task = executor.submit(
+        request,
+        resources,
+        VIEWS,
+        on_progress=partial(_on_progress, store, record.id, loop),
+    )
+    store.create(record)
+    _tasks[record.id] = (executor, task)
+    _pollers[record.id] = loop.create_task(_poll_cancel(store, record.id))
+    task.add_done_callback(partial(_on_done, store, record.id))
+    return record
+
+
+def cancel_job(job_id: str, store: JobStore | None = None) -> JobRecord | None:
+    """
+    Request cancellation of a queued or running job and return its record
+    (None for unknown ids). Finished jobs are returned unchanged. The job
+    becomes `cancelled` once its solver has stopped.
+    """
+    store = store or get_job_store()
+    record = store.get(job_id)
+    if record is None or record.finished:
+        return record
+    store.update(job_id, active_only=True, cancel_requested=True)
+    _cancel_local(job_id)
+    _wake(job_id)
+    return store.get(job_id)
+
+
+def _cancel_local(job_id: str) -> None:
+    # Only the process that started the job holds its task
+    running = _tasks.get(job_id)
+    if running is not None:
+        executor, task = running
+        executor.cancel(task)
+
+
+async def _poll_cancel(store: JobStore, job_id: str) -> None:
+    """
+    Stop the job's solve once its record is flagged as cancel-requested,
+    e.g. by `cancel_job` in another uvicorn worker. Runs until the job is
+    done (then `_on_done` cancels it).
+    """
+    while True:
+        await asyncio.sleep(CANCEL_POLL_S)
+        record = store.get(job_id)
+        if record is None or record.finished:
+            return
+        if record.cancel_requested:
+            _cancel_local(job_id)
+            return
+
+
+def _on_progress(
+    store: JobStore,
+    job_id: str,
+    loop: asyncio.AbstractEventLoop,
+    event: dict[str, Any],
+) -> None:
+    # Runs on the executor's progress thread
+    if event.get("type") == "started":
+        store.update(job_id, active_only=True, state=JOB_RUNNING)
+    else:
+        store.update(
+            job_id,
+            active_only=True,
+            state=JOB_RUNNING,
+            generation=int(event["generation"]),
+            best_fitness=float(event["best_fitness"]),
+            progress={k: v for k, v in event.items() if k != "type"},
+        )
+    loop.call_soon_threadsafe(_wake, job_id)
+
+
+def _on_done(store: JobStore, job_id: str, task: "asyncio.Task[SolveOutcome]") -> None:
+    _tasks.pop(job_id, None)
+    poller = _pollers.pop(job_id, None)
+    if poller is not None:
+        poller.cancel()
+    try:
+        _finish(store, job_id, task)
+    finally:
+        _wake(job_id)
+
+
+def _finish(store: JobStore, job_id: str, task: "asyncio.Task[SolveOutcome]") -> None:
+    if task.cancelled():
+        store.update(job_id, state=JOB_CANCELLED, error="Solver was shut down")
+        return
+    exc = task.exception()
+    if isinstance(exc, SolveCancelled):
+        store.update(job_id, state=JOB_CANCELLED)
+        return
+    if exc is not None:
+        log.error("Job %s failed: %s", job_id, exc)
+        store.update(job_id, state=JOB_FAILED, error=str(exc))
+        return
+    outcome = task.result()
+    # A cancelled running solve still returns its best timetable so far
+    cancelled = outcome.stop_reason == STOP_CANCELLED
+    store.update(
+        job_id,
+        state=JOB_CANCELLED if cancelled else JOB_SUCCEEDED,
+        generation=outcome.generation_count,
+        best_fitness=outcome.fitness_score,
+        result=outcome.to_dict(),
+    )
+
+
+__all__ = [
+    "CANCEL_POLL_S",
+    "FINISHED_STATES",
+    "InMemoryJobStore",
+    "JOB_CANCELLED",
+    "JOB_FAILED",
+    "JOB_QUEUED",
+    "JOB_RUNNING",
+    "JOB_SUCCEEDED",
+    "JobRecord",
+    "JobStore",
+    "SQLiteJobStore",
+    "cancel_job",
+    "get_job_store",
+    "start_job",
+    "wait_for_update",
+]
@@ -0,0 +1,449 @@
+"""
+Optional compiled kernels for fitness, delta fitness and mutation.
+
+The NumPy code paths in `fitness`, `delta` and `mutation` work on whole
+batches, but the lab-run parity check, clash counting and per-child mutation
+moves are really scalar loops with branches. When Numba is installed, the
+loop versions below are compiled with `numba.njit` and used instead:
+
+- `population_components`: all raw penalty components of a population in one
+  pass per individual (columns in `fitness.PENALTY_COMPONENTS` order)
+- `odd_lab_runs_row`: odd-length lab runs of one (class, day) row, used by
+  `DeltaFitnessState` after every write to a lab cell
+- `mutate_rounds`: the `BatchMutator` moves, applied child by child from the
+  same random draws as the NumPy path
+
+The backend is picked once at import from the KERNEL_BACKEND setting:
+"auto" (Numba when importable), "numba" or "numpy". Without Numba the loop
+functions stay plain Python; they are then only used by `check_parity`,
+which compares them against the NumPy paths on random populations.
+`warmup` runs that check after compiling and switches back to the NumPy
+backend if any compiled kernel disagrees.
+Scores and mutations are identical across backends; both consume the
+generator's RNG in the same way.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.config import get_settings
+from src.core.utils import get_logger
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _select_backend() -> str:
+    wanted = get_settings().kernel_backend.strip().lower()
+    if wanted not in {"auto", "numba", "numpy"}:
+        log.warning("Unknown KERNEL_BACKEND %r; using auto", wanted)
+        wanted = "auto"
+    if wanted == "numpy":
+        return "numpy"
+    if numba is None:
+        if wanted == "numba":
+            log.warning("KERNEL_BACKEND=numba but Numba is not installed; using numpy")
+        return "numpy"
+    return "numba"
+
+
+BACKEND: str = _select_backend()
+# True when the loop kernels below are compiled and used by the hot paths
+COMPILED: bool = BACKEND == "numba"
+
+
+def _kernel(fn: Callable[..., Any]) -> Callable[..., Any]:
+    if not COMPILED:
+        return fn
+    return numba.njit(cache=True, nogil=True)(fn)
+
+
+# ---------------------------
+# Kernels (plain Python unless compiled)
+# ---------------------------
+@_kernel
+def _is_lab(is_lab, subj):  # type: ignore[no-untyped-def]
+    # `is_lab` is indexed by subject + 1 (index 0 = free cell)
+    return 0 <= subj + 1 < is_lab.shape[0] and is_lab[subj + 1]
+
+
+@_kernel
+def odd_lab_runs_row(row, is_lab):  # type: ignore[no-untyped-def]
+    """
+    Number of odd-length runs of the same lab subject in a 1-D slot row.
+    """
+    odd = 0
+    run_subj = -1
+    run_len = 0
+    for s in range(row.shape[0]):
+        subj = row[s]
+        if subj == run_subj:
+            run_len += 1
+            continue
+        if run_len % 2 == 1 and _is_lab(is_lab, run_subj):
+            odd += 1
+        run_subj = subj
+        run_len = 1
+    if run_len % 2 == 1 and _is_lab(is_lab, run_subj):
+        odd += 1
+    return odd
+
+
+@_kernel
+def population_components(  # type: ignore[no-untyped-def]
+    pop,
+    qualified,
+    is_lab,
+    hour_subjects,
+    hour_targets,
+    max_per_day,
+    max_per_week,
+    num_teachers,
+    num_rooms,
+):
+    """
+    Raw penalty components of a (P, C, D, S, 3) population as a (P, 7) int64
+    array. Subject ids must be below `qualified.shape[0]`.
+    """
+    P, C, D, S = pop.shape[0], pop.shape[1], pop.shape[2], pop.shape[3]
+    NS = qualified.shape[0]
+    out = np.zeros((P, 7), dtype=np.int64)
+    teacher_occ = np.zeros((D, S, num_teachers), dtype=np.int64)
+    room_occ = np.zeros((D, S, num_rooms), dtype=np.int64)
+    day_load = np.zeros((num_teachers, D), dtype=np.int64)
+    counts = np.zeros((C, NS), dtype=np.int64)
+
+    for p in range(P):
+        teacher_occ[:] = 0
+        room_occ[:] = 0
+        day_load[:] = 0
+        counts[:] = 0
+        teacher_clash = 0
+        room_clash = 0
+        unqualified = 0
+        lab_parity = 0
+        for c in range(C):
+            for d in range(D):
+                for s in range(S):
+                    subj = pop[p, c, d, s, 0]
+                    if subj == -1:
+                        continue
+                    teacher = pop[p, c, d, s, 1]
+                    room = pop[p, c, d, s, 2]
+                    if teacher_occ[d, s, teacher] > 0:
+                        teacher_clash += 1
+                    teacher_occ[d, s, teacher] += 1
+                    if room_occ[d, s, room] > 0:
+                        room_clash += 1
+                    room_occ[d, s, room] += 1
+                    if not qualified[subj, teacher]:
+                        unqualified += 1
+                    day_load[teacher, d] += 1
+                    counts[c, subj] += 1
+                lab_parity += odd_lab_runs_row(pop[p, c, d, :, 0], is_lab)
+
+        daily_overload = 0
+        weekly_overload = 0
+        for t in range(num_teachers):
+            week = 0
+            for d in range(D):
+                week += day_load[t, d]
+                if day_load[t, d] > max_per_day:
+                    daily_overload += day_load[t, d] - max_per_day
+            if week > max_per_week:
+                weekly_overload += week - max_per_week
+
+        hours_mismatch = 0
+        for k in range(hour_subjects.shape[0]):
+            for c in range(C):
+                hours_mismatch += abs(counts[c, hour_subjects[k]] - hour_targets[k])
+
+        out[p, 0] = teacher_clash
+        out[p, 1] = room_clash
+        out[p, 2] = unqualified
+        out[p, 3] = daily_overload
+        out[p, 4] = weekly_overload
+        out[p, 5] = lab_parity
+        out[p, 6] = hours_mismatch
+    return out
+
+
+@_kernel
+def _lab_pair_at(child, c, d, s, is_lab):  # type: ignore[no-untyped-def]
+    # (in a lab pair, the pair's other cell is the slot before)
+    subj = child[c, d, s, 0]
+    if not _is_lab(is_lab, subj):
+        return False, False
+    before = s > 0 and child[c, d, s - 1, 0] == subj
+    after = s + 1 < child.shape[2] and child[c, d, s + 1, 0] == subj
+    return before or after, before
+
+
+@_kernel
+def _replace_move(  # type: ignore[no-untyped-def]
+    child, c, d, s, subj, teacher, room, is_lab
+):
+    S = child.shape[2]
+    if not _is_lab(is_lab, subj):
+        in_pair, _ = _lab_pair_at(child, c, d, s, is_lab)
+        if not in_pair:
+            child[c, d, s, 0] = subj
+            child[c, d, s, 1] = teacher
+            child[c, d, s, 2] = room
+        return
+    if S < 2:
+        return
+    start = -1
+    if s <= S - 2 and child[c, d, s, 0] == -1 and child[c, d, s + 1, 0] == -1:
+        start = s
+    elif s > 0 and child[c, d, s - 1, 0] == -1 and child[c, d, s, 0] == -1:
+        start = s - 1
+    else:
+        for j in range(S - 1):
+            if child[c, d, j, 0] == -1 and child[c, d, j + 1, 0] == -1:
+                start = j
+                break
+    if start < 0:
+        return
+    for k in range(2):
+        child[c, d, start + k, 0] = subj
+        child[c, d, start + k, 1] = teacher
+        child[c, d, start + k, 2] = room
+
+
+@_kernel
+def _swap_move(child, c1, d1, s1, c2, d2, s2, is_lab):  # type: ignore[no-untyped-def]
+    pair1, back1 = _lab_pair_at(child, c1, d1, s1, is_lab)
+    pair2, back2 = _lab_pair_at(child, c2, d2, s2, is_lab)
+    if not pair1 and not pair2:
+        for f in range(3):
+            a = child[c1, d1, s1, f]
+            child[c1, d1, s1, f] = child[c2, d2, s2, f]
+            child[c2, d2, s2, f] = a
+    elif pair1 and pair2:
+        t1 = s1 - 1 if back1 else s1
+        t2 = s2 - 1 if back2 else s2
+        for f in range(3):
+            x0 = child[c1, d1, t1, f]
+            x1 = child[c1, d1, t1 + 1, f]
+            y0 = child[c2, d2, t2, f]
+            y1 = child[c2, d2, t2 + 1, f]
+            child[c1, d1, t1, f] = y0
+            child[c1, d1, t1 + 1, f] = y1
+            child[c2, d2, t2, f] = x0
+            child[c2, d2, t2 + 1, f] = x1
+
+
+@_kernel
+def mutate_rounds(  # type: ignore[no-untyped-def]
+    children,
+    idx,
+    u_kind,
+    u_teacher,
+    subjects,
+    is_lab,
+    pool_table,
+    pool_size,
+    replace_share,
+):
+    """
+    Apply `BatchMutator` moves in place. `idx` is the (moves, N, 10) integer
+    draw of `BatchMutator.draw`, `u_kind`/`u_teacher` its (moves, N) kind
+    and teacher columns. Draw columns: kind, c, d, s, subject, teacher, room,
+    c2, d2, s2.
+    """
+    for k in range(idx.shape[0]):
+        for n in range(idx.shape[1]):
+            draw = idx[k, n]
+            child = children[n]
+            if u_kind[k, n] < replace_share:
+                if subjects.shape[0] == 0:
+                    continue
+                subj = subjects[draw[4]]
+                size = pool_size[subj]
+                pick = min(int(u_teacher[k, n] * size), size - 1)
+                _replace_move(
+                    child,
+                    draw[1],
+                    draw[2],
+                    draw[3],
+                    subj,
+                    pool_table[subj, pick],
+                    draw[6],
+                    is_lab,
+                )
+            else:
+                _swap_move(
+                    child, draw[1], draw[2], draw[3], draw[7], draw[8], draw[9], is_lab
+                )
+
+
+# ---------------------------
+# Startup and verification
+# ---------------------------
+_warmed = False
+
+
+def warmup() -> float:
+    """
+    Compile every kernel for the int16 and int32 gene dtypes so the first
+    solve does not pay for JIT compilation. Returns the seconds spent; a
+    no-op without a compiled backend or when already warmed up.
+    """
+    global _warmed
+    if not COMPILED or _warmed:
+        return 0.0
+    started = time.perf_counter()
+    qualified = np.ones((2, 1), dtype=bool)
+    is_lab = np.array([False, False, True])
+    hours = np.array([0], dtype=np.int64)
+    pool_table = np.zeros((2, 1), dtype=np.int64)
+    pool_size = np.ones(2, dtype=np.int64)
+    for dtype in (np.int16, np.int32):
+        pop = np.full((1, 1, 1, 2, 3), -1, dtype=dtype)
+        population_components(pop, qualified, is_lab, hours, hours, 1, 1, 1, 1)
+        odd_lab_runs_row(pop[0, 0, 0, :, 0], is_lab)
+        idx = np.zeros((1, 1, 10), dtype=np.int64)
+        u = np.zeros((1, 1))
+        mutate_rounds(pop, idx, u, u, hours, is_lab, pool_table, pool_size, 0.5)
+    _warmed = True
+    elapsed = time.perf_counter() - started
+    log.info("Compiled fitness and mutation kernels in %.2fs", elapsed)
+    _verify_compiled()
+    return elapsed
+
+
+def _parity_generator() -> "TimetableGenerator":
+    """A small fixed problem with lectures and labs, used by `_verify_compiled`."""
+    from src.models.request_models import TimetableRequest
+
+    from .generator import TimetableGenerator
+
+    num_subjects = 6
+    return TimetableGenerator(
+        TimetableRequest(days=5, slots_per_day=6, max_hours_per_day=4),
+        TOTAL_ROOMS=4,
+        TOTAL_TEACHERS=8,
+        NUM_CLASSES=3,
+        TOTAL_SUBJECTS=num_subjects,
+        SUBJECT_TYPES={
+            i: "lab" if i % 3 == 2 else "lecture" for i in range(num_subjects)
+        },
+        SUBJECT_TEACHERS={
+            i: [i, (i + 3) % 8, (i + 5) % 8] for i in range(num_subjects)
+        },
+        SUBJECT_HOURS={i: 2 if i % 3 == 2 else 3 for i in range(num_subjects)},
+    )
+
+
+def _verify_compiled() -> None:
+    """
+    Check the compiled kernels against the NumPy paths once after compiling.
+    On any mismatch or error the module falls back to the NumPy backend, so a
+    miscompiled kernel can never score or mutate production populations.
+    """
+    global BACKEND, COMPILED
+    try:
+        result = check_parity(_parity_generator())
+    except Exception:
+        log.exception("Kernel parity check failed to run")
+        result = {}
+    if result and all(result.values()):
+        log.info("Compiled kernels match the NumPy reference")
+        return
+    log.warning("Compiled kernels disagree with NumPy; falling back to numpy")
+    BACKEND = "numpy"
+    COMPILED = False
+
+
+def check_parity(
+    gen: "TimetableGenerator", samples: int = 8, rounds: int = 3
+) -> dict[str, bool]:
+    """
+    Compare the loop kernels with the NumPy paths on random populations of
+    `gen`'s problem. Works with either backend (the loop kernels then run as
+    plain Python). The generator's RNG state is restored afterwards.
+
+    Returns a mapping of kernel name -> whether every sample matched.
+    """
+    from .fitness import PENALTY_COMPONENTS
+    from .mutation import _KIND, _TEACHER, REPLACE_SHARE
+
+    ev = gen.batch_evaluator
+    mutator = gen.mutator
+    state = gen.rng.bit_generator.state
+    try:
+        pop = gen.random_initializer.generate(samples)
+        gen.mutator.mutate(pop)
+        ev._ensure_subject_capacity(int(pop[..., 0].max()))
+
+        expected = ev.components_numpy(pop)
+        got = population_components(
+            pop,
+            ev.qualified,
+            ev.padded_lab_mask(),
+            ev.hour_subjects,
+            ev.hour_targets,
+            ev.max_per_day,
+            ev.max_per_week,
+            ev.num_teachers,
+            ev.num_rooms,
+        )
+        fitness_ok = all(
+            np.array_equal(got[:, i], expected[name])
+            for i, name in enumerate(PENALTY_COMPONENTS)
+        )
+
+        rows = pop[..., 0].reshape(-1, gen.SLOTS_PER_DAY)
+        runs = [odd_lab_runs_row(row, mutator.is_lab) for row in rows]
+        delta_ok = np.array_equal(np.array(runs), ev.odd_lab_runs(rows))
+
+        mutation_ok = True
+        for _ in range(rounds):
+            a = pop.copy()
+            b = pop.copy()
+            u, idx = mutator.draw(len(pop))
+            mutator.apply_rounds(a, u, idx)
+            mutate_rounds(
+                b,
+                idx,
+                u[..., _KIND],
+                u[..., _TEACHER],
+                mutator.subjects,
+                mutator.is_lab,
+                gen.problem.pool_table,
+                gen.problem.pool_size,
+                REPLACE_SHARE,
+            )
+            mutation_ok &= bool(np.array_equal(a, b))
+            pop = a
+    finally:
+        gen.rng.bit_generator.state = state
+
+    result = {"fitness": fitness_ok, "delta": delta_ok, "mutation": mutation_ok}
+    if not all(result.values()):
+        log.warning("Kernel parity mismatch (backend=%s): %s", BACKEND, result)
+    return result
+
+
+__all__ = [
+    "BACKEND",
+    "COMPILED",
+    "check_parity",
+    "mutate_rounds",
+    "odd_lab_runs_row",
+    "population_components",
+    "warmup",
+]
@@ -0,0 +1,134 @@
+"""
+Memetic polishing of GA elites.
+
+Every `memetic_interval` generations `ElitePolisher` takes the top
+`memetic_elites` individuals and runs a first-improvement hill-climb on each.
+Moves are drawn from `MoveNeighborhood` (slot swaps and teacher/room
+reassignments) starting at cells that currently violate a hard constraint,
+and are scored incrementally on a `DeltaFitnessState`. Improving moves are
+kept; all others are rolled back.
+
+The budget of one polishing round is `memetic_budget_evaluations` move
+evaluations and/or `memetic_budget_ms` milliseconds, shared evenly by the
+elites. Each round appends a stats entry to `history`, which `run_ga` copies
+into `GARunReport.local_search`.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .delta import DeltaFitnessState
+from .neighborhood import ROOM, SWAP, TEACHER, MoveNeighborhood
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+# Moves tried by the hill-climb
+POLISH_MOVES: tuple[int, ...] = (SWAP, TEACHER, ROOM)
+
+
+class ElitePolisher:
+    """
+    Bounded hill-climbing applied to the best individuals of a population.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        self.interval = gen.MEMETIC_INTERVAL
+        self.elites = gen.MEMETIC_ELITES
+        self.max_evaluations = gen.MEMETIC_BUDGET_EVALUATIONS
+        self.max_ms = gen.MEMETIC_BUDGET_MS
+        self.moves = MoveNeighborhood(gen, random.Random(gen.seed))
+        self.history: list[dict[str, float]] = []
+
+    def due(self, generation: int) -> bool:
+        return generation > 0 and generation % self.interval == 0
+
+    def polish(
+        self,
+        pop: list[NDArray[np.int_]] | NDArray[np.int_],
+        scores: NDArray[np.float64],
+        generation: int,
+    ) -> None:
+        """
+        Hill-climb the top elites of `pop`, overwriting improved individuals
+        and their entries in `scores` in place.
+        """
+        started = time.perf_counter()
+        deadline = started + self.max_ms / 1000.0 if self.max_ms else None
+        order = np.argsort(-scores, kind="stable")[: self.elites].tolist()
+        per_elite = (
+            max(1, self.max_evaluations // len(order)) if self.max_evaluations else None
+        )
+        evaluations = 0
+        improved = 0
+        gain = 0.0
+        for idx in order:
+            delta = DeltaFitnessState.from_generator(self.gen, pop[idx].copy())
+            before = delta.score
+            evaluations += self.climb(delta, per_elite, deadline)
+            if delta.score > before:
+                pop[idx][...] = delta.chrom
+                scores[idx] = delta.score
+                improved += 1
+                gain += delta.score - before
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        self.history.append(
+            {
+                "generation": generation,
+                "elites": len(order),
+                "improved": improved,
+                "gain": gain,
+                "evaluations": evaluations,
+                "elapsed_ms": (time.perf_counter() - started) * 1000.0,
+            }
+        )
+
+    def climb(
+        self,
+        delta: DeltaFitnessState,
+        max_evaluations: int | None,
+        deadline: float | None,
+    ) -> int:
+        """
+        First-improvement hill-climb on `delta`; returns the evaluations used.
+        Stops when the budget is spent or no violating cell is left.
+        """
+        moves = self.moves
+        hot = moves.hot_cells(delta)
+        current = delta.score
+        evaluations = 0
+        attempts = 0
+        limit = max_evaluations if max_evaluations is not None else float("inf")
+        while hot and evaluations < limit:
+            attempts += 1
+            if max_evaluations is not None and attempts > 4 * max_evaluations:
+                break  # mostly impossible moves; give up on this elite
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            writes = moves.random_move(delta, hot, POLISH_MOVES, hot_share=1.0)
+            if not writes:
+                continue
+            evaluations += 1
+            mark = delta.mark()
+            for c, d, s, value in writes:
+                delta.set_cell(c, d, s, value)
+            if delta.score > current:
+                delta.commit()
+                current = delta.score
+                hot = moves.hot_cells(delta)
+            else:
+                delta.rollback(mark)
+        delta.commit()
+        return evaluations
+
+
+__all__ = ["ElitePolisher"]
@@ -0,0 +1,229 @@
+"""
+Vectorized mutation of a whole batch of children.
+
+`TimetableGenerator.random_move` applies one move at a time with the `random`
+module and is kept for single-chromosome searches that route writes through a
+`DeltaFitnessState`. `BatchMutator` applies the same moves to a stack of
+children at once:
+
+- replace (60%): book a random subject at a random cell with a random
+  qualified teacher and room. Lectures never overwrite a lab-pair cell; labs
+  go into a free adjacent pair of the same day (preferring the drawn slot,
+  then the slot before it, then the first free pair) or are skipped.
+- swap (40%): swap two random cells of the child, or two whole lab pairs
+  when both cells belong to one. Mixed lab-pair/single swaps are skipped.
+
+All sites, move kinds and replacement values of a batch come from a single
+draw of the generator's NumPy RNG. Moves are then applied round by round,
+where round k holds the k-th move of every child. Each round is a handful of
+fancy-indexed reads and writes, so the lab-pair checks use table lookups
+instead of Python branches. With a compiled kernel backend (see `kernels`)
+the same draws are applied child by child by `kernels.mutate_rounds`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import kernels
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+# Probability that a move is a replace (otherwise a swap)
+REPLACE_SHARE = 0.6
+
+# Columns of the per-move random draw
+_KIND, _C, _D, _S, _SUBJ, _TEACHER, _ROOM, _C2, _D2, _S2 = range(10)
+_DRAWS = 10
+
+
+class BatchMutator:
+    """
+    Apply `random_move`-style mutations to stacks of chromosomes.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        self.problem = problem = gen.problem
+        self.num_classes = problem.num_classes
+        self.days = problem.days
+        self.slots = problem.slots
+        self.num_rooms = problem.num_rooms
+        self.moves = max(
+            1,
+            int(gen.MUTATION_RATE * self.num_classes * self.days * self.slots),
+        )
+
+        self.subjects = np.array(
+            [s for s in problem.subject_ids if s >= 0], dtype=np.int64
+        )
+        # Lab lookup for subject ids shifted by one (index 0 = free cell)
+        self.is_lab = np.concatenate([[False], problem.lab_mask])
+
+    def mutate(self, children: NDArray[np.int_]) -> None:
+        """
+        Mutate a (N, C, D, S, 3) stack of children in place.
+        """
+        N = len(children)
+        if N == 0:
+            return
+        u, idx = self.draw(N)
+        if kernels.COMPILED:
+            kernels.mutate_rounds(
+                children,
+                idx,
+                u[..., _KIND],
+                u[..., _TEACHER],
+                self.subjects,
+                self.is_lab,
+                self.problem.pool_table,
+                self.problem.pool_size,
+                REPLACE_SHARE,
+            )
+        else:
+            self.apply_rounds(children, u, idx)
+
+    def draw(self, N: int) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Random numbers for `moves` moves of N children: the (moves, N, 10)
+        uniform draw and the indices scaled from it.
+        """
+        u = self.gen.rng.random((self.moves, N, _DRAWS))
+        C, D, S = self.num_classes, self.days, self.slots
+        dims = np.array(
+            [1, C, D, S, max(1, len(self.subjects)), 1, self.num_rooms, C, D, S]
+        )
+        idx = np.minimum((u * dims).astype(np.int64), dims - 1)
+        return u, idx
+
+    def apply_rounds(
+        self,
+        children: NDArray[np.int_],
+        u: NDArray[np.float64],
+        idx: NDArray[np.int64],
+    ) -> None:
+        """
+        Apply a `draw` to `children` round by round with NumPy indexing.
+        """
+        rows = np.arange(len(children))
+        for k in range(len(idx)):
+            draw = idx[k]
+            replace = u[k, :, _KIND] < REPLACE_SHARE
+            if replace.any() and len(self.subjects):
+                self._replace(
+                    children, rows[replace], draw[replace], u[k, replace, _TEACHER]
+                )
+            if not replace.all():
+                self._swap(children, rows[~replace], draw[~replace])
+
+    # ---------------------------
+    # Lab-pair lookups
+    # ---------------------------
+    def _in_lab_pair(
+        self,
+        children: NDArray[np.int_],
+        i: NDArray[np.int64],
+        c: NDArray[np.int64],
+        d: NDArray[np.int64],
+        s: NDArray[np.int64],
+    ) -> tuple[NDArray[np.bool_], NDArray[np.bool_]]:
+        """
+        Whether each cell is part of a lab run (same lab subject in an
+        adjacent slot), and whether that neighbour is the slot before it.
+        """
+        S = self.slots
+        subj = children[i, c, d, s, 0].astype(np.int64)
+        before = children[i, c, d, np.maximum(s - 1, 0), 0] == subj
+        before &= s > 0
+        after = children[i, c, d, np.minimum(s + 1, S - 1), 0] == subj
+        after &= s + 1 < S
+        lab = self.is_lab[subj + 1]
+        return lab & (before | after), lab & before
+
+    # ---------------------------
+    # Moves
+    # ---------------------------
+    def _replace(
+        self,
+        children: NDArray[np.int_],
+        i: NDArray[np.int64],
+        draw: NDArray[np.int64],
+        teacher_u: NDArray[np.float64],
+    ) -> None:
+        c, d, s = draw[:, _C], draw[:, _D], draw[:, _S]
+        subj = self.subjects[draw[:, _SUBJ]]
+        teacher = self.problem.sample_teachers(subj, teacher_u)
+        room = draw[:, _ROOM]
+        lab = self.is_lab[subj + 1]
+
+        # Lectures: any cell that is not part of a lab pair
+        lecture = ~lab
+        if lecture.any():
+            in_pair, _ = self._in_lab_pair(
+                children, i[lecture], c[lecture], d[lecture], s[lecture]
+            )
+            ok = np.flatnonzero(lecture)[~in_pair]
+            children[i[ok], c[ok], d[ok], s[ok]] = np.stack(
+                [subj[ok], teacher[ok], room[ok]], axis=1
+            )
+
+        # Labs: the first free adjacent pair in preference order
+        if lab.any() and self.slots >= 2:
+            li, lc, ld, ls = i[lab], c[lab], d[lab], s[lab]
+            free = children[li, lc, ld, :, 0] == -1
+            pair_free = free[:, :-1] & free[:, 1:]
+            at = np.arange(len(li))
+            last = self.slots - 2
+            here = (ls <= last) & pair_free[at, np.minimum(ls, last)]
+            before = (ls > 0) & pair_free[at, np.maximum(ls - 1, 0)]
+            first = np.where(pair_free.any(axis=1), pair_free.argmax(axis=1), -1)
+            start = np.where(here, ls, np.where(before, ls - 1, first))
+            ok = start >= 0
+            cell = np.stack([subj[lab], teacher[lab], room[lab]], axis=1)[ok]
+            li, lc, ld, start = li[ok], lc[ok], ld[ok], start[ok]
+            children[li, lc, ld, start] = cell
+            children[li, lc, ld, start + 1] = cell
+
+    def _swap(
+        self,
+        children: NDArray[np.int_],
+        i: NDArray[np.int64],
+        draw: NDArray[np.int64],
+    ) -> None:
+        c1, d1, s1 = draw[:, _C], draw[:, _D], draw[:, _S]
+        c2, d2, s2 = draw[:, _C2], draw[:, _D2], draw[:, _S2]
+        pair1, back1 = self._in_lab_pair(children, i, c1, d1, s1)
+        pair2, back2 = self._in_lab_pair(children, i, c2, d2, s2)
+
+        # Single cells: read both first, then write in order
+        single = ~pair1 & ~pair2
+        if single.any():
+            si = i[single]
+            a = (si, c1[single], d1[single], s1[single])
+            b = (si, c2[single], d2[single], s2[single])
+            first, second = children[b], children[a]
+            children[a] = first
+            children[b] = second
+
+        # Two lab pairs: swap the 2-slot blocks starting at each pair's start
+        block = pair1 & pair2
+        if block.any():
+            bi = i[block]
+            t1 = s1[block] - back1[block]
+            t2 = s2[block] - back2[block]
+            bc1, bd1, bc2, bd2 = c1[block], d1[block], c2[block], d2[block]
+            a0, a1 = (bi, bc1, bd1, t1), (bi, bc1, bd1, t1 + 1)
+            b0, b1 = (bi, bc2, bd2, t2), (bi, bc2, bd2, t2 + 1)
+            x0, x1 = children[a0], children[a1]
+            y0, y1 = children[b0], children[b1]
+            children[a0] = y0
+            children[a1] = y1
+            children[b0] = x0
+            children[b1] = x1
+
+
+__all__ = ["BatchMutator", "REPLACE_SHARE"]
@@ -0,0 +1,250 @@
+"""
+Move neighborhood shared by the local-search engines.
+
+`MoveNeighborhood` proposes moves on a `DeltaFitnessState` as lists of cell
+writes `(class, day, slot, [subject, teacher, room])`; callers evaluate them
+by applying the writes and rolling them back.
+
+Move types:
+- SWAP:      swap two cells of the same class (either may be empty)
+- TEACHER:   give a booking another qualified teacher
+- ROOM:      give a booking another room
+- LAB_BLOCK: swap a 2-slot lab pair with another aligned 2-slot block
+- HOURS:     book a missing hour into a free cell, or free a booked cell
+
+Half of the moves start from a "hot" cell, i.e. a booking that currently
+takes part in a clash, an unqualified assignment, a teacher overload or an
+odd lab run. Lab pairs are always moved and reassigned as a block.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .delta import DeltaFitnessState
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+Cell = tuple[int, int, int]
+Write = tuple[int, int, int, tuple[int, int, int]]
+
+EMPTY: tuple[int, int, int] = (-1, -1, -1)
+
+SWAP, TEACHER, ROOM, LAB_BLOCK, HOURS = range(5)
+ALL_MOVES: tuple[int, ...] = (SWAP, TEACHER, ROOM, LAB_BLOCK, HOURS)
+
+
+class MoveNeighborhood:
+    """
+    Random move generator for one problem definition and RNG stream.
+    """
+
+    def __init__(self, gen: "TimetableGenerator", rnd: random.Random):
+        self.gen = gen
+        self.random = rnd
+        self.num_classes = gen.NUM_CLASSES
+        self.days = gen.DAYS
+        self.slots = gen.SLOTS_PER_DAY
+        self.num_teachers = gen.TOTAL_TEACHERS
+        self.num_rooms = gen.TOTAL_ROOMS
+        self.problem = gen.problem
+        self.lab_subjects = gen.problem.lab_subjects
+        self.required = dict(
+            zip(gen.problem.hour_subjects.tolist(), gen.problem.hour_targets.tolist())
+        )
+
+    def hot_cells(self, delta: DeltaFitnessState) -> list[Cell]:
+        """
+        Bookings that currently contribute to a hard-constraint penalty.
+        """
+        ev = delta.evaluator
+        chrom = delta.chrom
+        subj = chrom[..., 0]
+        occ = subj != -1
+        sj = np.where(occ, subj, 0)
+        t = np.where(occ, chrom[..., 1], 0)
+        r = np.where(occ, chrom[..., 2], 0)
+        d_idx = np.arange(self.days)[None, :, None]
+        s_idx = np.arange(self.slots)[None, None, :]
+        hot = (
+            (delta.teacher_occ[d_idx, s_idx, t] > 1)
+            | (delta.room_occ[d_idx, s_idx, r] > 1)
+            | ~ev.qualified[sj, t]
+            | (delta.day_load[t, d_idx] > delta._max_day)
+            | (delta.week_load[t] > delta._max_week)
+            | (ev.lab_mask[sj] & (delta.lab_rows[:, :, None] > 0))
+        )
+        return [tuple(x) for x in np.argwhere(occ & hot).tolist()]  # type: ignore[misc]
+
+    def random_move(
+        self,
+        delta: DeltaFitnessState,
+        hot: list[Cell],
+        kinds: tuple[int, ...] = ALL_MOVES,
+        hot_share: float = 0.5,
+    ) -> list[Write]:
+        """
+        One random move of a type in `kinds`, starting from a hot cell with
+        probability `hot_share`. Returns [] when the drawn move is not possible.
+        """
+        rnd = self.random
+        if hot and rnd.random() < hot_share:
+            c, d, s = rnd.choice(hot)
+        else:
+            c = rnd.randrange(self.num_classes)
+            d = rnd.randrange(self.days)
+            s = rnd.randrange(self.slots)
+        kind = rnd.choice(kinds)
+        if kind == SWAP:
+            return self.swap_move(delta.chrom, c, d, s)
+        if kind == TEACHER:
+            return self.teacher_move(delta, c, d, s)
+        if kind == ROOM:
+            return self.room_move(delta, c, d, s)
+        if kind == LAB_BLOCK:
+            return self.lab_block_move(delta.chrom, c, d, s)
+        return self.hours_move(delta, c)
+
+    def _cell(self, chrom: NDArray[np.int_], c: int, d: int, s: int) -> tuple[int, int, int]:
+        return tuple(int(v) for v in chrom[c, d, s])  # type: ignore[return-value]
+
+    def _pair(self, chrom: NDArray[np.int_], c: int, d: int, s: int) -> list[int]:
+        """
+        Slots of the lab pair containing (c, d, s), or just [s].
+        """
+        gen = self.gen
+        if not gen._is_lab_pair_slot(chrom, c, d, s, self.lab_subjects):
+            return [s]
+        start = gen._lab_pair_start(chrom, c, d, s)
+        return [start, start + 1]
+
+    def swap_move(self, chrom: NDArray[np.int_], c: int, d: int, s: int) -> list[Write]:
+        d2 = self.random.randrange(self.days)
+        s2 = self.random.randrange(self.slots)
+        if (d, s) == (d2, s2):
+            return []
+        if len(self._pair(chrom, c, d, s)) > 1 or len(self._pair(chrom, c, d2, s2)) > 1:
+            return []
+        a, b = self._cell(chrom, c, d, s), self._cell(chrom, c, d2, s2)
+        if a == b:
+            return []
+        return [(c, d, s, b), (c, d2, s2, a)]
+
+    def teacher_move(self, delta: DeltaFitnessState, c: int, d: int, s: int) -> list[Write]:
+        chrom = delta.chrom
+        subj, teacher, room = self._cell(chrom, c, d, s)
+        if subj == -1:
+            return []
+        slots = self._pair(chrom, c, d, s)
+        options = [t for t in self.problem.teacher_pool(subj) if t != teacher]
+        free = [t for t in options if all(delta.teacher_occ[d, ss, t] == 0 for ss in slots)]
+        pool = free or options
+        if not pool:
+            return []
+        new = self.random.choice(pool)
+        return [(c, d, ss, (subj, new, room)) for ss in slots]
+
+    def room_move(self, delta: DeltaFitnessState, c: int, d: int, s: int) -> list[Write]:
+        chrom = delta.chrom
+        subj, teacher, room = self._cell(chrom, c, d, s)
+        if subj == -1 or self.num_rooms < 2:
+            return []
+        slots = self._pair(chrom, c, d, s)
+        busy = np.zeros(self.num_rooms, dtype=bool)
+        for ss in slots:
+            busy |= delta.room_occ[d, ss] > 0
+        free = np.flatnonzero(~busy)
+        if free.size:
+            new = int(self.random.choice(free.tolist()))
+        else:
+            new = self.random.randrange(self.num_rooms - 1)
+            new += new >= room
+        if new == room:
+            return []
+        return [(c, d, ss, (subj, teacher, new)) for ss in slots]
+
+    def lab_block_move(self, chrom: NDArray[np.int_], c: int, d: int, s: int) -> list[Write]:
+        """
+        Swap the lab pair at (c, d, s) with another aligned 2-slot block of
+        the same class that does not cut through a different lab pair.
+        """
+        if self.slots < 2:
+            return []
+        slots = self._pair(chrom, c, d, s)
+        if len(slots) < 2:
+            return []
+        d2 = self.random.randrange(self.days)
+        s2 = self.random.randrange(self.slots - 1)
+        if d2 == d and abs(s2 - slots[0]) < 2:
+            return []
+        first, second = self._pair(chrom, c, d2, s2), self._pair(chrom, c, d2, s2 + 1)
+        if first != [s2] and first != [s2, s2 + 1]:
+            return []
+        if second != [s2 + 1] and second != [s2, s2 + 1]:
+            return []
+        a0, a1 = self._cell(chrom, c, d, slots[0]), self._cell(chrom, c, d, slots[1])
+        b0, b1 = self._cell(chrom, c, d2, s2), self._cell(chrom, c, d2, s2 + 1)
+        return [
+            (c, d, slots[0], b0),
+            (c, d, slots[1], b1),
+            (c, d2, s2, a0),
+            (c, d2, s2 + 1, a1),
+        ]
+
+    def hours_move(self, delta: DeltaFitnessState, c: int) -> list[Write]:
+        """
+        Book one missing hour (a pair for labs) of an under-scheduled subject
+        into free cells of class `c`, or free one booking of the class.
+        Freeing a booking pays off when it is over-scheduled, an odd lab hour
+        or pushes a teacher past the load limits.
+        """
+        rnd = self.random
+        chrom = delta.chrom
+        counts = delta.class_counts[c]
+        under = [s for s, h in self.required.items() if counts[s] < h]
+        if not under or rnd.random() < 0.5:
+            cells = np.argwhere(chrom[c, :, :, 0] != -1).tolist()
+            if not cells:
+                return []
+            d, s = rnd.choice(cells)
+            return [(c, d, ss, EMPTY) for ss in self._pair(chrom, c, d, s)]
+
+        subj = rnd.choice(under)
+        missing = self.required[subj] - int(counts[subj])
+        length = 2 if subj in self.lab_subjects and missing >= 2 else 1
+        free = chrom[c, :, :, 0] == -1
+        if length == 2:
+            free = free[:, :-1] & free[:, 1:]
+        cells = np.argwhere(free).tolist()
+        if not cells:
+            return []
+        d, s = rnd.choice(cells)
+        slots = list(range(s, s + length))
+        teachers = self.problem.teacher_pool(subj)
+        t_free = [
+            t for t in teachers if all(delta.teacher_occ[d, ss, t] == 0 for ss in slots)
+        ]
+        teacher = rnd.choice(t_free or teachers)
+        r_busy = np.zeros(self.num_rooms, dtype=bool)
+        for ss in slots:
+            r_busy |= delta.room_occ[d, ss] > 0
+        r_free = np.flatnonzero(~r_busy).tolist()
+        room = rnd.choice(r_free) if r_free else rnd.randrange(self.num_rooms)
+        return [(c, d, ss, (subj, int(teacher), int(room))) for ss in slots]
+
+
+__all__ = [
+    "ALL_MOVES",
+    "EMPTY",
+    "HOURS",
+    "LAB_BLOCK",
+    "ROOM",
+    "SWAP",
+    "TEACHER",
+    "MoveNeighborhood",
+]
@@ -0,0 +1,138 @@
+"""
+Process-pool execution of the GA's population scoring and offspring production.
+
+`ParallelGAPool` starts a persistent `ProcessPoolExecutor` for the duration of
+one `run_ga` call. The generator (problem definition, lookup tables and GA
+settings) is pickled once per worker through the pool initializer; afterwards
+each task only carries population chunks and RNG seeds.
+
+If the pool cannot be started or breaks mid-run, callers fall back to the
+serial code path (see `TimetableGenerator.run_ga`).
+"""
+
+from __future__ import annotations
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+from .repair import RepairStats
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+# Errors that mean "the pool is unusable; continue serially"
+POOL_ERRORS: tuple[type[BaseException], ...] = (
+    BrokenProcessPool,
+    OSError,
+    PermissionError,
+    NotImplementedError,
+)
+
+_WORKER_GEN: "TimetableGenerator | None" = None
+
+
+def _init_worker(gen: "TimetableGenerator") -> None:
+    global _WORKER_GEN
+    _WORKER_GEN = gen
+
+
+def _worker_gen() -> "TimetableGenerator":
+    if _WORKER_GEN is None:
+        raise RuntimeError("GA worker process was not initialized")
+    return _WORKER_GEN
+
+
+def _score_chunk(chunk: NDArray[np.int_]) -> NDArray[np.float64]:
+    return _worker_gen().fitness_batch(chunk)
+
+
+def _breed_chunk(
+    parents: NDArray[np.int_], count: int, seed: int
+) -> tuple[NDArray[np.int_], RepairStats | None]:
+    gen = _worker_gen()
+    random.seed(seed)
+    gen.rng = np.random.default_rng(seed)
+    if gen.repairer is not None:
+        gen.repairer.stats = RepairStats()
+    children = np.empty((count, *parents.shape[1:]), dtype=parents.dtype)
+    gen.breed_local(parents, np.arange(len(parents)), children)
+    stats = gen.repairer.stats if gen.repairer is not None else None
+    return children, stats
+
+
+class ParallelGAPool:
+    """
+    Persistent worker pool bound to one generator for one GA run.
+    """
+
+    def __init__(self, gen: "TimetableGenerator", workers: int):
+        self.workers = max(1, int(workers))
+        # Repair counters from workers are merged into the parent's repairer
+        self.gen_repairer = gen.repairer
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(gen,),
+        )
+
+    def __enter__(self) -> "ParallelGAPool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def score(self, pop: NDArray[np.int_]) -> NDArray[np.float64]:
+        """
+        Score a stacked population, one contiguous chunk per worker.
+        """
+        chunks = [c for c in np.array_split(pop, self.workers) if len(c)]
+        return np.concatenate(list(self._executor.map(_score_chunk, chunks)))
+
+    def breed(self, parents: NDArray[np.int_], out: NDArray[np.int_]) -> None:
+        """
+        Fill `out` with children of the stacked `parents` via crossover +
+        mutation across the workers. Seeds are drawn from the caller's
+        `random` stream for reproducibility.
+        """
+        per_worker = [len(c) for c in np.array_split(np.arange(len(out)), self.workers)]
+        futures = [
+            self._executor.submit(_breed_chunk, parents, n, random.getrandbits(63))
+            for n in per_worker
+            if n
+        ]
+        start = 0
+        for fut in futures:
+            chunk, stats = fut.result()
+            out[start : start + len(chunk)] = chunk
+            start += len(chunk)
+            if stats is not None and self.gen_repairer is not None:
+                self.gen_repairer.stats.merge(stats)
+
+
+def start_pool(gen: "TimetableGenerator", workers: int) -> ParallelGAPool | None:
+    """
+    Start a worker pool, or return None (serial execution) when `workers`
+    is 1 or process pools are unavailable on this platform.
+    """
+    if workers <= 1:
+        return None
+    try:
+        return ParallelGAPool(gen, workers)
+    except POOL_ERRORS as exc:
+        log.warning("Process pool unavailable (%s); running GA serially", exc)
+        return None
+
+
+__all__ = ["ParallelGAPool", "POOL_ERRORS", "start_pool"]
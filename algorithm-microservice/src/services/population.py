@@ -0,0 +1,114 @@
+"""
+Compact chromosome storage for the GA.
+
+Chromosome fields (subject, teacher, room) are stored as int16 instead of the
+platform int (int64): 6 bytes per cell instead of 24. Free cells keep -1, so
+every index fits as long as the problem has fewer than 32768 subjects,
+teachers and rooms; larger problems fall back to int32 (see `gene_dtype`).
+
+`PopulationBuffer` keeps a whole population in one contiguous block of shape
+(2, P, C, D, S, 3): generation k lives in one half, generation k + 1 is
+written into the other and `swap` flips the roles. Individuals are views into
+the block, so scoring a population needs no `np.stack` and turning over a
+generation allocates nothing.
+
+The per-cell (subject, teacher, room) layout is kept (rather than separate
+subject/teacher/room planes) because every operator, the fitness evaluators
+and the API views index chromosomes as (C, D, S, 3).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+if TYPE_CHECKING:
+    from .problem import ProblemInstance
+
+GENE_DTYPE = np.int16
+
+# A trusted chromosome: a (C, D, S, 3) array of the problem's gene dtype with
+# -1 in free cells and in-range subject/teacher/room indices elsewhere.
+# Everything the generator and its operators build is trusted and scored in
+# place; external timetables go through `normalize_chromosome` first.
+Chromosome: TypeAlias = NDArray[Any]
+
+
+def gene_dtype(problem: "ProblemInstance") -> np.dtype:
+    """
+    Smallest signed integer dtype (int16 or wider) holding every subject,
+    teacher and room index of `problem`.
+    """
+    largest = max(problem.num_subjects, problem.num_teachers, problem.num_rooms)
+    if largest <= np.iinfo(GENE_DTYPE).max:
+        return np.dtype(GENE_DTYPE)
+    return np.dtype(np.int32)
+
+
+class PopulationBuffer:
+    """
+    Double-buffered, contiguous storage for a population of chromosomes.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        shape: tuple[int, int, int],
+        dtype: DTypeLike = GENE_DTYPE,
+    ):
+        C, D, S = shape
+        self._data = np.full((2, size, C, D, S, 3), -1, dtype=dtype)
+        self._front = 0
+
+    @classmethod
+    def for_problem(cls, problem: "ProblemInstance", size: int) -> "PopulationBuffer":
+        return cls(
+            size,
+            (problem.num_classes, problem.days, problem.slots),
+            gene_dtype(problem),
+        )
+
+    @property
+    def size(self) -> int:
+        return int(self._data.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._data.nbytes)
+
+    @property
+    def current(self) -> NDArray[np.int_]:
+        """
+        The live generation, shape (P, C, D, S, 3).
+        """
+        return self._data[self._front]
+
+    @property
+    def spare(self) -> NDArray[np.int_]:
+        """
+        The buffer the next generation is written into.
+        """
+        return self._data[1 - self._front]
+
+    def swap(self) -> None:
+        """
+        Make the spare buffer the live generation.
+        """
+        self._front = 1 - self._front
+
+    def load(self, chromosomes: Iterable[NDArray[np.int_]]) -> int:
+        """
+        Copy `chromosomes` into the live generation; returns how many were
+        loaded. Rows past the last one keep their previous content.
+        """
+        current = self.current
+        n = 0
+        for n, chrom in enumerate(chromosomes, start=1):
+            current[n - 1] = chrom
+        return n
+
+
+__all__ = ["Chromosome", "GENE_DTYPE", "PopulationBuffer", "gene_dtype"]
@@ -0,0 +1,315 @@
+"""
+Parallel solver portfolio.
+
+`PortfolioSolver` races several solver configurations on the same problem,
+each in its own process. A configuration is a dict of `TimetableRequest`
+field overrides, e.g. ``{"solver": "tabu"}`` or
+``{"solver": "ga", "mutation_rate": 0.05, "seed": 7}``; `DEFAULT_PORTFOLIO`
+is used when the request does not specify one.
+
+Every member runs with `target_fitness=0` (unless overridden) and the shared
+time budget. The race ends as soon as one member returns a zero-penalty
+timetable, or when the deadline has passed and the members have reported
+their anytime results, or when all members finished; a cancelled race waits
+CANCEL_GRACE_S for members that stop on the shared cancel token. The best
+result wins; members still running are terminated. The winning configuration and a
+summary of every member are recorded in the run report.
+
+When processes cannot be started, members run one after another in the
+current process, stopping at the first zero-penalty result.
+
+Progress events of the member holding the best fitness so far are passed on
+to the portfolio generator's listener, tagged with the member index.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+import random
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+from ..models.request_models import TimetableRequest
+from .report import GARunReport
+from .termination import STOP_CANCELLED, STOP_COMPLETED, STOP_DEADLINE, STOP_TARGET
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+DEFAULT_PORTFOLIO: tuple[dict[str, Any], ...] = (
+    {"solver": "ga"},
+    {"solver": "ga", "memetic": True, "seed": 7},
+    {"solver": "ga", "mutation_rate": 0.05, "seed": 11},
+    {"solver": "tabu"},
+    {"solver": "backtracking"},
+)
+
+# Seconds to wait past the deadline for members' anytime results
+RESULT_GRACE_S = 5.0
+# Seconds to wait after cancellation for members that share the cancel token
+CANCEL_GRACE_S = 1.0
+
+
+@dataclass
+class MemberResult:
+    """
+    Outcome of one portfolio member.
+    """
+
+    index: int
+    config: dict[str, Any]
+    best: NDArray[np.int_] | None = None
+    score: float = float("-inf")
+    report: GARunReport | None = None
+    error: str | None = None
+    elapsed_ms: float = 0.0
+
+    def summary(self, status: str) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "config": self.config,
+            "status": status if self.error is None else "failed",
+            "score": self.score if self.best is not None else None,
+            "elapsed_ms": self.elapsed_ms,
+            "error": self.error,
+        }
+
+
+@dataclass
+class MemberProgress:
+    """
+    A progress event of one member, sent to the coordinating process.
+    """
+
+    index: int
+    event: dict[str, Any]
+
+
+def _solve_member(
+    gen: "TimetableGenerator",
+    index: int,
+    overrides: dict[str, Any],
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+) -> MemberResult:
+    started = time.perf_counter()
+    result = MemberResult(index=index, config=overrides)
+    try:
+        member = gen.with_config(**overrides)
+        member.on_progress = on_progress
+        random.seed(member.seed)
+        result.best, result.score = member.solve()
+        result.report = member.last_report
+    except Exception as exc:  # a failing member must not sink the race
+        log.warning("Portfolio member %d (%s) failed: %s", index, overrides, exc)
+        result.error = str(exc)
+    result.elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return result
+
+
+def _post_progress(results: Any, index: int, event: dict[str, Any]) -> None:
+    results.put(MemberProgress(index, event))
+
+
+def _member_process(
+    gen: "TimetableGenerator",
+    index: int,
+    overrides: dict[str, Any],
+    results: Any,
+    send_progress: bool = False,
+) -> None:
+    on_progress = partial(_post_progress, results, index) if send_progress else None
+    results.put(_solve_member(gen, index, overrides, on_progress))
+
+
+class PortfolioSolver:
+    """
+    Race solver configurations for `gen`'s problem and keep the best result.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        entries = gen.PORTFOLIO or [dict(e) for e in DEFAULT_PORTFOLIO]
+        known = set(TimetableRequest.model_fields)
+        self.configs: list[dict[str, Any]] = []
+        for entry in entries:
+            unknown = set(entry) - known
+            if unknown:
+                raise ValueError(f"Unknown portfolio fields: {sorted(unknown)}")
+            if entry.get("solver") == "portfolio":
+                raise ValueError("Portfolio members cannot be portfolios")
+            overrides = dict(entry)
+            overrides.setdefault("solver", "ga")
+            if gen.TARGET_FITNESS is None:
+                overrides.setdefault("target_fitness", 0.0)
+            self.configs.append(overrides)
+        if not self.configs:
+            raise ValueError("Portfolio needs at least one configuration")
+        self.leader: int | None = None
+        self.leader_score = float("-inf")
+
+    def _member_progress(self, index: int, event: dict[str, Any]) -> None:
+        """
+        Pass on `event` when its member leads the race, so the reported best
+        fitness never goes backwards.
+        """
+        score = float(event["best_fitness"])
+        if index != self.leader and score <= self.leader_score:
+            return
+        self.leader = index
+        self.leader_score = max(self.leader_score, score)
+        self.gen.forward_progress({**event, "member": index})
+
+    def _with_budget(self, overrides: dict[str, Any]) -> dict[str, Any]:
+        """
+        Member overrides with the time left until the shared deadline.
+        """
+        deadline = self.gen.deadline_at
+        if deadline is None or "time_budget_ms" in overrides:
+            return overrides
+        remaining_ms = max(1, int((deadline - time.time()) * 1000))
+        return {**overrides, "time_budget_ms": remaining_ms}
+
+    def run(self) -> tuple[NDArray[np.int_], float]:
+        log.info(
+            "Starting portfolio: %d members, deadline=%s",
+            len(self.configs),
+            self.gen.TIME_BUDGET_MS,
+        )
+        started = time.perf_counter()
+        results: list[MemberResult] | None = None
+        if len(self.configs) > 1:
+            try:
+                results = self._run_processes()
+            except (OSError, PermissionError, NotImplementedError) as exc:
+                log.warning("Portfolio processes unavailable (%s); running serially", exc)
+        if results is None:
+            results = self._run_serial()
+
+        finished = [r for r in results if r.best is not None]
+        if not finished:
+            errors = "; ".join(r.error or "no result" for r in results)
+            raise RuntimeError(f"No portfolio member produced a timetable: {errors}")
+        winner = max(finished, key=lambda r: (r.score, -r.elapsed_ms))
+        assert winner.best is not None
+
+        report = winner.report or GARunReport()
+        report.solver = f"portfolio:{report.solver}"
+        report.winner_config = winner.config
+        reported = {r.index for r in results}
+        summaries = [
+            r.summary("winner" if r is winner else "finished") for r in results
+        ] + [
+            MemberResult(index=i, config=c).summary("cancelled")
+            for i, c in enumerate(self.configs)
+            if i not in reported
+        ]
+        report.portfolio = sorted(summaries, key=lambda s: s["index"])
+        token = self.gen.cancel_token
+        if winner.score >= 0.0:
+            report.stop_reason = STOP_TARGET
+        elif token is not None and token.cancelled:
+            report.stop_reason = STOP_CANCELLED
+        elif self.gen.deadline_at is not None and time.time() >= self.gen.deadline_at:
+            report.stop_reason = STOP_DEADLINE
+        elif report.stop_reason == STOP_TARGET:
+            report.stop_reason = STOP_COMPLETED
+        report.best_fitness = winner.score
+        report.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.gen.report_progress(
+            report.generations,
+            winner.best,
+            winner.score,
+            started,
+            force=True,
+            member=winner.index,
+        )
+        self.gen.last_report = report
+        log.info("Portfolio winner: member %d %s", winner.index, winner.config)
+        return winner.best, winner.score
+
+    def _run_processes(self) -> list[MemberResult]:
+        ctx = mp.get_context()
+        results_q = ctx.Queue()
+        procs = [
+            ctx.Process(
+                target=_member_process,
+                args=(
+                    self.gen,
+                    i,
+                    self._with_budget(c),
+                    results_q,
+                    self.gen.on_progress is not None,
+                ),
+                daemon=False,  # members may start their own pools
+            )
+            for i, c in enumerate(self.configs)
+        ]
+        for p in procs:
+            p.start()
+
+        deadline = self.gen.deadline_at
+        token = self.gen.cancel_token
+        cancelled_at: float | None = None
+        results: list[MemberResult] = []
+        try:
+            while len(results) < len(procs):
+                if deadline is not None and time.time() > deadline + RESULT_GRACE_S:
+                    break
+                if cancelled_at is None and token is not None and token.cancelled:
+                    cancelled_at = time.time()
+                if cancelled_at is not None:
+                    if time.time() > cancelled_at + CANCEL_GRACE_S:
+                        break
+                try:
+                    res: MemberResult | MemberProgress = results_q.get(timeout=0.1)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in procs) and results_q.empty():
+                        break
+                    continue
+                if isinstance(res, MemberProgress):
+                    self._member_progress(res.index, res.event)
+                    continue
+                res.config = self.configs[res.index]
+                results.append(res)
+                if res.best is not None and res.score >= 0.0:
+                    break  # zero penalty: nothing can beat it
+        finally:
+            for p in procs:
+                if p.is_alive():
+                    p.terminate()
+            for p in procs:
+                p.join(timeout=5.0)
+        return results
+
+    def _run_serial(self) -> list[MemberResult]:
+        results: list[MemberResult] = []
+        token = self.gen.cancel_token
+        for i, c in enumerate(self.configs):
+            if self.gen.deadline_at is not None and time.time() >= self.gen.deadline_at:
+                break
+            if token is not None and token.cancelled:
+                break
+            on_progress = (
+                partial(self._member_progress, i)
+                if self.gen.on_progress is not None
+                else None
+            )
+            res = _solve_member(self.gen, i, self._with_budget(c), on_progress)
+            res.config = c
+            results.append(res)
+            if res.best is not None and res.score >= 0.0:
+                break
+        return results
+
+
+__all__ = ["DEFAULT_PORTFOLIO", "MemberProgress", "MemberResult", "PortfolioSolver"]
@@ -0,0 +1,163 @@
+"""
+Compiled, immutable problem instance.
+
+`TimetableGenerator` receives its problem definition as Python containers
+(SUBJECT_TEACHERS lists, LAB_SUBJECTS set, SUBJECT_HOURS dict). Looking
+constraints up in those per cell is slow, so `ProblemInstance.from_generator`
+compiles them once into dense tables:
+
+- qualified:          bool (num_subjects, num_teachers) qualification matrix
+- lab_mask:           bool (num_subjects,) lab subjects
+- required_hours:     int64 (num_subjects,) weekly hours per class (0 = none)
+- has_required:       bool (num_subjects,) subject appears in SUBJECT_HOURS
+- hour_subjects/hour_targets: SUBJECT_HOURS as parallel arrays, in dict order
+- qualified_teachers: per subject, the qualified teacher ids (sorted tuple)
+- pool_table/pool_size: per subject, the teachers to draw from (qualified, or
+  every teacher when none is) padded into a table: pool_table[s, :pool_size[s]]
+- teacher limits, dimensions, lab_subjects and subject_ids for Python paths
+
+Subject-indexed tables cover every subject id the definition mentions, so
+they may be longer than NUM_SUBJECTS. Arrays are read-only; the instance is a
+frozen dataclass and pickles cheaply for worker processes. Fitness, mutation,
+initialization, repair and every search engine read from the same instance.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+
+def _frozen(arr: NDArray) -> NDArray:
+    arr.setflags(write=False)
+    return arr
+
+
+@dataclass(frozen=True)
+class ProblemInstance:
+    num_classes: int
+    days: int
+    slots: int
+    num_teachers: int
+    num_rooms: int
+    num_subjects: int
+    max_per_day: int
+    max_per_week: int
+    qualified: NDArray[np.bool_]
+    lab_mask: NDArray[np.bool_]
+    required_hours: NDArray[np.int64]
+    has_required: NDArray[np.bool_]
+    hour_subjects: NDArray[np.int64]
+    hour_targets: NDArray[np.int64]
+    qualified_teachers: tuple[tuple[int, ...], ...]
+    pool_table: NDArray[np.int64]
+    pool_size: NDArray[np.int64]
+    lab_subjects: frozenset[int]
+    # SUBJECT_HOURS keys in dict order (mutation draws subjects from these)
+    subject_ids: tuple[int, ...]
+
+    @classmethod
+    def from_generator(cls, gen: "TimetableGenerator") -> "ProblemInstance":
+        T = gen.TOTAL_TEACHERS
+        subject_keys = (
+            list(gen.SUBJECT_HOURS) + list(gen.SUBJECT_TEACHERS) + list(gen.LAB_SUBJECTS)
+        )
+        n_subj = max([gen.NUM_SUBJECTS] + [int(k) + 1 for k in subject_keys])
+
+        qualified = np.zeros((n_subj, T), dtype=bool)
+        for subj, teachers in gen.SUBJECT_TEACHERS.items():
+            if int(subj) < 0:
+                continue
+            for t in teachers:
+                if 0 <= int(t) < T:
+                    qualified[int(subj), int(t)] = True
+
+        lab_mask = np.zeros(n_subj, dtype=bool)
+        for subj in gen.LAB_SUBJECTS:
+            if int(subj) >= 0:
+                lab_mask[int(subj)] = True
+
+        hours = [(int(k), int(v)) for k, v in gen.SUBJECT_HOURS.items() if int(k) >= 0]
+        hour_subjects = np.array([k for k, _ in hours], dtype=np.int64)
+        hour_targets = np.array([v for _, v in hours], dtype=np.int64)
+        required = np.zeros(n_subj, dtype=np.int64)
+        has_required = np.zeros(n_subj, dtype=bool)
+        required[hour_subjects] = hour_targets
+        has_required[hour_subjects] = True
+
+        qualified_teachers = tuple(
+            tuple(int(t) for t in np.flatnonzero(row)) for row in qualified
+        )
+        pools = [q or tuple(range(T)) for q in qualified_teachers]
+        pool_table = np.zeros((n_subj, max(1, T)), dtype=np.int64)
+        pool_size = np.zeros(n_subj, dtype=np.int64)
+        for s, pool in enumerate(pools):
+            pool_table[s, : len(pool)] = pool
+            pool_size[s] = len(pool)
+
+        return cls(
+            num_classes=gen.NUM_CLASSES,
+            days=gen.DAYS,
+            slots=gen.SLOTS_PER_DAY,
+            num_teachers=T,
+            num_rooms=gen.TOTAL_ROOMS,
+            num_subjects=n_subj,
+            max_per_day=gen.MAX_HOURS_PER_DAY,
+            max_per_week=gen.MAX_HOURS_PER_WEEK,
+            qualified=_frozen(qualified),
+            lab_mask=_frozen(lab_mask),
+            required_hours=_frozen(required),
+            has_required=_frozen(has_required),
+            hour_subjects=_frozen(hour_subjects),
+            hour_targets=_frozen(hour_targets),
+            qualified_teachers=qualified_teachers,
+            pool_table=_frozen(pool_table),
+            pool_size=_frozen(pool_size),
+            lab_subjects=frozenset(int(s) for s in np.flatnonzero(lab_mask)),
+            subject_ids=tuple(int(k) for k in gen.SUBJECT_HOURS),
+        )
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        # Keep arrays read-only across pickling (worker processes)
+        for value in state.values():
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+        self.__dict__.update(state)
+
+    def is_lab(self, subj: int) -> bool:
+        return subj in self.lab_subjects
+
+    def teachers_for(self, subj: int) -> tuple[int, ...]:
+        """
+        Qualified teachers of `subj` (empty for unknown subjects).
+        """
+        if 0 <= subj < self.num_subjects:
+            return self.qualified_teachers[subj]
+        return ()
+
+    def teacher_pool(self, subj: int) -> tuple[int, ...]:
+        """
+        Teachers to assign `subj` to: the qualified ones, or everybody when
+        the subject has no qualified teacher.
+        """
+        return self.teachers_for(subj) or tuple(range(self.num_teachers))
+
+    def sample_teachers(
+        self, subj: NDArray[np.int64], u: NDArray[np.float64]
+    ) -> NDArray[np.int64]:
+        """
+        Vectorized draw from `teacher_pool`: one teacher per subject in
+        `subj`, picked by the uniform [0, 1) numbers in `u`.
+        """
+        size = self.pool_size[subj]
+        pick = np.minimum((u * size).astype(np.int64), size - 1)
+        return self.pool_table[subj, pick]
+
+
+__all__ = ["ProblemInstance"]
@@ -0,0 +1,160 @@
+"""
+Vectorized random initialization of whole populations.
+
+`RandomInitializer` builds the "random" initializer's timetables for every
+(individual, class) row of a population at once:
+
+1. Each class needs the same lessons, expanded from SUBJECT_HOURS once: one
+   2-slot pair per two hours of a lab subject, single hours for lectures and
+   odd lab hours. Every row gets its own shuffle of both lists (argsort of
+   random keys).
+2. Lab pairs are placed round by round. Every row ranks the candidate pair
+   starts (day, slot) in a random order once, and in round k each row takes
+   its best-ranked start whose two cells are still free. Pairs without a free
+   start are left out.
+3. Single hours fill the remaining free cells of each row in day/slot order,
+   truncated when the row runs out of cells.
+
+Teachers are drawn from each subject's qualified pool (every teacher when a
+subject has none) and rooms uniformly, all with the generator's NumPy RNG.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+
+class RandomInitializer:
+    """
+    Batched equivalent of `TimetableGenerator.generate_random_timetable`.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        self.problem = problem = gen.problem
+        self.num_classes = problem.num_classes
+        self.days = problem.days
+        self.slots = problem.slots
+        self.num_rooms = problem.num_rooms
+        self.dtype = gen.GENE_DTYPE
+
+        pairs: list[int] = []
+        singles: list[int] = []
+        for subj, hrs in gen.SUBJECT_HOURS.items():
+            subj, hrs = int(subj), int(hrs)
+            if subj < 0 or subj >= gen.NUM_SUBJECTS or hrs <= 0:
+                continue
+            if problem.is_lab(subj):
+                # A day with a single slot cannot hold a pair; those are dropped
+                if self.slots >= 2:
+                    pairs += [subj] * (hrs // 2)
+                singles += [subj] * (hrs % 2)
+            else:
+                singles += [subj] * hrs
+        self.pairs = np.array(pairs, dtype=np.int64)
+        self.singles = np.array(singles, dtype=np.int64)
+
+        required = len(singles) + 2 * len(pairs)
+        available = self.days * self.slots
+        if required != available:
+            log.debug(
+                "Each class needs %d slots of %d available; %s",
+                required,
+                available,
+                "leaving the rest empty" if required < available else "truncating",
+            )
+
+    def generate(self, size: int) -> NDArray[np.int_]:
+        """
+        A fresh (size, C, D, S, 3) population.
+        """
+        C, D, S = self.num_classes, self.days, self.slots
+        out = np.full((size * C, D * S, 3), -1, dtype=self.dtype)
+        self.fill(out)
+        return out.reshape(size, C, D, S, 3)
+
+    def fill(self, rows: NDArray[np.int_]) -> None:
+        """
+        Fill an (M, D * S, 3) array of empty class rows in place.
+        """
+        M = len(rows)
+        if M == 0:
+            return
+        rng = self.gen.rng
+        occupied = np.zeros((M, self.days * self.slots), dtype=bool)
+        if len(self.pairs):
+            self._place_pairs(rows, occupied, rng)
+        if len(self.singles):
+            self._place_singles(rows, occupied, rng)
+
+    def _shuffled(
+        self, lessons: NDArray[np.int64], M: int, rng: np.random.Generator
+    ) -> NDArray[np.int64]:
+        order = np.argsort(rng.random((M, len(lessons))), axis=1)
+        return lessons[order]
+
+    def _cells(
+        self, subj: NDArray[np.int64], rng: np.random.Generator
+    ) -> NDArray[np.int64]:
+        """
+        [subject, teacher, room] triples for a flat array of subjects.
+        """
+        u = rng.random((2, len(subj)))
+        teacher = self.problem.sample_teachers(subj, u[0])
+        room = (u[1] * self.num_rooms).astype(np.int64)
+        np.minimum(room, self.num_rooms - 1, out=room)
+        return np.stack([subj, teacher, room], axis=1)
+
+    def _place_pairs(
+        self,
+        rows: NDArray[np.int_],
+        occupied: NDArray[np.bool_],
+        rng: np.random.Generator,
+    ) -> None:
+        M, D, S = len(rows), self.days, self.slots
+        subj = self._shuffled(self.pairs, M, rng)
+        cells = self._cells(subj.ravel(), rng).reshape(M, len(self.pairs), 3)
+        # Random rank of every candidate start, shared by all rounds of a row
+        keys = rng.random((M, D, S - 1))
+        at = np.arange(M)
+        occ = occupied.reshape(M, D, S)
+        for k in range(len(self.pairs)):
+            free = ~occ[:, :, :-1] & ~occ[:, :, 1:]
+            ranked = np.where(free, keys, -1.0).reshape(M, -1)
+            best = ranked.argmax(axis=1)
+            ok = ranked[at, best] >= 0.0
+            if not ok.any():
+                break
+            r = at[ok]
+            d, s = np.divmod(best[ok], S - 1)
+            start = d * S + s
+            rows[r, start] = cells[r, k]
+            rows[r, start + 1] = cells[r, k]
+            occupied[r, start] = True
+            occupied[r, start + 1] = True
+
+    def _place_singles(
+        self,
+        rows: NDArray[np.int_],
+        occupied: NDArray[np.bool_],
+        rng: np.random.Generator,
+    ) -> None:
+        M = len(rows)
+        subj = self._shuffled(self.singles, M, rng)
+        free = ~occupied
+        rank = np.cumsum(free, axis=1) - 1
+        r, cell = np.nonzero(free & (rank < len(self.singles)))
+        rows[r, cell] = self._cells(subj[r, rank[r, cell]], rng)
+
+
+__all__ = ["RandomInitializer"]
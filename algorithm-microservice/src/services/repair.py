@@ -0,0 +1,156 @@
+"""
+Clash repair for GA offspring.
+
+`crossover` splices whole classes from two parents and `mutate` assigns random
+teachers and rooms, so children routinely double-book a teacher or room in
+some (day, slot). `ClashRepair` walks the slots that contain a clash and moves
+every booking after the first to a free qualified teacher (or a free room)
+for that slot.
+
+Per-slot occupancy is kept as integer bitmaps (bit i set = teacher/room i is
+busy). Lab pairs are repaired as a block: both slots get the same new teacher
+or room, and it must be free in both. Bookings that cannot be moved are left
+alone and counted as unresolved.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+TEACHER = 1
+ROOM = 2
+
+
+@dataclass
+class RepairStats:
+    children: int = 0
+    repaired_children: int = 0
+    reassigned_cells: int = 0
+    unresolved: int = 0
+
+    def merge(self, other: "RepairStats") -> None:
+        self.children += other.children
+        self.repaired_children += other.repaired_children
+        self.reassigned_cells += other.reassigned_cells
+        self.unresolved += other.unresolved
+
+    @property
+    def repair_rate(self) -> float:
+        return self.repaired_children / self.children if self.children else 0.0
+
+
+class ClashRepair:
+    """
+    Reassign clashing teachers/rooms in place using per-slot bitmaps.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.num_teachers = gen.TOTAL_TEACHERS
+        self.num_rooms = gen.TOTAL_ROOMS
+        self.problem = gen.problem
+        self.lab_subjects = gen.problem.lab_subjects
+        self.every_room = list(range(self.num_rooms))
+        self.stats = RepairStats()
+
+    def _clash_slots(self, chrom: NDArray[np.int_]) -> list[tuple[int, int]]:
+        """
+        (day, slot) pairs holding at least one teacher or room clash.
+        """
+        C, D, S, _ = chrom.shape
+        occ = chrom[..., 0] != -1
+        _, d_idx, s_idx = np.nonzero(occ)
+        slot = d_idx * S + s_idx
+        clashing: set[int] = set()
+        for field, size in ((TEACHER, self.num_teachers), (ROOM, self.num_rooms)):
+            keys = slot * size + chrom[..., field][occ]
+            counts = np.bincount(keys, minlength=D * S * size)
+            clashing.update((np.flatnonzero(counts > 1) // size).tolist())
+        return [divmod(k, S) for k in sorted(clashing)]
+
+    @staticmethod
+    def _mask(chrom: NDArray[np.int_], d: int, s: int, field: int) -> int:
+        mask = 0
+        col = chrom[:, d, s]
+        for v in col[col[:, 0] != -1, field].tolist():
+            mask |= 1 << v
+        return mask
+
+    def _partner(self, chrom: NDArray[np.int_], c: int, d: int, s: int) -> int | None:
+        """
+        Slot of the other half of the lab pair containing (c, d, s), if any.
+        """
+        cell = chrom[c, d, s]
+        if int(cell[0]) not in self.lab_subjects:
+            return None
+        S = chrom.shape[2]
+        for p in (s - 1, s + 1):
+            if 0 <= p < S and (chrom[c, d, p] == cell).all():
+                return p
+        return None
+
+    def repair(self, chrom: NDArray[np.int_]) -> int:
+        """
+        Repair `chrom` in place; returns the number of reassigned cells.
+        """
+        changed = 0
+        unresolved = 0
+        masks: dict[tuple[int, int, int], int] = {}
+
+        def mask(d: int, s: int, field: int) -> int:
+            key = (d, s, field)
+            if key not in masks:
+                masks[key] = self._mask(chrom, d, s, field)
+            return masks[key]
+
+        for d, s in self._clash_slots(chrom):
+            for field in (TEACHER, ROOM):
+                seen = 0
+                for c in range(chrom.shape[0]):
+                    subj = int(chrom[c, d, s, 0])
+                    if subj == -1:
+                        continue
+                    value = int(chrom[c, d, s, field])
+                    if not (seen >> value) & 1:
+                        seen |= 1 << value
+                        continue
+
+                    # Clash: find a value free in this slot (and the pair's partner)
+                    partner = self._partner(chrom, c, d, s)
+                    busy = mask(d, s, field)
+                    if partner is not None:
+                        busy |= mask(d, partner, field)
+                    pool = (
+                        self.problem.teacher_pool(subj)
+                        if field == TEACHER
+                        else self.every_room
+                    )
+                    free = [v for v in pool if not (busy >> v) & 1]
+                    if not free:
+                        unresolved += 1
+                        seen |= 1 << value
+                        continue
+                    new = random.choice(free)
+                    slots = [s] if partner is None else [s, partner]
+                    for ss in slots:
+                        chrom[c, d, ss, field] = new
+                        masks[(d, ss, field)] = self._mask(chrom, d, ss, field)
+                        changed += 1
+                    seen |= 1 << new
+
+        self.stats.children += 1
+        self.stats.reassigned_cells += changed
+        self.stats.unresolved += unresolved
+        if changed:
+            self.stats.repaired_children += 1
+        return changed
+
+
+__all__ = ["ClashRepair", "RepairStats"]
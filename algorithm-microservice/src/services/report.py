@@ -0,0 +1,56 @@
+"""
+Run report for solver executions.
+
+A `GARunReport` is filled in by `TimetableGenerator.run_ga` and kept on the
+generator as `last_report`, so routes and logs can surface how a run went
+without changing the `(best, score)` return contract.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .repair import RepairStats
+
+
+@dataclass
+class GARunReport:
+    solver: str = "ga"
+    # Set when this run replaced a solver that gave up, e.g. "backtracking (node_limit)"
+    fallback_from: str | None = None
+    generations: int = 0
+    best_fitness: float = float("-inf")
+    stop_reason: str = "completed"
+    evaluations: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_size: int = 0
+    elapsed_ms: float = 0.0
+    workers: int = 1
+    islands: int = 1
+    migrations: int = 0
+    reheats: int = 0
+    repaired_children: int = 0
+    repaired_cells: int = 0
+    repair_unresolved: int = 0
+    repair_rate: float = 0.0
+    # Memetic polishing rounds: generation, elites, improved, gain, evaluations, ms
+    local_search: list[dict[str, float]] = field(default_factory=list)
+    local_search_gain: float = 0.0
+    # Portfolio runs: overrides of the winning member and a summary per member
+    winner_config: dict[str, Any] | None = None
+    portfolio: list[dict[str, Any]] = field(default_factory=list)
+
+    def add_repair_stats(self, stats: "RepairStats") -> None:
+        self.repaired_children += stats.repaired_children
+        self.repaired_cells += stats.reassigned_cells
+        self.repair_unresolved += stats.unresolved
+        self.repair_rate = stats.repair_rate
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+__all__ = ["GARunReport"]
@@ -0,0 +1,145 @@
+"""
+Tabu search engine for the timetable problem.
+
+`TabuSearch` improves a single timetable built by the generator's initializer
+and scores it with the same penalties as the GA (`fitness.PENALTY_WEIGHTS`).
+Every candidate move is evaluated incrementally on a `DeltaFitnessState`:
+its cell writes are applied, the score is read and the writes are rolled back.
+
+Each iteration samples `tabu_neighborhood` candidate moves from
+`neighborhood.MoveNeighborhood` (slot swaps, teacher/room reassignment,
+lab-block moves and hour add/remove moves, biased towards violating cells).
+
+The best non-tabu candidate is applied each iteration. Tabu attributes are
+(cell, previous value): a cell may not get back a value it held within the
+last `tabu_tenure` iterations, unless the move yields a new overall best
+(aspiration).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.utils import get_logger
+
+from .delta import DeltaFitnessState
+from .neighborhood import MoveNeighborhood, Write
+from .report import GARunReport
+from .termination import STOP_COMPLETED, ConvergenceMonitor
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+log = get_logger(__name__)
+
+
+class TabuSearch:
+    """
+    Single-solution tabu search over `gen`'s problem definition.
+    """
+
+    def __init__(self, gen: "TimetableGenerator"):
+        self.gen = gen
+        self.iterations = gen.TABU_ITERATIONS
+        self.tenure = gen.TABU_TENURE
+        self.sample_size = gen.TABU_NEIGHBORHOOD
+        self.random = random.Random(gen.seed)
+        self.moves = MoveNeighborhood(gen, self.random)
+        self.tabu: dict[tuple[int, int, int, tuple[int, int, int]], int] = {}
+        self.evaluations = 0
+
+    # ---------------------------
+    # Driver
+    # ---------------------------
+    def run(self) -> tuple[NDArray[np.int_], float]:
+        gen = self.gen
+        log.info(
+            "Starting tabu search: iterations=%d, tenure=%d, neighborhood=%d",
+            self.iterations,
+            self.tenure,
+            self.sample_size,
+        )
+        started = time.perf_counter()
+        report = GARunReport(solver="tabu")
+        monitor = ConvergenceMonitor.from_generator(gen)
+        start = gen.initial_population(1, monitor)[0]
+        delta = DeltaFitnessState.from_generator(gen, start.copy())
+        best = delta.chrom.copy()
+        best_score = delta.score
+        self.evaluations = 1
+
+        for it in range(self.iterations):
+            if monitor.update(best_score):
+                break
+            move = self.step(delta, it, best_score)
+            if move is None:
+                continue
+            report.generations += 1
+            if delta.score > best_score:
+                best, best_score = delta.chrom.copy(), delta.score
+            if it % 256 == 255:
+                self.tabu = {k: v for k, v in self.tabu.items() if v > it}
+            gen.report_progress(report.generations, best, best_score, started)
+        else:
+            monitor.update(best_score)
+        gen.report_progress(report.generations, best, best_score, started, force=True)
+
+        report.best_fitness = best_score
+        report.stop_reason = monitor.stop_reason or STOP_COMPLETED
+        report.evaluations = self.evaluations
+        report.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        gen.last_report = report
+        log.info("Tabu search finished: %s", report.as_dict())
+        return best, best_score
+
+    def step(
+        self, delta: DeltaFitnessState, it: int, best_score: float
+    ) -> list[Write] | None:
+        """
+        Sample the neighborhood, apply the best admissible move and make its
+        reverse tabu. Returns the applied writes (None if nothing admissible).
+        """
+        hot = self.moves.hot_cells(delta)
+        chosen: list[Write] | None = None
+        chosen_score = float("-inf")
+        for _ in range(self.sample_size):
+            writes = self.moves.random_move(delta, hot)
+            if not writes:
+                continue
+            score = self.evaluate(delta, writes)
+            if self.is_tabu(writes, it) and score <= best_score:
+                continue  # tabu, and no aspiration
+            if score > chosen_score:
+                chosen, chosen_score = writes, score
+        if chosen is None:
+            return None
+
+        for c, d, s, value in chosen:
+            old = tuple(int(v) for v in delta.chrom[c, d, s])
+            self.tabu[(c, d, s, old)] = it + self.tenure  # type: ignore[index]
+            delta.set_cell(c, d, s, value)
+        delta.commit()
+        return chosen
+
+    def evaluate(self, delta: DeltaFitnessState, writes: list[Write]) -> float:
+        """
+        Score after applying `writes`, leaving `delta` unchanged.
+        """
+        mark = delta.mark()
+        for c, d, s, value in writes:
+            delta.set_cell(c, d, s, value)
+        score = delta.score
+        delta.rollback(mark)
+        self.evaluations += 1
+        return score
+
+    def is_tabu(self, writes: list[Write], it: int) -> bool:
+        return any(self.tabu.get((c, d, s, v), -1) > it for c, d, s, v in writes)
+
+
+__all__ = ["TabuSearch"]
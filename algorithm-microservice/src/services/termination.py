@@ -0,0 +1,157 @@
+"""
+Termination criteria for iterative solvers.
+
+`ConvergenceMonitor` is fed the best fitness after every generation and decides
+whether the run should stop:
+
+- target_fitness: stop once the best fitness reaches this value
+  (0.0 means a timetable without any penalty)
+- stagnation_generations: stop after N generations without an improvement of
+  more than `min_improvement` over the last significant best
+- deadline: stop once the wall clock passes an absolute `time.time()` value;
+  long evaluation batches call `check()` between chunks and abort the
+  generation with `SolverInterrupted`, so the previous (fully scored)
+  population remains the anytime answer
+- cancel_token: stop as soon as the token is cancelled (client went away or
+  the job was deleted); checked at the same points as the deadline, so a
+  cancelled run also returns its last fully scored population
+
+Deadlines are absolute epoch seconds so they can be shared with worker
+processes.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .generator import TimetableGenerator
+
+
+STOP_COMPLETED = "completed"
+STOP_TARGET = "target_reached"
+STOP_STAGNATION = "stagnation"
+STOP_DEADLINE = "deadline"
+STOP_CANCELLED = "cancelled"
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag polled by running solvers.
+
+    Subclasses may back `cancelled` by state shared with another process
+    (see `executor`); polling must stay cheap, it runs between evaluation
+    chunks.
+    """
+
+    def __init__(self) -> None:
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+
+class SolverInterrupted(Exception):
+    """
+    Raised inside an evaluation batch when the run must stop immediately.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ConvergenceMonitor:
+    """
+    Track the best fitness across generations and evaluate stopping criteria.
+    """
+
+    def __init__(
+        self,
+        target_fitness: float | None = None,
+        stagnation_generations: int | None = None,
+        min_improvement: float = 0.0,
+        deadline: float | None = None,
+        cancel_token: CancellationToken | None = None,
+    ):
+        self.target_fitness = target_fitness
+        self.stagnation_generations = stagnation_generations
+        self.min_improvement = max(0.0, float(min_improvement))
+        self.deadline = deadline
+        self.cancel_token = cancel_token
+        self.best = float("-inf")
+        self._reference = float("-inf")
+        self.stale = 0
+        self.stop_reason: str | None = None
+
+    @classmethod
+    def from_generator(cls, gen: "TimetableGenerator") -> "ConvergenceMonitor":
+        return cls(
+            target_fitness=gen.TARGET_FITNESS,
+            stagnation_generations=gen.STAGNATION_GENERATIONS,
+            min_improvement=gen.MIN_IMPROVEMENT,
+            deadline=gen.deadline_at,
+            cancel_token=gen.cancel_token,
+        )
+
+    def interrupt_reason(self) -> str | None:
+        """
+        Reason the run must stop right now, independent of fitness.
+        """
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            return STOP_CANCELLED
+        if self.deadline is not None and time.time() >= self.deadline:
+            return STOP_DEADLINE
+        return None
+
+    def check(self) -> None:
+        """
+        Raise `SolverInterrupted` if the run must stop immediately.
+        """
+        reason = self.interrupt_reason()
+        if reason is not None:
+            self.stop_reason = reason
+            raise SolverInterrupted(reason)
+
+    def update(self, best: float) -> bool:
+        """
+        Record the best fitness of the latest generation.
+
+        Returns:
+            True if the run should stop; the reason is kept in `stop_reason`.
+        """
+        self.best = max(self.best, best)
+        if best > self._reference + self.min_improvement:
+            self._reference = best
+            self.stale = 0
+        else:
+            self.stale += 1
+
+        interrupt = self.interrupt_reason()
+        if self.target_fitness is not None and self.best >= self.target_fitness:
+            self.stop_reason = STOP_TARGET
+        elif interrupt is not None:
+            self.stop_reason = interrupt
+        elif (
+            self.stagnation_generations is not None
+            and self.stale >= self.stagnation_generations
+        ):
+            self.stop_reason = STOP_STAGNATION
+        return self.stop_reason is not None
+
+
+__all__ = [
+    "CancellationToken",
+    "ConvergenceMonitor",
+    "STOP_COMPLETED",
+    "STOP_TARGET",
+    "STOP_STAGNATION",
+    "STOP_DEADLINE",
+    "STOP_CANCELLED",
+    "SolverInterrupted",
+]
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the service's `src` package importable however pytest is started
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
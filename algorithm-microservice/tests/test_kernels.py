@@ -0,0 +1,243 @@
+"""
+Parity tests for the optional compiled kernels (`services.kernels`).
+
+Every test runs once per kernel backend: "numpy" always, "numba" only when
+Numba is installed. Within a backend, each consumer (batch fitness, the delta
+fitness lab-row recount, batch mutation) is run once through its NumPy path
+and once through the loop kernels, compiled under "numba" and plain Python
+under "numpy", and the results must be identical.
+"""
+
+from __future__ import annotations
+
+import importlib
+import random
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+import pytest
+
+from src.core.config import get_settings
+from src.models.request_models import TimetableRequest
+from src.services import kernels
+from src.services.delta import DeltaFitnessState
+from src.services.generator import TimetableGenerator
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = [
+    "numpy",
+    pytest.param(
+        "numba",
+        marks=pytest.mark.skipif(numba is None, reason="Numba is not installed"),
+    ),
+]
+
+# (classes, days, slots per day, teachers, rooms, subjects, seed)
+SHAPES = [
+    (3, 5, 6, 8, 4, 6, 0),
+    (6, 5, 8, 14, 6, 9, 1),
+    (4, 5, 1, 10, 4, 5, 2),  # single-slot days: no room for lab pairs
+    (2, 1, 7, 5, 2, 4, 3),  # a single day
+    (8, 6, 10, 24, 10, 12, 4),
+]
+
+
+def make_generator(
+    classes: int,
+    days: int,
+    slots: int,
+    teachers: int,
+    rooms: int,
+    subjects: int,
+    seed: int,
+) -> TimetableGenerator:
+    rnd = random.Random(seed)
+    types = {i: "lab" if i % 3 == 2 else "lecture" for i in range(subjects)}
+    return TimetableGenerator(
+        TimetableRequest(
+            days=days,
+            slots_per_day=slots,
+            max_hours_per_day=3,
+            max_hours_per_week=12,
+            mutation_rate=0.05,
+            seed=seed,
+        ),
+        TOTAL_ROOMS=rooms,
+        TOTAL_TEACHERS=teachers,
+        NUM_CLASSES=classes,
+        TOTAL_SUBJECTS=subjects,
+        SUBJECT_TYPES=types,
+        SUBJECT_TEACHERS={
+            i: sorted(rnd.sample(range(teachers), rnd.randint(1, min(3, teachers))))
+            for i in range(subjects)
+        },
+        SUBJECT_HOURS={
+            i: 2 if types[i] == "lab" else rnd.randint(1, 4) for i in range(subjects)
+        },
+    )
+
+
+def _reload_kernels() -> None:
+    # Reloading keeps the module object, so consumers see the new backend
+    get_settings.cache_clear()
+    importlib.reload(kernels)
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request: Any) -> Iterator[str]:
+    """
+    Reload `kernels` with KERNEL_BACKEND set to the parameter; the default
+    backend is restored afterwards.
+    """
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv("KERNEL_BACKEND", request.param)
+        _reload_kernels()
+        assert kernels.BACKEND == request.param
+        yield request.param
+    _reload_kernels()
+
+
+@pytest.fixture(params=SHAPES, ids=lambda s: "x".join(map(str, s[:3])))
+def gen(request: Any) -> TimetableGenerator:
+    return make_generator(*request.param)
+
+
+def _population(gen: TimetableGenerator, size: int = 12) -> np.ndarray:
+    """
+    Random timetables, mutated, with a fifth of the cells overwritten by a
+    random lesson or a free cell. Seeding and mutation keep lab pairs
+    intact; the scrambled cells add odd lab runs, also at row ends.
+    """
+    pop = gen.random_initializer.generate(size)
+    gen.mutator.mutate(pop)
+    rng = np.random.default_rng(gen.seed)
+    cells = pop.reshape(-1, 3)
+    picked = np.flatnonzero(rng.random(len(cells)) < 0.2)
+    subjects = np.append(gen.problem.subject_ids, -1)
+    for i in picked.tolist():
+        subj = int(rng.choice(subjects))
+        if subj == -1:
+            cells[i] = (-1, -1, -1)
+        else:
+            teacher = int(rng.integers(gen.TOTAL_TEACHERS))
+            cells[i] = (subj, teacher, int(rng.integers(gen.TOTAL_ROOMS)))
+    return pop
+
+
+def _use_kernels(monkeypatch: pytest.MonkeyPatch, enabled: bool) -> None:
+    # Routes the consumers through the loop kernels (or the NumPy paths)
+    monkeypatch.setattr(kernels, "COMPILED", enabled)
+
+
+# ---------------------------
+# Batch fitness
+# ---------------------------
+def test_population_components_match_numpy(
+    backend: str, gen: TimetableGenerator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pop = _population(gen)
+    ev = gen.batch_evaluator
+
+    _use_kernels(monkeypatch, False)
+    expected = ev.components(pop)
+    expected_scores = ev.scores(pop)
+    _use_kernels(monkeypatch, True)
+    got = ev.components(pop)
+    got_scores = ev.scores(pop)
+
+    assert expected.keys() == got.keys()
+    for name in expected:
+        np.testing.assert_array_equal(got[name], expected[name], err_msg=name)
+    np.testing.assert_array_equal(got_scores, expected_scores)
+
+
+# ---------------------------
+# Delta fitness lab-row recount
+# ---------------------------
+def test_odd_lab_runs_row_matches_numpy(
+    backend: str, gen: TimetableGenerator
+) -> None:
+    pop = _population(gen)
+    rows = pop[..., 0].reshape(-1, gen.SLOTS_PER_DAY)
+    runs = [kernels.odd_lab_runs_row(row, gen.mutator.is_lab) for row in rows]
+    expected = gen.batch_evaluator.odd_lab_runs(rows)
+    np.testing.assert_array_equal(np.array(runs), expected)
+
+
+def test_delta_recount_matches_numpy(
+    backend: str, gen: TimetableGenerator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    start = _population(gen, 1)[0]
+
+    def replay(compiled: bool) -> tuple[list[dict[str, int]], DeltaFitnessState]:
+        _use_kernels(monkeypatch, compiled)
+        state = DeltaFitnessState.from_generator(gen, start.copy())
+        rnd = random.Random(7)
+        history = []
+        for _ in range(300):
+            gen.random_move(state.chrom, state, rnd)
+            state.commit()
+            history.append(dict(state.components))
+        return history, state
+
+    expected, _ = replay(False)
+    got, state = replay(True)
+
+    assert got == expected
+    assert state.verify()
+
+
+# ---------------------------
+# Batch mutation
+# ---------------------------
+def test_mutate_rounds_matches_numpy(
+    backend: str, gen: TimetableGenerator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pop = _population(gen)
+    rng_state = gen.rng.bit_generator.state
+
+    _use_kernels(monkeypatch, False)
+    expected = pop.copy()
+    gen.mutator.mutate(expected)
+    gen.rng.bit_generator.state = rng_state
+    _use_kernels(monkeypatch, True)
+    got = pop.copy()
+    gen.mutator.mutate(got)
+
+    assert (expected != pop).any()
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_check_parity(backend: str, gen: TimetableGenerator) -> None:
+    assert kernels.check_parity(gen, samples=6, rounds=4) == {
+        "fitness": True,
+        "delta": True,
+        "mutation": True,
+    }
+
+
+# ---------------------------
+# Startup verification
+# ---------------------------
+def test_warmup_falls_back_to_numpy_on_mismatch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    odd_lab_runs_row = kernels.odd_lab_runs_row
+    monkeypatch.setattr(kernels, "COMPILED", True)
+    monkeypatch.setattr(kernels, "BACKEND", "numba")
+    monkeypatch.setattr(kernels, "_warmed", False)
+    monkeypatch.setattr(
+        kernels,
+        "odd_lab_runs_row",
+        lambda row, is_lab: odd_lab_runs_row(row, is_lab) + 1,
+    )
+
+    kernels.warmup()
+
+    assert not kernels.COMPILED
+    assert kernels.BACKEND == "numpy"